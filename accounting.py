@@ -0,0 +1,236 @@
+"""
+Token, cost and latency accounting of the LLM calls of a run.
+
+Every model call made by a node (recruit, hypothesis, digest, cross-pollination,
+debate, synthesis) is recorded with its node, expert, model, iteration and model tier
+(see :mod:`model_tiers`): prompt and
+completion tokens (as reported by LiteLLM / CrewAI, estimated otherwise), latency,
+retries, fallback hops (models that failed before it for the same expert and node)
+and estimated cost (LiteLLM price map; 0 for free or unknown models, and for answers
+served from the LLM cache).
+
+Nodes return their records in ``state['usage']``, which accumulates across nodes and
+iterations (and survives checkpoints). :func:`usage_report` aggregates them per node,
+expert, model, iteration and tier; :func:`utils.format_output` renders the report and
+:func:`export_usage` writes it as JSON for dashboards.
+"""
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+
+from model_router import completion_tokens
+from model_tiers import node_tier
+
+USAGE_GROUPS = ("node", "expert", "model", "iteration", "tier")
+
+
+def prompt_tokens(result, estimate: int = 0) -> int:
+    """
+    Returns the prompt tokens reported with a result, or the pre-flight estimate.
+
+    A crew reports the tokens of its whole ReAct loop, tool observations included.
+    """
+    usage = getattr(result, "token_usage", None)
+    if isinstance(usage, dict):
+        tokens = usage.get("prompt_tokens")
+    else:
+        tokens = getattr(usage, "prompt_tokens", None)
+    if isinstance(tokens, int) and tokens > 0:
+        return tokens
+    return estimate or 0
+
+
+def estimate_cost(model: str, prompt: int, completion: int) -> float:
+    """
+    Estimated cost in USD of a call, from the LiteLLM price map (0 when the model is unknown).
+    """
+    try:
+        import litellm
+        prompt_cost, completion_cost = litellm.cost_per_token(model=model, prompt_tokens=prompt, completion_tokens=completion)
+        return float(prompt_cost + completion_cost)
+    except Exception:
+        return 0.0
+
+
+class ModelCall:
+    """
+    One attempt of a node on a model, recorded by :meth:`success` or :meth:`failure`.
+    """
+    def __init__(self, usage, model: str, expert: str, hops: int):
+        self.usage = usage
+        self.model = model
+        self.expert = expert
+        self.hops = hops
+        self.retries = 0
+        self.computed = False
+        self.started = time.monotonic()
+
+    def retry(self, error=None):
+        """
+        Counts a retry of the call (passed as ``on_retry`` to :func:`utils.retry_llm`).
+        """
+        self.retries += 1
+
+    def compute(self, func):
+        """
+        Wraps the cache-miss computation, to tell fresh answers from cache hits.
+        """
+        def wrapper():
+            self.computed = True
+            return func()
+        return wrapper
+
+    def _record(self, ok: bool, prompt: int, completion: int, skipped: bool = False) -> dict:
+        cost = estimate_cost(self.model, prompt, completion) if ok and self.computed else 0.0
+        record = {
+            "node": self.usage.node,
+            "expert": self.expert,
+            "model": self.model,
+            "iteration": self.usage.iteration,
+            "tier": self.usage.tier,
+            "ok": ok,
+            "skipped": skipped,
+            "cached": ok and not self.computed,
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "latency_s": round(time.monotonic() - self.started, 3),
+            "retries": self.retries,
+            "fallback_hops": self.hops,
+            "cost_usd": round(cost, 6),
+        }
+        self.usage.add(record)
+        return record
+
+    def success(self, estimated_prompt_tokens: int, result) -> dict:
+        """
+        Records the successful call.
+        """
+        if not self.computed:
+            # Served from the LLM cache: nothing was sent to the model
+            return self._record(True, 0, 0)
+        return self._record(True, prompt_tokens(result, estimated_prompt_tokens), completion_tokens(result))
+
+    def failure(self) -> dict:
+        """
+        Records the failed call; the next model of the expert counts one more fallback hop.
+        """
+        self.usage.failed(self.expert)
+        return self._record(False, 0, 0)
+
+    def skip(self) -> dict:
+        """
+        Records a model skipped before dispatch (prompt larger than its context window).
+
+        Counted as a failure: the next model of the expert counts one more fallback hop.
+        """
+        self.usage.failed(self.expert)
+        return self._record(False, 0, 0, skipped=True)
+
+
+class NodeUsage:
+    """
+    Thread-safe collector of the calls of one node execution.
+
+    Args:
+        state (AgentState): The state of the node.
+        node (str): The node name.
+    """
+    def __init__(self, state, node: str):
+        self.node = node
+        self.iteration = state.get('iterations', 0)
+        # Nodes without a tier use the default chain
+        self.tier = node_tier(state, node) or "default"
+        self._lock = threading.Lock()
+        self._records = []
+        self._failures = Counter()
+
+    def call(self, model: str, expert: str = None) -> ModelCall:
+        """
+        Starts recording an attempt of the node (for an expert) on a model.
+        """
+        with self._lock:
+            hops = self._failures[expert]
+        return ModelCall(self, model, expert, hops)
+
+    def failed(self, expert: str):
+        with self._lock:
+            self._failures[expert] += 1
+
+    def add(self, record: dict):
+        with self._lock:
+            self._records.append(record)
+
+    def extend(self, records: list):
+        with self._lock:
+            self._records.extend(records)
+
+    def records(self, expert: str = None) -> list:
+        """
+        Returns the recorded calls (of one expert when given).
+        """
+        with self._lock:
+            return [r for r in self._records if expert is None or r["expert"] == expert]
+
+
+def _aggregate(records: list) -> dict:
+    totals = defaultdict(float)
+    for r in records:
+        totals["calls"] += 1
+        totals["failures"] += 0 if r["ok"] else 1
+        totals["cached"] += 1 if r.get("cached") else 0
+        for field in ("prompt_tokens", "completion_tokens", "latency_s", "retries", "cost_usd"):
+            totals[field] += r.get(field) or 0
+        # Models that failed before the successful one (failures are counted apart)
+        totals["fallback_hops"] += r.get("fallback_hops") or 0 if r["ok"] else 0
+    return {
+        "calls": int(totals["calls"]),
+        "failures": int(totals["failures"]),
+        "cached": int(totals["cached"]),
+        "prompt_tokens": int(totals["prompt_tokens"]),
+        "completion_tokens": int(totals["completion_tokens"]),
+        "latency_s": round(totals["latency_s"], 2),
+        "retries": int(totals["retries"]),
+        "fallback_hops": int(totals["fallback_hops"]),
+        "cost_usd": round(totals["cost_usd"], 6),
+    }
+
+
+def usage_report(records: list) -> dict:
+    """
+    Aggregates call records per node, expert, model, iteration and tier.
+
+    Latencies are summed: parallel calls (experts of a node) overlap in wall-clock time.
+
+    Returns:
+        dict: ``totals``, then ``by_node``, ``by_expert``, ``by_model``, ``by_iteration`` and ``by_tier`` (group -> totals).
+    """
+    records = records or []
+    report = {"totals": _aggregate(records)}
+    for group in USAGE_GROUPS:
+        groups = defaultdict(list)
+        for r in records:
+            key = r.get(group)
+            groups["-" if key is None else str(key)].append(r)
+        report[f"by_{group}"] = {key: _aggregate(rs) for key, rs in groups.items()}
+    return report
+
+
+def usage_json(records: list) -> str:
+    """
+    Returns the usage report and the raw call records as a JSON document.
+    """
+    return json.dumps({**usage_report(records), "calls": list(records or [])}, ensure_ascii=False, indent=2)
+
+
+def export_usage(records: list, path: str) -> str:
+    """
+    Writes :func:`usage_json` to a file.
+
+    Returns:
+        str: The exported document.
+    """
+    document = usage_json(records)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(document)
+    return document
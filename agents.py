@@ -1,14 +1,28 @@
 from crewai import Agent, LLM
-from crewai.tools import BaseTool
 from crewai_tools import SerperDevTool
-from langchain_community.tools import DuckDuckGoSearchRun
-from tools import ArxivTool, HalTool
+from tools import ArxivTool, HalTool, DDGTool, LocalLiteratureTool, LiteratureSweepTool
+from literature_index import literature_index
 import os
 
 # Assuming OPENAI_API_KEY is set in environment
 # You might need to adjust the model name based on what's available/cost
 DEFAULT_MODEL = os.environ.get("OS_MODEL", "openrouter/openai/gpt-oss-20b:free")
 
+def resolve_model_name(model_name=None):
+    """
+    Returns the LiteLLM name of a model, defaulting to ``OS_MODEL`` and enforcing the OpenRouter provider.
+
+    Args:
+        model_name (str): The requested model, with or without the ``openrouter/`` prefix.
+
+    Returns:
+        str: The model name prefixed with ``openrouter/``.
+    """
+    model = model_name if model_name else DEFAULT_MODEL
+    if not model.startswith("openrouter/"):
+        model = f"openrouter/{model}"
+    return model
+
 def get_llm(temperature=0.7, model_name=None):
     """
     Retrieves the LLM configuration.
@@ -22,11 +36,8 @@ def get_llm(temperature=0.7, model_name=None):
     Returns:
         LLM: A CrewAI LLM instance configured with the default model and API key.
     """
-    model = model_name if model_name else DEFAULT_MODEL
-    
     # Strictly enforce OpenRouter
-    if not model.startswith("openrouter/"):
-         model = f"openrouter/{model}"
+    model = resolve_model_name(model_name)
     
     # Always use OpenRouter API Key
     api_key = os.environ.get("OPENROUTER_API_KEY")
@@ -54,6 +65,15 @@ def get_alpha_evolve_expert():
         )
     }
 
+def get_fixed_experts():
+    """
+    Returns the experts added to every panel, whatever the recruiter proposes.
+
+    Their profiles do not depend on the recruitment, so their hypotheses can be
+    generated speculatively while the recruiter runs.
+    """
+    return [get_alpha_evolve_expert()]
+
 class RecruiterAgent:
     """
     Agent responsible for recruiting experts.
@@ -83,44 +103,65 @@ class RecruiterAgent:
         )
         return agent
 
-def create_expert_agent(profile: dict, temperature: float = 0.7, web_search_enabled: bool = True, model_name: str = None) -> Agent:
+def uses_academic_tools(profile: dict) -> bool:
     """
-    Creates an expert agent based on a profile.
+    Tells whether an expert gets the academic search tools (Arxiv, HAL).
+    """
+    return "research" in profile['role'].lower() or "recherche" in profile['role'].lower() or "librarian" in profile['name'].lower() or "chercheur" in profile['name'].lower() or "alphaevolve" in profile['name'].lower()
+
+def expert_tools(profile: dict, web_search_enabled: bool = True) -> list:
+    """
+    Returns the search tools of an expert.
 
     Args:
-        profile (dict): A dictionary containing 'name', 'role', 'bias', and 'skill'.
-        temperature (float): The temperature for the LLM.
-        web_search_enabled (bool): Whether to enable web search tools.
-        model_name (str): The model name.
+        profile (dict): The expert definition.
+        web_search_enabled (bool): Whether web search is enabled for the run.
 
     Returns:
-        Agent: A CrewAI Agent configured with the expert's profile.
+        list: The CrewAI tools. Without web search, only the offline literature index remains.
     """
     tools = []
+    # The offline index needs no network: researchers keep it even without web search.
+    # Checking the file first keeps len() from creating an empty index
+    if uses_academic_tools(profile) and os.path.exists(literature_index.path) and len(literature_index):
+        tools.append(LocalLiteratureTool())
     # Add tools based on availability AND if web search is enabled
     if web_search_enabled:
         if os.environ.get("SERPER_API_KEY"):
              tools.append(SerperDevTool())
         else:
              # Fallback to DDG if no Serper key
-             # Wrap LangChain tool for CrewAI compatibility using BaseTool class
-             class DDGTool(BaseTool):
-                 name: str = "DuckDuckGo Search"
-                 description: str = "Useful for searching the internet for information."
-                 
-                 def _run(self, query: str) -> str:
-                     return DuckDuckGoSearchRun().run(query)
-
              tools.append(DDGTool())
 
         # Add Academic Tools if the role suggests research or if it's the Librarian
-        if "research" in profile['role'].lower() or "recherche" in profile['role'].lower() or "librarian" in profile['name'].lower() or "chercheur" in profile['name'].lower() or "alphaevolve" in profile['name'].lower():
+        if uses_academic_tools(profile):
             tools.append(ArxivTool())
             tools.append(HalTool())
+            # Several queries and sources in one action instead of one ReAct turn each
+            tools.append(LiteratureSweepTool())
+    return tools
+
+def create_expert_agent(profile: dict, temperature: float = 0.7, web_search_enabled: bool = True, model_name: str = None) -> Agent:
+    """
+    Creates an expert agent based on a profile.
+
+    Args:
+        profile (dict): A dictionary containing 'name', 'role', 'bias', and 'skill'.
+        temperature (float): The temperature for the LLM.
+        web_search_enabled (bool): Whether to enable web search tools.
+        model_name (str): The model name.
+
+    Returns:
+        Agent: A CrewAI Agent configured with the expert's profile.
+    """
+    tools = expert_tools(profile, web_search_enabled)
+    goal = f"Résoudre le problème en utilisant votre expertise en {profile['role']} et votre compétence en {profile['skill']}. IMPORTANT: VOUS NE POUVEZ UTILISER QU'UN SEUL OUTIL À LA FOIS. NE JAMAIS lister plusieurs outils dans une seule Action. NE JAMAIS mettre le nom de l'Action entre des blocs de code markdown (comme ```). Écrivez juste le nom de l'outil."
+    if any(isinstance(tool, LiteratureSweepTool) for tool in tools):
+        goal += " Pour interroger plusieurs requêtes ou sources, utilisez l'outil Literature Sweep : une seule action les lance toutes en parallèle."
 
     return Agent(
         role=profile['role'],
-        goal=f"Résoudre le problème en utilisant votre expertise en {profile['role']} et votre compétence en {profile['skill']}. IMPORTANT: VOUS NE POUVEZ UTILISER QU'UN SEUL OUTIL À LA FOIS. NE JAMAIS lister plusieurs outils dans une seule Action. NE JAMAIS mettre le nom de l'Action entre des blocs de code markdown (comme ```). Écrivez juste le nom de l'outil.",
+        goal=goal,
         backstory=f"Vous êtes {profile['name']}. Vous êtes un {profile['bias']}. Votre compétence signature est {profile['skill']}. RAPPEL: Une seule action d'outil à la fois.",
         llm=get_llm(temperature=temperature, model_name=model_name),
         tools=tools,
@@ -0,0 +1,74 @@
+"""
+Compares the prompt tokens of the cross-pollination phase for each topology.
+
+The hypotheses are synthetic (no LLM call), so the benchmark is free and reproducible:
+
+    python benchmark_topologies.py --experts 4 7 10 --words 250 --k 2
+"""
+import argparse
+import random
+
+from token_budget import count_tokens
+from tasks import format_other_hypotheses
+from topology import TOPOLOGIES, select_neighbours
+
+DOMAINS = {
+    "Biologist": "cell protein gene enzyme membrane metabolism tissue evolution organism signaling",
+    "Physicist": "energy entropy field quantum particle wave momentum symmetry lattice thermodynamics",
+    "Economist": "market price incentive equilibrium utility demand supply capital policy risk",
+    "Computer Scientist": "algorithm graph complexity network learning optimization data model search compiler",
+    "Chemist": "molecule reaction catalyst bond solvent polymer oxidation synthesis kinetics spectra",
+    "Sociologist": "community norm institution behavior network identity culture trust survey inequality",
+    "Mathematician": "theorem proof manifold topology invariant operator measure group category limit",
+    "Engineer": "design tolerance load sensor control prototype material reliability system throughput",
+}
+
+
+def synthetic_hypotheses(n: int, words: int, seed: int = 0) -> list:
+    """
+    Builds ``n`` hypotheses of about ``words`` words, each biased toward one domain vocabulary.
+    """
+    rng = random.Random(seed)
+    roles = list(DOMAINS)
+    shared = "hypothesis approach mechanism evidence experiment constraint scale interaction".split()
+    hypotheses = []
+    for i in range(n):
+        role = roles[i % len(roles)]
+        vocabulary = DOMAINS[role].split()
+        text = " ".join(rng.choice(vocabulary if rng.random() < 0.7 else shared) for _ in range(words))
+        hypotheses.append({"expert_name": f"Expert {i + 1}", "role": role, "hypothesis": text})
+    return hypotheses
+
+
+def cross_pollination_tokens(hypotheses: list, topology: str, k: int) -> int:
+    """
+    Estimates the prompt tokens of one cross-pollination round (own hypothesis + neighbours).
+    """
+    neighbours = select_neighbours(hypotheses, topology, k, seed="benchmark")
+    return sum(
+        count_tokens(h['hypothesis'] + "\n" + format_other_hypotheses(others))
+        for h, others in zip(hypotheses, neighbours)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-pollination prompt tokens per topology.")
+    parser.add_argument("--experts", type=int, nargs="+", default=[4, 7, 10], help="Numbers of experts to benchmark.")
+    parser.add_argument("--words", type=int, default=250, help="Words per hypothesis.")
+    parser.add_argument("--k", type=int, default=2, help="Neighbours per expert for the sparse topologies.")
+    args = parser.parse_args()
+
+    print("| Experts | " + " | ".join(TOPOLOGIES) + " |")
+    print("|---|" + "---|" * len(TOPOLOGIES))
+    for n in args.experts:
+        hypotheses = synthetic_hypotheses(n, args.words)
+        baseline = cross_pollination_tokens(hypotheses, "all_to_all", args.k)
+        cells = []
+        for topology in TOPOLOGIES:
+            tokens = cross_pollination_tokens(hypotheses, topology, args.k)
+            cells.append(f"{tokens} ({100 * tokens / baseline:.0f}%)")
+        print(f"| {n} | " + " | ".join(cells) + " |")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
 
-import requests
+from http_client import get_session
 import json
 
 def check_models():
     try:
-        response = requests.get("https://openrouter.ai/api/v1/models")
+        response = get_session().get("https://openrouter.ai/api/v1/models")
         if response.status_code == 200:
             models = response.json().get("data", [])
             free_models = sorted([m["id"] for m in models if ":free" in m["id"]])
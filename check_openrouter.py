@@ -1,6 +1,6 @@
 
 import os
-import requests
+from http_client import get_session
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,7 +16,7 @@ print("\nTesting Model Availability...")
 
 def get_openrouter_free_models():
     try:
-        response = requests.get("https://openrouter.ai/api/v1/models")
+        response = get_session().get("https://openrouter.ai/api/v1/models")
         if response.status_code == 200:
             models = response.json()["data"]
             free_models = [m["id"] for m in models if ":free" in m["id"]]
@@ -0,0 +1,187 @@
+"""
+Process-wide circuit breakers for the LLM models of the fallback chain.
+
+Each model gets a breaker with three states:
+
+* ``closed``: the model is healthy, calls go through.
+* ``open``: the model failed repeatedly, calls are skipped until the cool-down expires.
+* ``half_open``: the cool-down expired, a single probe call is allowed to test the model again.
+
+The registry is shared by every node and every concurrent run of the process, so a model
+that is rate limited in one node is skipped immediately by the following ones.
+"""
+import os
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker tracking the health of a single model.
+
+    Args:
+        model (str): The model name guarded by this breaker.
+        failure_threshold (int): Consecutive failures needed to trip the breaker.
+        cooldown (float): Seconds to wait in the open state before probing the model again.
+        clock (callable): Monotonic clock, injectable for tests.
+    """
+    def __init__(self, model: str, failure_threshold: int = 2, cooldown: float = 60.0, clock=time.monotonic):
+        self.model = model
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.trip_count = 0
+        self.total_failures = 0
+        self.total_successes = 0
+        self.opened_at = None
+        self._probe_started_at = None
+
+    def allow_request(self) -> bool:
+        """
+        Checks whether a call to the model may be attempted now.
+
+        Returns:
+            bool: True if the call may proceed, False if the model must be skipped.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            now = self._clock()
+            if self.state == OPEN:
+                if now - self.opened_at < self.cooldown:
+                    return False
+                print(f"🔌 Circuit half-open for {self.model}, probing the model again.")
+                self.state = HALF_OPEN
+                self._probe_started_at = now
+                return True
+
+            # HALF_OPEN: only one probe at a time. A probe that never reported back
+            # (e.g. cancelled caller) is considered lost after a full cool-down.
+            if self._probe_started_at is not None and now - self._probe_started_at < self.cooldown:
+                return False
+            self._probe_started_at = now
+            return True
+
+    def record_success(self):
+        """
+        Records a successful call and closes the breaker.
+        """
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"✅ Circuit closed for {self.model}, model is healthy again.")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.total_successes += 1
+            self.opened_at = None
+            self._probe_started_at = None
+
+    def record_failure(self):
+        """
+        Records a failed call, tripping the breaker when the threshold is reached
+        or when a half-open probe fails.
+        """
+        with self._lock:
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened_at = self._clock()
+                self._probe_started_at = None
+                self.trip_count += 1
+                print(f"🚫 Circuit open for {self.model} after {self.consecutive_failures} failures (trip #{self.trip_count}). Skipping it for {self.cooldown:.0f}s.")
+
+    def release_probe(self):
+        """
+        Hands back a half-open probe that was not used (e.g. the model was skipped
+        before the call), so that the next caller can probe the model at once.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_started_at = None
+
+    def snapshot(self) -> dict:
+        """
+        Returns the breaker state for monitoring.
+
+        Returns:
+            dict: State, counters and remaining cool-down in seconds.
+        """
+        with self._lock:
+            retry_in = 0.0
+            if self.state == OPEN:
+                retry_in = max(0.0, self.cooldown - (self._clock() - self.opened_at))
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "trip_count": self.trip_count,
+                "total_failures": self.total_failures,
+                "total_successes": self.total_successes,
+                "retry_in": round(retry_in, 1),
+            }
+
+
+class ModelHealthRegistry:
+    """
+    Thread-safe registry holding one circuit breaker per model.
+
+    Args:
+        failure_threshold (int): Consecutive failures needed to trip a breaker.
+        cooldown (float): Seconds a tripped model is skipped before being probed again.
+    """
+    def __init__(self, failure_threshold: int = 2, cooldown: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> CircuitBreaker:
+        """
+        Returns the breaker for a model, creating it on first use.
+        """
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = CircuitBreaker(model, self.failure_threshold, self.cooldown)
+                self._breakers[model] = breaker
+            return breaker
+
+    def allow_request(self, model: str) -> bool:
+        return self.get(model).allow_request()
+
+    def record_success(self, model: str):
+        self.get(model).record_success()
+
+    def record_failure(self, model: str):
+        self.get(model).record_failure()
+
+    def release_probe(self, model: str):
+        self.get(model).release_probe()
+
+    def snapshot(self) -> dict:
+        """
+        Returns the state of every known breaker, keyed by model name.
+        """
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.model: b.snapshot() for b in breakers}
+
+    def reset(self):
+        """
+        Forgets every breaker (all models back to closed).
+        """
+        with self._lock:
+            self._breakers.clear()
+
+
+model_health = ModelHealthRegistry(
+    failure_threshold=int(os.environ.get("NEXUS_BREAKER_THRESHOLD", 2)),
+    cooldown=float(os.environ.get("NEXUS_BREAKER_COOLDOWN", 60)),
+)
@@ -0,0 +1,132 @@
+"""
+Near-duplicate hypothesis pruning before the debate.
+
+Recruited panels often contain overlapping roles, and after cross-pollination their
+hypotheses tend to converge on near-identical text, which the debate then pays for
+several times. The dedup stage estimates the similarity of every pair of hypotheses
+with MinHash signatures of word shingles (no embeddings, works offline) and, above
+the threshold, keeps a single representative: the most detailed hypothesis.
+
+* ``merge``: the duplicates are left out of the debate, and the representative
+  lists their experts (``merged_from``) so the debate knows who concurs. Only the
+  names are merged: the text of a duplicate is not read, so a detail found only in
+  it is lost, as with ``drop``.
+* ``drop``: the duplicates are left out of the debate.
+
+Duplicates stay in ``state['hypotheses']`` with a ``duplicate_of`` field, so the
+incremental iterations still find the hypothesis of every expert. The similarity
+matrix, the pruned hypotheses and the debate tokens saved are recorded in
+``state['dedup_report']``.
+"""
+import hashlib
+import os
+import random
+
+from utils import tokenize
+from token_budget import count_tokens
+
+DEDUP_MODES = ("off", "merge", "drop")
+DEFAULT_DEDUP_MODE = os.environ.get("NEXUS_DEDUP_MODE", "off")
+DEFAULT_DEDUP_THRESHOLD = float(os.environ.get("NEXUS_DEDUP_THRESHOLD", 0.8))
+# Words per shingle, and hash functions per signature (error of the estimate ~ 1/sqrt(n))
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 128
+
+_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are comparable across runs
+_rng = random.Random(42)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """
+    Returns the set of word n-grams of a text (case, accents and stopwords ignored).
+    """
+    words = tokenize(text)
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(text: str) -> tuple:
+    """
+    Returns the MinHash signature of a text (empty for a text without words).
+    """
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles(text)]
+    if not hashes:
+        return ()
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def estimated_similarity(a: tuple, b: tuple) -> float:
+    """
+    Estimates the Jaccard similarity of the shingle sets of two signatures.
+    """
+    if not a or not b:
+        return 0.0
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def similarity_matrix(texts: list) -> list:
+    """
+    Returns the estimated pairwise similarities of texts, rounded to 3 decimals.
+    """
+    signatures = [minhash(t) for t in texts]
+    return [[1.0 if i == j else round(estimated_similarity(a, b), 3) for j, b in enumerate(signatures)] for i, a in enumerate(signatures)]
+
+
+def distinct_hypotheses(hypotheses: list) -> list:
+    """
+    Drops failed placeholders and pruned duplicates: the hypotheses the debate reads.
+    """
+    return [h for h in hypotheses if not h.get('failed') and not h.get('duplicate_of')]
+
+
+def prune_duplicates(hypotheses: list, mode: str = None, threshold: float = None) -> tuple:
+    """
+    Marks near-duplicate hypotheses so that the debate reads a single representative.
+
+    Args:
+        hypotheses (list): The hypotheses from the state.
+        mode (str): ``"merge"``, ``"drop"`` or ``"off"``. Defaults to ``NEXUS_DEDUP_MODE``.
+        threshold (float): Minimum estimated similarity of near-duplicates. Defaults to ``NEXUS_DEDUP_THRESHOLD``.
+
+    Returns:
+        tuple: The updated hypotheses and the report (experts, similarity matrix, pruned hypotheses, tokens saved).
+    """
+    mode = mode or DEFAULT_DEDUP_MODE
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Unknown dedup mode '{mode}'. Expected one of {DEDUP_MODES}.")
+    threshold = DEFAULT_DEDUP_THRESHOLD if threshold is None else threshold
+    # Flags of a previous iteration are recomputed
+    hypotheses = [{k: v for k, v in h.items() if k not in ('duplicate_of', 'merged_from')} for h in hypotheses]
+    candidates = [i for i, h in enumerate(hypotheses) if not h.get('failed')]
+    matrix = similarity_matrix([hypotheses[i]['hypothesis'] for i in candidates])
+    report = {
+        "mode": mode,
+        "threshold": threshold,
+        "experts": [hypotheses[i]['expert_name'] for i in candidates],
+        "similarity": matrix,
+        "pruned": [],
+        "tokens_saved": 0,
+    }
+    if mode == "off":
+        return hypotheses, report
+
+    # The most detailed hypotheses become the representatives
+    order = sorted(range(len(candidates)), key=lambda c: count_tokens(hypotheses[candidates[c]]['hypothesis']), reverse=True)
+    representatives = []
+    for c in order:
+        best = max(representatives, key=lambda r: matrix[c][r], default=None)
+        if best is None or matrix[c][best] < threshold:
+            representatives.append(c)
+            continue
+        duplicate, kept = hypotheses[candidates[c]], hypotheses[candidates[best]]
+        duplicate['duplicate_of'] = kept['expert_name']
+        if mode == "merge":
+            # Names only: the text of the duplicate does not reach the debate
+            kept['merged_from'] = kept.get('merged_from', []) + [duplicate['expert_name']]
+        # The debate prompt would have carried the digest, or the full text
+        report["tokens_saved"] += count_tokens(duplicate.get('digest') or duplicate['hypothesis'])
+        report["pruned"].append({"expert_name": duplicate['expert_name'], "duplicate_of": kept['expert_name'], "similarity": matrix[c][best]})
+    return hypotheses, report
@@ -0,0 +1,160 @@
+"""
+Compressed hypothesis digests.
+
+Web-search-augmented experts often produce multi-kilobyte hypotheses, and every
+other expert (cross-pollination) and the Devil's Advocate (debate) read them. The
+digest stage compresses each hypothesis once, to a token budget, and stores it in
+the hypothesis as ``digest``. Downstream prompts read the digest when present, so
+their size stays roughly constant per expert however verbose the others were.
+
+Two methods are available:
+
+* ``extractive``: keeps the most informative sentences (word-frequency scoring), free.
+* ``llm``: one call to a cheap model through :mod:`direct_llm`.
+
+Digests go through the shared :data:`llm_cache.llm_cache`, so an unchanged hypothesis
+is never compressed twice when the cache is enabled. LLM digest calls are recorded
+under the ``digest`` node (see :mod:`accounting`).
+"""
+import asyncio
+import os
+import re
+from collections import Counter
+from types import SimpleNamespace
+
+from accounting import NodeUsage
+from direct_llm import acomplete
+from llm_cache import llm_cache, make_cache_key
+from token_budget import count_tokens
+
+DIGEST_MODES = ("off", "extractive", "llm")
+DEFAULT_DIGEST_MODE = os.environ.get("NEXUS_DIGEST_MODE", "off")
+DEFAULT_DIGEST_TOKENS = int(os.environ.get("NEXUS_DIGEST_TOKENS", 300))
+DIGEST_MODEL = os.environ.get("NEXUS_DIGEST_MODEL", "openrouter/mistralai/mistral-small-3.1-24b-instruct:free")
+
+_STOPWORDS = set("""
+the and for that with this from are was were have has been which their there these those into than then also
+les des une pour que qui dans sur par avec est sont pas plus ces son ses aux elle ils nous vous leur comme
+""".split())
+
+
+def _sentences(text: str) -> list:
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", text) if s.strip()]
+
+
+def extractive_digest(text: str, max_tokens: int) -> str:
+    """
+    Keeps the highest-scoring sentences of a text, in their original order, within a token budget.
+
+    A sentence scores the average document frequency of its content words, so sentences
+    carrying the recurring concepts of the hypothesis are kept first.
+
+    Args:
+        text (str): The hypothesis.
+        max_tokens (int): The token budget of the digest.
+
+    Returns:
+        str: The digest (the unchanged text when it already fits).
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    sentences = _sentences(text)
+    words = [w for w in re.findall(r"\w+", text.lower()) if len(w) > 2 and w not in _STOPWORDS]
+    frequencies = Counter(words)
+
+    def score(sentence):
+        content = [w for w in re.findall(r"\w+", sentence.lower()) if w in frequencies]
+        return sum(frequencies[w] for w in content) / (len(content) + 1)
+
+    ranked = sorted(range(len(sentences)), key=lambda i: score(sentences[i]), reverse=True)
+    kept, seen, used = set(), set(), 0
+    for i in ranked:
+        # Verbose outputs often repeat themselves: keep each sentence once
+        normalized = " ".join(sentences[i].lower().split())
+        cost = count_tokens(sentences[i])
+        if normalized in seen or used + cost > max_tokens:
+            continue
+        kept.add(i)
+        seen.add(normalized)
+        used += cost
+
+    if not kept:
+        # A single sentence longer than the budget: truncate it
+        return text[:max_tokens * 4].rsplit(" ", 1)[0] + " …"
+    return " ".join(sentences[i] for i in sorted(kept))
+
+
+async def llm_digest(text: str, max_tokens: int, model: str = None):
+    """
+    Compresses a hypothesis with a single call to a cheap model.
+
+    Returns:
+        CachedResponse: The completion, whose text :func:`adigest` caps to the budget if the model ignored it.
+    """
+    agent = SimpleNamespace(
+        role="Scientific Editor",
+        goal="Compress research hypotheses without losing their key claims.",
+        backstory="You write dense, faithful abstracts of scientific proposals.",
+    )
+    task = SimpleNamespace(
+        description=f"Compress the following hypothesis to at most {max_tokens} tokens. "
+                    f"Keep the core claim, the mechanism, the key evidence and named references. "
+                    f"Answer with the compressed text only, in the language of the hypothesis.\n\n{text}",
+        expected_output="The compressed hypothesis.",
+    )
+    return await acomplete(agent, task, model or DIGEST_MODEL, temperature=0.0, tokens=count_tokens(text))
+
+
+async def adigest(text: str, mode: str = None, max_tokens: int = None, cache_mode: str = None, usage: NodeUsage = None, expert: str = None) -> str:
+    """
+    Returns the digest of a hypothesis, computed at most once per cache entry.
+
+    Args:
+        text (str): The hypothesis.
+        mode (str): ``"extractive"`` or ``"llm"`` (``"off"`` returns the text unchanged).
+        max_tokens (int): The token budget. Defaults to ``NEXUS_DIGEST_TOKENS``.
+        cache_mode (str): The LLM cache mode (see :mod:`llm_cache`).
+        usage (NodeUsage): Collector of the LLM digest calls (see :mod:`accounting`).
+        expert (str): The expert of the hypothesis, for the accounting.
+
+    Returns:
+        str: The digest.
+    """
+    mode = mode or DEFAULT_DIGEST_MODE
+    if mode not in DIGEST_MODES:
+        raise ValueError(f"Unknown digest mode '{mode}'. Expected one of {DIGEST_MODES}.")
+    max_tokens = max_tokens or DEFAULT_DIGEST_TOKENS
+    if mode == "off" or count_tokens(text) <= max_tokens:
+        return text
+
+    if mode == "extractive":
+        return extractive_digest(text, max_tokens)
+
+    key = make_cache_key(text, DIGEST_MODEL, 0.0, schema=f"digest:{max_tokens}")
+    call = (usage or NodeUsage({}, "digest")).call(DIGEST_MODEL, expert)
+    try:
+        result = await llm_cache.acall(key, call.compute(lambda: llm_digest(text, max_tokens)), mode=cache_mode)
+    except Exception as e:
+        call.failure()
+        print(f"⚠️ LLM digest failed ({e}). Falling back to extractive digest.")
+        return extractive_digest(text, max_tokens)
+    call.success(count_tokens(text), result)
+    return extractive_digest(str(result), max_tokens)
+
+
+async def add_digests(hypotheses: list, mode: str = None, max_tokens: int = None, cache_mode: str = None, usage: NodeUsage = None) -> list:
+    """
+    Adds a ``digest`` to every successful hypothesis that does not have one yet, in parallel.
+
+    LLM digest calls are recorded in ``usage`` when given.
+
+    Returns:
+        list: New hypothesis dicts (failed placeholders are returned unchanged).
+    """
+    async def digest_one(h):
+        if h.get('failed') or h.get('digest'):
+            return h
+        return {**h, "digest": await adigest(h['hypothesis'], mode, max_tokens, cache_mode, usage, h['expert_name'])}
+
+    return list(await asyncio.gather(*(digest_one(h) for h in hypotheses)))
@@ -0,0 +1,149 @@
+"""
+Direct LLM executor for the tool-less phases (debate, synthesis).
+
+The ``DevilsAdvocate`` and ``Synthesizer`` agents have no tools, so the CrewAI agent
+loop only adds overhead (crew setup, verbose logging, extra ReAct turns). This
+executor sends the same role, goal, backstory and task text as a single chat
+completion through LiteLLM and returns a result exposing the same attributes as a
+``CrewOutput`` (``raw``, ``json_dict``, ``str()``).
+
+When a pydantic ``response_model`` is given (e.g. ``SynthesisReport``), the schema is
+requested from the provider and the answer is validated before being returned.
+
+The executor is selected per node with ``direct_llm_nodes`` in the state, or
+``NEXUS_DIRECT_LLM_NODES="debate,synthesis"`` by default.
+"""
+import os
+import re
+
+import litellm
+from pydantic import ValidationError
+
+from agents import resolve_model_name
+from llm_cache import CachedResponse
+from model_router import model_router, completion_tokens
+from rate_limiter import install_litellm_limits
+
+install_litellm_limits()
+
+# Nodes whose agents have no tools and can bypass CrewAI
+DIRECT_LLM_NODES = ("debate", "synthesis")
+DEFAULT_DIRECT_LLM_NODES = [n.strip() for n in os.environ.get("NEXUS_DIRECT_LLM_NODES", "").split(",") if n.strip()]
+
+
+def uses_direct_llm(state, node: str) -> bool:
+    """
+    Tells whether a node should run through the direct executor.
+
+    Args:
+        state (dict): The workflow state (``direct_llm_nodes`` overrides the default).
+        node (str): The node name ("debate" or "synthesis").
+    """
+    nodes = state.get('direct_llm_nodes')
+    if nodes is None:
+        nodes = DEFAULT_DIRECT_LLM_NODES
+    return node in nodes
+
+
+def build_messages(agent, task) -> list:
+    """
+    Turns an agent and its task into chat messages.
+
+    Args:
+        agent (Agent): Provides the role, goal and backstory (system message).
+        task (Task): Provides the description and expected output (user message).
+
+    Returns:
+        list: The system and user messages.
+    """
+    system = f"You are {agent.role}. {agent.backstory}\nYour personal goal is: {agent.goal}"
+    user = f"{task.description}\n\nExpected output: {task.expected_output}"
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+def parse_structured(content: str, response_model):
+    """
+    Validates a completion against a pydantic model.
+
+    Markdown code fences and forbidden control characters are stripped first.
+
+    Raises:
+        ValueError: If the answer does not match the schema.
+    """
+    clean = content.replace("```json", "").replace("```", "").strip()
+    clean = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', clean)
+    try:
+        return response_model.model_validate_json(clean)
+    except ValidationError as e:
+        raise ValueError(f"Structured output does not match {response_model.__name__}: {e}") from e
+
+
+def _completion_kwargs(agent, task, model: str, temperature: float, response_model) -> dict:
+    kwargs = {
+        "model": resolve_model_name(model),
+        "messages": build_messages(agent, task),
+        "temperature": temperature,
+        "api_key": os.environ.get("OPENROUTER_API_KEY"),
+        # Providers without structured output support ignore the schema; the answer is validated anyway
+        "drop_params": True,
+    }
+    if response_model is not None:
+        kwargs["response_format"] = response_model
+    return kwargs
+
+
+def _to_result(response, response_model) -> CachedResponse:
+    content = response.choices[0].message.content or ""
+    if not content.strip():
+        raise ValueError("LLM returned an empty completion.")
+
+    if response_model is None:
+        result = CachedResponse(content)
+    else:
+        report = parse_structured(content, response_model)
+        result = CachedResponse(report.model_dump_json(), report.model_dump())
+
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        result.token_usage = {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+            "completion_tokens": getattr(usage, "completion_tokens", 0),
+            "total_tokens": getattr(usage, "total_tokens", 0),
+        }
+    return result
+
+
+def complete(agent, task, model: str, temperature: float = 0.7, tokens: int = 0, response_model=None):
+    """
+    Runs an agent's task as a single blocking chat completion.
+
+    Args:
+        agent (Agent): A tool-less agent.
+        task (Task): The task of the agent.
+        model (str): The model to call.
+        temperature (float): The sampling temperature.
+        tokens (int): Estimated prompt tokens (unused: the rate limiter estimates each request).
+        response_model (type): Optional pydantic model the answer must match.
+
+    Returns:
+        CachedResponse: The result, with ``json_dict`` filled for structured output.
+    """
+    with model_router.observe(model) as call:
+        response = litellm.completion(**_completion_kwargs(agent, task, model, temperature, response_model))
+        result = _to_result(response, response_model)
+        call["tokens"] = completion_tokens(result)
+    return result
+
+
+async def acomplete(agent, task, model: str, temperature: float = 0.7, tokens: int = 0, response_model=None):
+    """
+    Async variant of :func:`complete`, awaited on the event loop without a thread.
+    """
+    with model_router.observe(model) as call:
+        response = await litellm.acompletion(**_completion_kwargs(agent, task, model, temperature, response_model))
+        result = _to_result(response, response_model)
+        call["tokens"] = completion_tokens(result)
+    return result
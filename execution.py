@@ -0,0 +1,283 @@
+"""
+Execution helpers for running CrewAI crews from the LangGraph nodes.
+
+Three execution modes are available for the async (parallel) nodes:
+
+* ``thread`` (default): the blocking ``crew.kickoff()`` runs on a dedicated, bounded
+  thread pool instead of the default asyncio executor.
+* ``native``: the crew runs through CrewAI's native ``crew.akickoff()`` on the event loop.
+* ``process``: the crew is rebuilt and run in a worker process of a reusable pool
+  (see :mod:`process_pool`). A call exceeding its timeout, or cancelled (e.g. a
+  straggler past the quorum), kills its worker instead of leaking a thread.
+
+A per-call ``timeout`` bounds the wait in every mode, but only the ``process`` mode
+actually stops the work: in ``thread`` mode the abandoned kickoff keeps running.
+
+In both modes the retry backoff is awaited with ``asyncio.sleep`` (see
+:func:`utils.async_retry_llm`), so a waiting expert does not hold a thread.
+
+When a model name is given, the latency and outcome of each kickoff are reported to
+:data:`model_router.model_router`. Rate limits apply to each provider request of the
+kickoff, not to the kickoff as a whole (see :mod:`rate_limiter`).
+"""
+import asyncio
+import functools
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from model_router import model_router, completion_tokens
+from process_pool import get_process_pool
+from rate_limiter import install_litellm_limits
+from retry_policy import FatalLLMError
+
+EXECUTION_MODES = ("thread", "native", "process")
+DEFAULT_EXECUTION_MODE = os.environ.get("NEXUS_EXECUTION_MODE", "thread")
+DEFAULT_LLM_WORKERS = int(os.environ.get("NEXUS_LLM_WORKERS", 64))
+DEFAULT_PROCESS_WORKERS = int(os.environ.get("NEXUS_PROCESS_WORKERS", 4))
+# Wall-clock limit of a single expert call, in seconds (0 = no limit)
+DEFAULT_EXPERT_TIMEOUT = float(os.environ.get("NEXUS_EXPERT_TIMEOUT", 300))
+
+# Every provider request of a crew (each ReAct turn) takes its own rate-limit slot
+install_litellm_limits()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """
+    Returns the dedicated thread pool used for blocking LLM work, creating it on first use.
+
+    Returns:
+        ThreadPoolExecutor: The shared executor (size set by ``NEXUS_LLM_WORKERS``).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_LLM_WORKERS, thread_name_prefix="nexus-llm")
+        return _executor
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Runs a blocking callable on the dedicated LLM executor and awaits its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_llm_executor(), functools.partial(func, *args, **kwargs))
+
+def check_crew_result(res):
+    """
+    Raises if a crew result is actually a failure report.
+
+    CrewAI often returns strings on failure instead of raising.
+
+    Args:
+        res: The object returned by ``crew.kickoff()``.
+
+    Returns:
+        The unchanged result when it is not a failure.
+    """
+    if isinstance(res, str) and ("Task Failed" in res or "Crew Execution Failed" in res or "LLM Call Failed" in res):
+        raise Exception(f"CrewAI reported failure: {res[:200]}...")
+
+    # If result has direct failure output (depends on crewai version)
+    if hasattr(res, 'tasks_output') and any(t.raw and "Task Failed" in t.raw for t in res.tasks_output):
+        raise Exception("CrewAI Task reported failure.")
+
+    return res
+
+def kickoff_crew(crew, model: str = None, tokens: int = 0):
+    """
+    Runs a crew synchronously and validates its result.
+
+    Args:
+        crew (Crew): The crew to run.
+        model (str): The model used by the crew, for latency routing. None disables it.
+        tokens (int): Estimated prompt tokens (unused: rate limits are charged per provider request).
+    """
+    with model_router.observe(model) as call:
+        res = check_crew_result(crew.kickoff())
+        call["tokens"] = completion_tokens(res)
+    return res
+
+def crew_spec(expert_data: dict, task_factory: str, task_args: list, model: str, temperature: float = 0.7, web_search_enabled: bool = True, description: str = None) -> dict:
+    """
+    Describes a single-expert crew with picklable values, so a worker process can rebuild it.
+
+    Args:
+        expert_data (dict): The expert definition passed to ``create_expert_agent``.
+        task_factory (str): Name of the task builder in :mod:`tasks` (e.g. ``"hypothesis_task"``).
+        task_args (list): Arguments of the task builder after the agent.
+        model (str): The model of the agent.
+        temperature (float): The temperature of the agent.
+        web_search_enabled (bool): Whether the agent gets web search tools.
+        description (str): Task description replacing the built one (e.g. trimmed to the model context).
+
+    Returns:
+        dict: The crew specification.
+    """
+    return {
+        "expert_data": expert_data,
+        "task_factory": task_factory,
+        "task_args": list(task_args),
+        "model": model,
+        "temperature": temperature,
+        "web_search_enabled": web_search_enabled,
+        "description": description,
+    }
+
+def run_crew_spec(spec: dict) -> str:
+    """
+    Worker-process entry point: rebuilds the crew described by ``spec`` and runs it.
+
+    Returns:
+        str: The serialized result (see :func:`llm_cache.serialize_result`).
+    """
+    from crewai import Crew
+    import tasks
+    from agents import create_expert_agent
+    from llm_cache import serialize_result
+
+    agent = create_expert_agent(spec["expert_data"], temperature=spec["temperature"], web_search_enabled=spec["web_search_enabled"], model_name=spec["model"])
+    task = getattr(tasks, spec["task_factory"])(agent, *spec["task_args"])
+    if spec.get("description"):
+        task.description = spec["description"]
+    crew = Crew(agents=[agent], tasks=[task], verbose=True)
+    return serialize_result(check_crew_result(crew.kickoff()))
+
+async def akickoff_crew(crew, mode: str = None, model: str = None, tokens: int = 0, spec: dict = None, timeout: float = None):
+    """
+    Runs a crew without blocking the event loop and validates its result.
+
+    Args:
+        crew (Crew): The crew to run.
+        mode (str): ``"thread"``, ``"native"`` or ``"process"``. Defaults to ``NEXUS_EXECUTION_MODE``.
+        model (str): The model used by the crew, for latency routing. None disables it.
+        tokens (int): Estimated prompt tokens (unused: rate limits are charged per provider request).
+        spec (dict): The :func:`crew_spec` of the crew, required in ``process`` mode.
+        timeout (float): Wall-clock limit of the call in seconds. Defaults to ``NEXUS_EXPERT_TIMEOUT``; 0 disables it.
+
+    Returns:
+        The crew result.
+    """
+    mode = mode or DEFAULT_EXECUTION_MODE
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{mode}'. Expected one of {EXECUTION_MODES}.")
+    if mode == "process" and spec is None:
+        raise ValueError("The 'process' execution mode requires a crew spec.")
+    timeout = (DEFAULT_EXPERT_TIMEOUT if timeout is None else timeout) or None
+
+    with model_router.observe(model) as call:
+        if mode == "process":
+            from llm_cache import deserialize_result
+            pool = get_process_pool(DEFAULT_PROCESS_WORKERS)
+            payload = await pool.arun(run_crew_spec, (spec,), timeout=timeout, executor=get_llm_executor())
+            res = deserialize_result(payload)
+        elif mode == "native":
+            res = await asyncio.wait_for(crew.akickoff(), timeout)
+        else:
+            res = await asyncio.wait_for(run_blocking(crew.kickoff), timeout)
+        res = check_crew_result(res)
+        call["tokens"] = completion_tokens(res)
+    return res
+
+STRAGGLER_POLICIES = ("cancel", "background")
+
+# Stragglers left running in the background (kept referenced until they finish)
+_background_tasks = set()
+
+def resolve_quorum(quorum, total: int) -> int:
+    """
+    Converts a quorum setting into a number of required successes.
+
+    Args:
+        quorum (int | float | None): A fraction in ]0, 1] (e.g. 0.8), an absolute count (e.g. 4) or None for all.
+        total (int): The number of parallel calls.
+
+    Returns:
+        int: The number of successful results needed, between 1 and ``total``.
+    """
+    if not quorum or total == 0:
+        return total
+    if isinstance(quorum, float) and quorum <= 1.0:
+        required = math.ceil(quorum * total)
+    else:
+        required = int(quorum)
+    return max(1, min(total, required))
+
+async def gather_with_quorum(coros, quorum=None, deadline: float = None, is_success=None, straggler_policy: str = "cancel", label: str = "tasks"):
+    """
+    Runs coroutines concurrently and returns once enough of them are done.
+
+    Without a deadline, the gather returns as soon as ``quorum`` successful results are
+    available (all calls when no quorum is set). With a deadline, every call is awaited
+    until the deadline; past it, the gather returns as soon as ``quorum`` successful
+    results are available. The remaining calls (stragglers) are cancelled or left to
+    finish in the background.
+
+    A :class:`FatalLLMError` aborts the gather as soon as any call raises it.
+
+    Args:
+        coros (iterable): The coroutines to run.
+        quorum (int | float | None): Required successes (see :func:`resolve_quorum`). None waits for all.
+        deadline (float): Seconds during which every call is awaited before the quorum rule applies. None or 0 applies it at once.
+        is_success (callable): Tells whether a result counts toward the quorum. Defaults to truthiness.
+        straggler_policy (str): ``"cancel"`` or ``"background"``.
+        label (str): Name used in log messages.
+
+    Returns:
+        list: The results in input order; ``None`` for stragglers and calls that raised.
+
+    Raises:
+        FatalLLMError: If any call raised it (the other calls are cancelled).
+    """
+    if straggler_policy not in STRAGGLER_POLICIES:
+        raise ValueError(f"Unknown straggler policy '{straggler_policy}'. Expected one of {STRAGGLER_POLICIES}.")
+    is_success = is_success or bool
+    tasks = [asyncio.ensure_future(c) for c in coros]
+    if not tasks:
+        return []
+
+    def successes(done):
+        return sum(1 for t in done if not t.cancelled() and t.exception() is None and is_success(t.result()))
+
+    def fatal_error(done):
+        return next((t.exception() for t in done if not t.cancelled() and isinstance(t.exception(), FatalLLMError)), None)
+
+    loop = asyncio.get_running_loop()
+    until = loop.time() + deadline if deadline else None
+    required = resolve_quorum(quorum, len(tasks))
+    done, pending = set(), set(tasks)
+    while pending:
+        timeout = None if until is None else until - loop.time()
+        if timeout is not None and timeout <= 0:
+            timeout = None
+        newly_done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        done |= newly_done
+        # A fatal error (e.g. invalid API key) aborts the whole phase at once
+        fatal = fatal_error(newly_done)
+        if fatal is not None:
+            for t in pending:
+                t.cancel()
+            raise fatal
+        # Before the deadline every call is awaited; then only until the quorum is reached
+        if (until is None or loop.time() >= until) and successes(done) >= required:
+            break
+
+    if pending:
+        reason = "Deadline reached" if until is not None else "Quorum reached"
+        print(f"⏱️ {reason} for {label}: {successes(done)}/{len(tasks)} succeeded, {len(pending)} straggler(s) {'cancelled' if straggler_policy == 'cancel' else 'left running in background'}.")
+        for t in pending:
+            if straggler_policy == "cancel":
+                t.cancel()
+            else:
+                _background_tasks.add(t)
+                t.add_done_callback(_background_tasks.discard)
+
+    results = []
+    for t in tasks:
+        if t in done and not t.cancelled() and t.exception() is None:
+            results.append(t.result())
+        else:
+            results.append(None)
+    return results
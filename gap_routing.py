@@ -0,0 +1,71 @@
+"""
+Routing of knowledge gaps to the experts able to close them.
+
+In the ``incremental`` iteration mode, a loop after the synthesis does not regenerate
+every hypothesis. Each knowledge gap is routed to the experts whose profile (role,
+skill, bias, backstory) shares the most vocabulary with it; only those experts revise
+their previous hypothesis, the others are carried forward unchanged.
+
+Matching is lexical and cheap: words are reduced to a 5-character prefix, so
+"biological" matches "Biologist" and "optimisation" matches "optimization".
+"""
+import os
+import re
+
+ITERATION_MODES = ("full", "incremental")
+DEFAULT_ITERATION_MODE = os.environ.get("NEXUS_ITERATION_MODE", "full")
+# Experts a single gap is routed to
+DEFAULT_EXPERTS_PER_GAP = int(os.environ.get("NEXUS_EXPERTS_PER_GAP", 2))
+
+_STEM = 5
+
+
+def _stems(text: str) -> set:
+    return {w[:_STEM] for w in re.findall(r"\w+", str(text).lower()) if len(w) > 3}
+
+
+def expert_profile(expert: dict) -> str:
+    """
+    Returns the text describing what an expert knows.
+    """
+    return " ".join(str(expert.get(field, "")) for field in ("role", "skill", "bias", "backstory"))
+
+
+def gap_relevance(gap: str, expert: dict) -> float:
+    """
+    Share of the gap's words found in the expert profile (0 = unrelated, 1 = fully covered).
+    """
+    gap_stems = _stems(gap)
+    if not gap_stems:
+        return 0.0
+    return len(gap_stems & _stems(expert_profile(expert))) / len(gap_stems)
+
+
+def route_gaps(gaps: list, experts: list, per_gap: int = None) -> dict:
+    """
+    Assigns every knowledge gap to the most relevant experts.
+
+    A gap matching no expert profile is routed to every expert rather than dropped.
+
+    Args:
+        gaps (list): The knowledge gaps reported by the synthesis.
+        experts (list): The expert definitions.
+        per_gap (int): Experts per gap. Defaults to ``NEXUS_EXPERTS_PER_GAP``.
+
+    Returns:
+        dict: Expert name -> list of the gaps that expert must address (experts without gaps are absent).
+    """
+    per_gap = per_gap or DEFAULT_EXPERTS_PER_GAP
+    routing = {}
+    for gap in gaps:
+        scored = sorted(experts, key=lambda e: gap_relevance(gap, e), reverse=True)
+        if not scored:
+            break
+        if gap_relevance(gap, scored[0]) == 0:
+            print(f"🧭 Gap matches no expert profile, routed to all experts: {gap[:80]}")
+            chosen = scored
+        else:
+            chosen = [e for e in scored[:per_gap] if gap_relevance(gap, e) > 0]
+        for expert in chosen:
+            routing.setdefault(expert['name'], []).append(gap)
+    return routing
@@ -3,14 +3,33 @@ Defines the LangGraph workflow for the Nexus-Science agent.
 
 This module sets up the state graph, nodes, and edges for the multi-agent research process.
 """
-from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import StateGraph, START, END
 from state import AgentState
-from agents import RecruiterAgent, create_expert_agent, DevilsAdvocate, Synthesizer, get_alpha_evolve_expert
-from tasks import recruit_task, hypothesis_task, debate_task, synthesis_task, cross_pollination_task
+from agents import RecruiterAgent, create_expert_agent, DevilsAdvocate, Synthesizer, get_fixed_experts
+from tasks import recruit_task, hypothesis_task, revision_task, debate_task, debate_reduce_task, synthesis_task, cross_pollination_task
 from crewai import Crew, Process
 import json
+import os
 import re
-from utils import retry_llm
+import uuid
+from utils import retry_llm, async_retry_llm
+from execution import kickoff_crew, akickoff_crew, crew_spec, gather_with_quorum, get_llm_executor
+from llm_cache import llm_cache, crew_cache_key
+from token_budget import preflight
+from checkpoint import checkpointer
+from circuit_breaker import model_health
+from model_router import order_models
+from model_tiers import node_tier, tier_chain
+from accounting import NodeUsage
+from retry_policy import FatalLLMError, classify_error
+from direct_llm import complete, uses_direct_llm
+from models import SynthesisReport
+from topology import select_neighbours, DEFAULT_TOPOLOGY
+from digest import add_digests, DEFAULT_DIGEST_MODE
+from gap_routing import route_gaps, DEFAULT_ITERATION_MODE
+from prefetch import start_prefetch, DEFAULT_TOOL_PREFETCH
+from dedup import prune_duplicates, distinct_hypotheses, DEFAULT_DEDUP_MODE
 
 from crewai import Crew, Process
 import asyncio
@@ -25,6 +44,75 @@ FALLBACK_MODELS = [
     "openrouter/google/gemma-2-9b-it:free"
 ]
 
+# Hypotheses of the fixed experts generated while the recruiter runs
+DEFAULT_SPECULATIVE_EXPERTS = os.environ.get("NEXUS_SPECULATIVE_EXPERTS", "0") == "1"
+
+DEBATE_MODES = ("single", "map_reduce")
+DEFAULT_DEBATE_MODE = os.environ.get("NEXUS_DEBATE_MODE", "single")
+DEFAULT_DEBATE_SHARD_SIZE = int(os.environ.get("NEXUS_DEBATE_SHARD_SIZE", 2))
+
+def get_models_to_try(state: AgentState, node: str = None):
+    """
+    Builds the ordered model chain for a node: the selected model first, then the fallback models.
+
+    A node assigned to a model tier (``node_tiers`` in the state) uses the chain of
+    its tier instead (see :mod:`model_tiers`).
+
+    In the ``adaptive`` routing mode (``model_routing`` in the state), the chain is
+    reordered by :mod:`model_router`, fastest healthy model first.
+
+    Models whose circuit breaker is open are still listed; nodes check
+    ``model_health.allow_request`` right before each attempt so that a model
+    tripped by a concurrent expert is skipped as well.
+
+    Args:
+        state (AgentState): The current state of the workflow.
+        node (str): The node asking for its chain ("recruit", "hypothesis", ...).
+
+    Returns:
+        list: The model names to try, in order.
+    """
+    tier = node_tier(state, node)
+    if tier:
+        return order_models(tier_chain(state, tier), state.get('model_routing'))
+
+    primary_model = state.get('model_name')
+    models_to_try = [primary_model] if primary_model else []
+    for m in FALLBACK_MODELS:
+        if m not in models_to_try:
+            models_to_try.append(m)
+    return order_models(models_to_try, state.get('model_routing'))
+
+def record_model_error(model: str, error: Exception):
+    """
+    Reports a failed attempt to the circuit breaker of its model.
+
+    Only provider errors (rate limits, 5xx, timeouts, unknown errors) count as breaker
+    failures. Errors caused by the prompt (context overflow, bad request, schema
+    mismatch) say nothing about the health of the model: the node falls back without
+    tripping the breaker, and a half-open probe is given back.
+
+    Args:
+        model (str): The model that failed.
+        error (Exception): The error raised by the attempt.
+    """
+    if isinstance(error, TimeoutError) or classify_error(error) in ("transient", "unknown"):
+        model_health.record_failure(model)
+    else:
+        model_health.release_probe(model)
+
+def successful_hypotheses(hypotheses):
+    """
+    Drops the placeholders of experts that failed or missed the node deadline.
+
+    Args:
+        hypotheses (list): The hypotheses from the state.
+
+    Returns:
+        list: The hypotheses actually produced by an expert.
+    """
+    return [h for h in hypotheses if not h.get('failed')]
+
 def recruit_node(state: AgentState):
     """
     Node for recruiting experts.
@@ -41,16 +129,17 @@ def recruit_node(state: AgentState):
     experts_data = []
     
     # Determine models to try
-    primary_model = state.get('model_name')
-    models_to_try = [primary_model] if primary_model else []
-    for m in FALLBACK_MODELS:
-        if m not in models_to_try:
-            models_to_try.append(m)
+    models_to_try = get_models_to_try(state, "recruit")
             
     result = None
     last_error = None
+    usage = NodeUsage(state, "recruit")
 
     for model in models_to_try:
+        if not model_health.allow_request(model):
+            print(f"⏭️ Skipping {model} for Recruit (circuit open).")
+            continue
+        call = usage.call(model, "Recruiter")
         try:
             print(f"🔄 Attempting Recruit with model: {model}")
             agent = recruiter.recruit(state['input'], temperature=state.get('temperature', 0.7), model_name=model)
@@ -59,23 +148,25 @@ def recruit_node(state: AgentState):
             # Memory disabled due to embedding API key issues
             crew = Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=True)
             
-            @retry_llm
-            def run_crew():
-                res = crew.kickoff()
-                # Check if result indicates a failure (CrewAI often returns strings on failure)
-                if isinstance(res, str) and ("Task Failed" in res or "Crew Execution Failed" in res or "LLM Call Failed" in res):
-                     raise Exception(f"CrewAI reported failure: {res[:200]}...")
-                
-                # If result has direct failure output (depends on crewai version)
-                if hasattr(res, 'tasks_output') and any(t.raw and "Task Failed" in t.raw for t in res.tasks_output):
-                     raise Exception("CrewAI Task reported failure.")
-                     
-                return res
-            
-            result = run_crew()
+            # Pre-flight: skip models whose context cannot hold the prompt (or trim it)
+            tokens = preflight(agent, task, model, state.get('context_policy'))
+            if tokens is None:
+                # The model was not called: give back a half-open probe
+                model_health.release_probe(model)
+                call.skip()
+                continue
+            key = crew_cache_key(agent, task, model, state.get('temperature', 0.7))
+            result = llm_cache.call(key, call.compute(lambda: retry_llm(kickoff_crew, call.retry)(crew, model, tokens)), mode=state.get('cache_mode'))
+            model_health.record_success(model)
+            call.success(tokens, result)
             break # Success, exit loop
             
+        except FatalLLMError:
+            # Auth / configuration error: no fallback model can succeed
+            raise
         except Exception as e:
+            record_model_error(model, e)
+            call.failure()
             err_msg = str(e)
             print(f"⚠️ Model {model} failed ({err_msg}). Switching to next model...")
             last_error = e
@@ -116,69 +207,268 @@ def recruit_node(state: AgentState):
         print("Using fallback experts due to error.")
 
     # ------------------------------------------------------------------
-    # SYSTEMATICALLY ADD ALPHAEVOLVE EXPERT
+    # SYSTEMATICALLY ADD THE FIXED EXPERTS (ALPHAEVOLVE)
     # ------------------------------------------------------------------
-    alpha_expert = get_alpha_evolve_expert()
-    # Check if not already present (based on name)
-    if not any(e['name'] == alpha_expert['name'] for e in experts_data):
-        print(f"Adding systematic expert: {alpha_expert['name']}")
-        experts_data.append(alpha_expert)
+    for fixed_expert in get_fixed_experts():
+        # Check if not already present (based on name)
+        if not any(e['name'] == fixed_expert['name'] for e in experts_data):
+            print(f"Adding systematic expert: {fixed_expert['name']}")
+            experts_data.append(fixed_expert)
     # ------------------------------------------------------------------
 
-    return {"experts": experts_data, "iterations": 0}
+    return {"experts": experts_data, "iterations": 0, "usage": usage.records()}
+
+async def prefetch_node(state: AgentState):
+    """
+    Optional node warming the shared tool cache with the likely searches of the panel.
+
+    The queries run in the background (see :mod:`prefetch`), so the hypothesis phase
+    starts at once. Does nothing unless ``tool_prefetch`` is enabled and web search is on.
+    """
+    enabled = state.get('tool_prefetch')
+    if enabled is None:
+        enabled = DEFAULT_TOOL_PREFETCH
+    if not enabled or not state.get('web_search_enabled', True):
+        return {}
+    print("--- PREFETCH DES RECHERCHES ---")
+    start_prefetch(state['input'], state['experts'], state.get('web_search_enabled', True))
+    return {}
+
+async def generate_hypothesis(state: AgentState, expert_data: dict, models_to_try: list, task_factory=None, task_name: str = "hypothesis_task", task_args: list = None, usage: NodeUsage = None):
+    """
+    Runs one expert task (hypothesis or revision) through the model fallback chain.
+
+    Args:
+        state (AgentState): The current state of the workflow.
+        expert_data (dict): The expert definition.
+        models_to_try (list): The model chain of the node.
+        task_factory (callable): Builds the task from the agent and ``task_args``. Defaults to ``hypothesis_task``.
+        task_name (str): Name of the task builder in :mod:`tasks`, for the process mode.
+        task_args (list): Arguments of the task factory after the agent. Defaults to the input.
+        usage (NodeUsage): Collector of the calls of the node (see :mod:`accounting`).
+
+    Returns:
+        dict: The hypothesis, or a placeholder with ``failed`` set if every model failed.
+    """
+    task_factory = task_factory or hypothesis_task
+    task_args = task_args if task_args is not None else [state['input']]
+    usage = usage or NodeUsage(state, "hypothesis")
+    for model in models_to_try:
+        if not model_health.allow_request(model):
+            print(f"⏭️ Skipping {model} for expert {expert_data['name']} (circuit open).")
+            continue
+        call = usage.call(model, expert_data['name'])
+        try:
+            # Recreate agent/task for each attempt to avoid sharing state issues if any
+            agent = create_expert_agent(expert_data, temperature=state.get('temperature', 0.7), web_search_enabled=state.get('web_search_enabled', True), model_name=model)
+            task = task_factory(agent, *task_args)
+            crew = Crew(agents=[agent], tasks=[task], verbose=True)
+            
+            # Backoff is awaited, the blocking kickoff runs on the dedicated LLM executor
+            # Pre-flight: skip models whose context cannot hold the prompt (or trim it)
+            tokens = preflight(agent, task, model, state.get('context_policy'))
+            if tokens is None:
+                # The model was not called: give back a half-open probe
+                model_health.release_probe(model)
+                call.skip()
+                continue
+            key = crew_cache_key(agent, task, model, state.get('temperature', 0.7))
+            # In process mode the worker rebuilds the crew from this picklable spec
+            spec = crew_spec(expert_data, task_name, task_args, model, state.get('temperature', 0.7), state.get('web_search_enabled', True), task.description)
+            result = await llm_cache.acall(key, call.compute(lambda: async_retry_llm(akickoff_crew, call.retry)(crew, state.get('execution_mode'), model, tokens, spec, state.get('expert_timeout'))), mode=state.get('cache_mode'))
+            model_health.record_success(model)
+            call.success(tokens, result)
+            return {
+                "expert_name": expert_data['name'], 
+                "role": expert_data['role'], 
+                "bias": expert_data['bias'], 
+                "hypothesis": str(result)
+            }
+            
+        except FatalLLMError:
+            # Auth / configuration error: no fallback model can succeed
+            raise
+        except Exception as e:
+            record_model_error(model, e)
+            call.failure()
+            err_msg = str(e)
+            print(f"⚠️ Expert {expert_data['name']} failed with model {model} ({err_msg}). Switching to next model...")
+    
+    # If all failed
+    print(f"❌ Expert {expert_data['name']} failed completely.")
+    return {"expert_name": expert_data['name'], "hypothesis": "Error: Unable to generate hypothesis.", "failed": True}
+
+# Speculative hypothesis tasks, by speculation id ("<run id>/<uuid>") then expert name (in-process only)
+_speculations = {}
+
+def _consume_exception(task):
+    # A speculation nobody awaits (cancelled or failed run) must not log "Task exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+async def speculate_node(state: AgentState, config: RunnableConfig = None):
+    """
+    Starts the hypotheses of the fixed experts (see ``agents.get_fixed_experts``) in
+    the background, in parallel with the recruitment.
+
+    Their profiles do not depend on the recruiter, so their first-iteration hypotheses
+    can start before it answers; :func:`hypothesis_node` then awaits them instead of
+    starting them, taking them off the critical path. The node returns at once.
+    Tasks the run does not use are cancelled by :func:`cancel_speculations`.
+
+    Returns:
+        dict: The ``speculation_id`` under which the tasks are registered (empty when disabled).
+    """
+    enabled = state.get('speculative_experts')
+    if enabled is None:
+        enabled = DEFAULT_SPECULATIVE_EXPERTS
+    if not enabled or state.get('iterations', 0) > 0:
+        return {}
+
+    models_to_try = get_models_to_try(state, "hypothesis")
+    run_id = ((config or {}).get('configurable') or {}).get('thread_id', "")
+    speculation_id = f"{run_id}/{uuid.uuid4().hex}"
+    # Calls are charged to the hypothesis node when it uses the speculative hypotheses
+    usage = NodeUsage(state, "hypothesis")
+    speculations = {}
+    for expert in get_fixed_experts():
+        task = asyncio.ensure_future(generate_hypothesis(state, expert, models_to_try, usage=usage))
+        task.add_done_callback(_consume_exception)
+        speculations[expert['name']] = (expert, task, usage)
+    _speculations[speculation_id] = speculations
+    print(f"🚀 Speculative hypotheses started for: {', '.join(speculations)}")
+    return {"speculation_id": speculation_id}
+
+def cancel_speculations(config: dict):
+    """
+    Cancels and forgets the speculative tasks of a run that the hypothesis node did not take.
+
+    Called when a run ends, whatever the outcome: the recruiter may have failed, or the
+    run may have stopped before the hypotheses.
+
+    Args:
+        config (dict): The LangGraph config of the run (see ``checkpoint.run_config``).
+    """
+    prefix = f"{config['configurable']['thread_id']}/"
+    for speculation_id in [s for s in list(_speculations) if s.startswith(prefix)]:
+        for _, task, _ in _speculations.pop(speculation_id, {}).values():
+            task.cancel()
+
+def take_speculations(state: AgentState) -> dict:
+    """
+    Removes and returns the speculative tasks still usable by the hypothesis node.
+
+    They are only valid for the first iteration, for an unchanged input, and for
+    experts whose profile in the panel is still the fixed one (the recruiter may have
+    proposed an expert of the same name).
+
+    Returns:
+        dict: Expert name -> (task, usage collector of the task).
+    """
+    speculations = _speculations.pop(state.get('speculation_id') or "", {})
+    usable = {}
+    panel = {e['name']: e for e in state['experts']}
+    for name, (expert, task, usage) in speculations.items():
+        if state.get('iterations', 0) == 0 and panel.get(name) == expert:
+            usable[name] = (task, usage)
+        else:
+            task.cancel()
+    return usable
 
 async def hypothesis_node(state: AgentState):
     """
     Node for generating hypotheses from experts.
     PARALLELIZED.
+
+    In the "incremental" iteration mode, loops after the first iteration only ask the
+    experts concerned by a knowledge gap to revise their previous hypothesis; the
+    other hypotheses are carried forward unchanged.
     """
-    print("--- GÉNÉRATION DES HYPOTHÈSES (PARALLEL) ---")
     experts_data = state['experts']
+    previous = {h['expert_name']: h for h in state.get('hypotheses') or [] if not h.get('failed')}
+    incremental = (state.get('iteration_mode') or DEFAULT_ITERATION_MODE) == "incremental" and state.get('iterations', 0) > 0 and previous
+    routing = route_gaps(state.get('knowledge_gaps') or [], experts_data) if incremental else {}
+
+    if incremental:
+        print("--- RÉVISION INCRÉMENTALE DES HYPOTHÈSES (PARALLEL) ---")
+    else:
+        print("--- GÉNÉRATION DES HYPOTHÈSES (PARALLEL) ---")
     
     # Determine models to try
-    primary_model = state.get('model_name')
-    models_to_try = [primary_model] if primary_model else []
-    for m in FALLBACK_MODELS:
-        if m not in models_to_try:
-            models_to_try.append(m)
-            
-    async def run_expert(expert_data):
-        for model in models_to_try:
-            try:
-                # Recreate agent/task inside the thread to avoid sharing state issues if any
-                agent = create_expert_agent(expert_data, temperature=state.get('temperature', 0.7), web_search_enabled=state.get('web_search_enabled', True), model_name=model)
-                task = hypothesis_task(agent, state['input'])
-                crew = Crew(agents=[agent], tasks=[task], verbose=True)
-                
-                @retry_llm
-                def run_crew_sync():
-                    res = crew.kickoff()
-                    # Check for error strings
-                    if isinstance(res, str) and ("Task Failed" in res or "Crew Execution Failed" in res or "LLM Call Failed" in res):
-                        raise Exception(f"CrewAI reported failure: {res[:200]}...")
-                    return res
-                    
-                # Run blocking call in thread
-                result = await asyncio.to_thread(run_crew_sync)
-                return {
-                    "expert_name": expert_data['name'], 
-                    "role": expert_data['role'], 
-                    "bias": expert_data['bias'], 
-                    "hypothesis": str(result)
-                }
-                
-            except Exception as e:
-                err_msg = str(e)
-                print(f"⚠️ Expert {expert_data['name']} failed with model {model} ({err_msg}). Switching to next model...")
-        
-        # If all failed
-        print(f"❌ Expert {expert_data['name']} failed completely.")
-        return {"expert_name": expert_data['name'], "hypothesis": "Error: Unable to generate hypothesis."}
-
-    # Execute all experts in parallel
-    results = await asyncio.gather(*(run_expert(e) for e in experts_data))
+    models_to_try = get_models_to_try(state, "hypothesis")
+    usage = NodeUsage(state, "hypothesis")
+
+    def run_expert(expert_data, task_factory=hypothesis_task, task_name="hypothesis_task", task_args=None):
+        return generate_hypothesis(state, expert_data, models_to_try, task_factory, task_name, task_args, usage)
+
+    async def run_incremental(expert_data):
+        name = expert_data['name']
+        if name not in previous:
+            # Nothing to carry forward (failed or new expert): generate from scratch
+            return {**await run_expert(expert_data), "revised": True}
+        if name not in routing:
+            carried = dict(previous[name])
+            carried.pop('revised', None)
+            return carried
+        revised = await run_expert(expert_data, revision_task, "revision_task", [previous[name]['hypothesis'], routing[name], state['input']])
+        if revised.get('failed'):
+            # Keep the previous hypothesis rather than losing it
+            print(f"↩️ Revision failed for {name}, carrying forward the previous hypothesis.")
+            return previous[name]
+        return {**revised, "revised": True}
+
+    # Fixed experts started during the recruitment: await them instead of starting them
+    speculative = {} if incremental else take_speculations(state)
+
+    async def run_speculative(expert_data):
+        if expert_data['name'] not in speculative:
+            return await run_expert(expert_data)
+        task, speculative_usage = speculative[expert_data['name']]
+        print(f"⚡ Using the speculative hypothesis of {expert_data['name']}.")
+        result = await task
+        usage.extend(speculative_usage.records(expert_data['name']))
+        return result
+
+    if incremental:
+        to_run = [e for e in experts_data if e['name'] in routing or e['name'] not in previous]
+        print(f"Incremental iteration: {len(to_run)}/{len(experts_data)} expert(s) revising, {len(experts_data) - len(to_run)} hypothesis(es) carried forward.")
+        runner = run_incremental
+    elif speculative:
+        runner = run_speculative
+    else:
+        runner = run_expert
+
+    # Execute all experts in parallel, up to the node deadline / quorum
+    results = await gather_with_quorum(
+        (runner(e) for e in experts_data),
+        quorum=state.get('expert_quorum'),
+        deadline=(state.get('node_deadlines') or {}).get('hypothesis'),
+        is_success=lambda h: not h.get('failed'),
+        straggler_policy=state.get('straggler_policy', 'cancel'),
+        label="hypotheses"
+    )
+    hypotheses = [
+        r if r is not None else previous.get(e['name']) if incremental and e['name'] in previous
+        else {"expert_name": e['name'], "hypothesis": "Error: Hypothesis deadline exceeded.", "failed": True}
+        for r, e in zip(results, experts_data)
+    ]
     
-    return {"hypotheses": list(results)}
+    return {"hypotheses": hypotheses, "usage": usage.records()}
+
+async def digest_node(state: AgentState):
+    """
+    Optional node compressing each hypothesis once, to a token budget.
+
+    Cross-pollination and debate prompts then read the digests instead of the full texts.
+    Does nothing when ``digest_mode`` is "off".
+    """
+    mode = state.get('digest_mode') or DEFAULT_DIGEST_MODE
+    if mode == "off":
+        return {}
+    print(f"--- DIGEST ({mode}) ---")
+    usage = NodeUsage(state, "digest")
+    hypotheses = await add_digests(state['hypotheses'], mode, state.get('digest_tokens'), state.get('cache_mode'), usage)
+    return {"hypotheses": hypotheses, "usage": usage.records()}
 
 async def cross_pollination_node(state: AgentState):
     """
@@ -193,11 +483,18 @@ async def cross_pollination_node(state: AgentState):
     expert_map = {e['name']: e for e in experts_data}
 
     # Determine models to try
-    primary_model = state.get('model_name')
-    models_to_try = [primary_model] if primary_model else []
-    for m in FALLBACK_MODELS:
-        if m not in models_to_try:
-            models_to_try.append(m)
+    models_to_try = get_models_to_try(state, "cross_pollination")
+    usage = NodeUsage(state, "cross_pollination")
+
+    # Incremental iterations only cross-pollinate the revised hypotheses
+    incremental = (state.get('iteration_mode') or DEFAULT_ITERATION_MODE) == "incremental" and state.get('iterations', 0) > 0
+
+    # Each expert only reads its neighbours in the selected topology (failed placeholders carry no ideas)
+    candidates = successful_hypotheses(hypotheses)
+    topology = state.get('cross_topology')
+    neighbours = select_neighbours(candidates, topology, state.get('cross_neighbours'), seed=f"{state['input']}:{state.get('iterations', 0)}")
+    neighbour_map = {h['expert_name']: n for h, n in zip(candidates, neighbours)}
+    print(f"Cross-pollination topology: {topology or DEFAULT_TOPOLOGY} ({sum(len(n) for n in neighbours)} hypotheses shared).")
 
     async def run_cross_pollination(h):
         expert_name = h['expert_name']
@@ -205,13 +502,19 @@ async def cross_pollination_node(state: AgentState):
         
         # Get expert data
         expert_data = expert_map.get(expert_name)
-        if not expert_data:
+        if not expert_data or h.get('failed'):
+            return h
+        if incremental and not h.get('revised'):
+            # Carried forward from the previous iteration: already cross-pollinated
             return h
             
-        # Get other hypotheses
-        other_hypotheses = [oh for oh in hypotheses if oh['expert_name'] != expert_name]
+        other_hypotheses = neighbour_map.get(expert_name, [])
         
         for model in models_to_try:
+            if not model_health.allow_request(model):
+                print(f"⏭️ Skipping {model} for cross-pollination {expert_name} (circuit open).")
+                continue
+            call = usage.call(model, expert_name)
             try:
                 agent = create_expert_agent(expert_data, temperature=state.get('temperature', 0.7), web_search_enabled=state.get('web_search_enabled', True), model_name=model)
                 task = cross_pollination_task(agent, current_hypothesis, other_hypotheses, state['input'])
@@ -219,20 +522,29 @@ async def cross_pollination_node(state: AgentState):
                 # Memory disabled
                 crew = Crew(agents=[agent], tasks=[task], verbose=True)
                 
-                @retry_llm
-                def run_crew_sync():
-                    res = crew.kickoff()
-                    if isinstance(res, str) and ("Task Failed" in res or "Crew Execution Failed" in res or "LLM Call Failed" in res):
-                         raise Exception(f"CrewAI reported failure: {res[:200]}...")
-                    return res
-
-                result = await asyncio.to_thread(run_crew_sync)
+                # Pre-flight: skip models whose context cannot hold the prompt (or trim it)
+                tokens = preflight(agent, task, model, state.get('context_policy'))
+                if tokens is None:
+                    # The model was not called: give back a half-open probe
+                    model_health.release_probe(model)
+                    call.skip()
+                    continue
+                key = crew_cache_key(agent, task, model, state.get('temperature', 0.7))
+                spec = crew_spec(expert_data, "cross_pollination_task", [current_hypothesis, other_hypotheses, state['input']], model, state.get('temperature', 0.7), state.get('web_search_enabled', True), task.description)
+                result = await llm_cache.acall(key, call.compute(lambda: async_retry_llm(akickoff_crew, call.retry)(crew, state.get('execution_mode'), model, tokens, spec, state.get('expert_timeout'))), mode=state.get('cache_mode'))
+                model_health.record_success(model)
+                call.success(tokens, result)
                 
                 return {
                     "expert_name": expert_name, 
                     "hypothesis": str(result)
                 }
+            except FatalLLMError:
+                # Auth / configuration error: no fallback model can succeed
+                raise
             except Exception as e:
+                record_model_error(model, e)
+                call.failure()
                 print(f"⚠️ Cross-pollination {expert_name} failed with model {model}: {e}")
                 continue
 
@@ -240,48 +552,156 @@ async def cross_pollination_node(state: AgentState):
         print(f"❌ Cross-pollination {expert_name} failed completely.")
         return h # Keep original if error
 
-    # Execute all cross-pollination tasks in parallel
-    enriched_hypotheses = await asyncio.gather(*(run_cross_pollination(h) for h in hypotheses))
-
-    return {"hypotheses": list(enriched_hypotheses)}
+    # Execute all cross-pollination tasks in parallel, up to the node deadline / quorum
+    results = await gather_with_quorum(
+        (run_cross_pollination(h) for h in hypotheses),
+        quorum=state.get('expert_quorum'),
+        deadline=(state.get('node_deadlines') or {}).get('cross_pollination'),
+        straggler_policy=state.get('straggler_policy', 'cancel'),
+        label="cross-pollination"
+    )
+    # Stragglers keep their original hypothesis
+    enriched_hypotheses = [r if r is not None else h for r, h in zip(results, hypotheses)]
+
+    # Enriched hypotheses are digested for the debate (unchanged ones keep their digest)
+    digest_mode = state.get('digest_mode') or DEFAULT_DIGEST_MODE
+    digest_usage = NodeUsage(state, "digest")
+    if digest_mode != "off":
+        enriched_hypotheses = await add_digests(enriched_hypotheses, digest_mode, state.get('digest_tokens'), state.get('cache_mode'), digest_usage)
+
+    return {"hypotheses": enriched_hypotheses, "usage": usage.records() + digest_usage.records()}
+
+def dedup_node(state: AgentState):
+    """
+    Optional node leaving near-duplicate hypotheses out of the debate (MinHash similarity).
 
-def debate_node(state: AgentState):
+    Records the similarity matrix and the tokens saved in ``dedup_report``.
+    Does nothing when ``dedup_mode`` is "off".
     """
-    Node for the debate phase.
+    mode = state.get('dedup_mode') or DEFAULT_DEDUP_MODE
+    if mode == "off":
+        return {}
+    print(f"--- DEDUP ({mode}) ---")
+    hypotheses, report = prune_duplicates(state['hypotheses'], mode, state.get('dedup_threshold'))
+    for p in report['pruned']:
+        print(f"✂️ {p['expert_name']} ≈ {p['duplicate_of']} (similarity {p['similarity']:.2f}): left out of the debate.")
+    print(f"Dedup: {len(report['pruned'])} near-duplicate(s), ~{report['tokens_saved']} debate tokens saved.")
+    return {"hypotheses": hypotheses, "dedup_report": report}
+
+def run_devils_advocate(state: AgentState, task_factory, task_args: list, label: str = "Debate", usage: NodeUsage = None):
     """
-    print("--- DÉBAT ---")
-    
-    # Determine models to try
-    primary_model = state.get('model_name')
-    models_to_try = [primary_model] if primary_model else []
-    for m in FALLBACK_MODELS:
-        if m not in models_to_try:
-            models_to_try.append(m)
-            
-    result = "Debate skipped due to error."
-    
-    for model in models_to_try:
+    Runs one Devil's Advocate task through the model fallback chain.
+
+    Args:
+        state (AgentState): The current state of the workflow.
+        task_factory (callable): Builds the task from the agent and ``task_args``.
+        task_args (list): Arguments of the task factory after the agent.
+        label (str): Name used in log messages and in the usage records.
+        usage (NodeUsage): Collector of the calls of the node (see :mod:`accounting`).
+
+    Returns:
+        The result, or None if every model failed.
+    """
+    usage = usage or NodeUsage(state, "debate")
+    for model in get_models_to_try(state, "debate"):
+        if not model_health.allow_request(model):
+            print(f"⏭️ Skipping {model} for {label} (circuit open).")
+            continue
+        call = usage.call(model, label)
         try:
-            print(f"🔄 Attempting Debate with model: {model}")
+            print(f"🔄 Attempting {label} with model: {model}")
             devils_advocate = DevilsAdvocate().get_agent(temperature=state.get('temperature', 0.7), model_name=model)
-            task = debate_task(devils_advocate, state['hypotheses'], state['input'])
+            task = task_factory(devils_advocate, *task_args)
             
-            # Memory disabled
-            crew = Crew(agents=[devils_advocate], tasks=[task], verbose=True)
-            @retry_llm
-            def run_crew():
-                res = crew.kickoff()
-                if isinstance(res, str) and ("Task Failed" in res or "Crew Execution Failed" in res or "LLM Call Failed" in res):
-                     raise Exception(f"CrewAI reported failure: {res[:200]}...")
-                return res
-
-            result = run_crew()
-            break
+            # Pre-flight: skip models whose context cannot hold the prompt (or trim it)
+            tokens = preflight(devils_advocate, task, model, state.get('context_policy'))
+            if tokens is None:
+                # The model was not called: give back a half-open probe
+                model_health.release_probe(model)
+                call.skip()
+                continue
+            key = crew_cache_key(devils_advocate, task, model, state.get('temperature', 0.7))
+            if uses_direct_llm(state, "debate"):
+                # Tool-less agent: a single chat completion instead of the CrewAI loop
+                result = llm_cache.call(key, call.compute(lambda: retry_llm(complete, call.retry)(devils_advocate, task, model, state.get('temperature', 0.7), tokens)), mode=state.get('cache_mode'))
+            else:
+                # Memory disabled
+                crew = Crew(agents=[devils_advocate], tasks=[task], verbose=True)
+                result = llm_cache.call(key, call.compute(lambda: retry_llm(kickoff_crew, call.retry)(crew, model, tokens)), mode=state.get('cache_mode'))
+            model_health.record_success(model)
+            call.success(tokens, result)
+            return result
+        except FatalLLMError:
+            # Auth / configuration error: no fallback model can succeed
+            raise
         except Exception as e:
-            print(f"⚠️ Debate failed with model {model}: {e}")
+            record_model_error(model, e)
+            call.failure()
+            print(f"⚠️ {label} failed with model {model}: {e}")
             continue
+    return None
+
+def debate_node(state: AgentState):
+    """
+    Node for the debate phase.
+
+    In the "map_reduce" debate mode, shards of hypotheses are critiqued in parallel,
+    then a single reduce call confronts the shard critiques, so no call has to hold
+    every hypothesis in its prompt.
+    """
+    print("--- DÉBAT ---")
+    hypotheses = distinct_hypotheses(state['hypotheses'])
+    dropped = len(state['hypotheses']) - len(hypotheses)
+    if dropped:
+        print(f"Dropping {dropped} failed or duplicate hypothesis(es) before debate.")
 
-    return {"debate_minutes": str(result)}
+    usage = NodeUsage(state, "debate")
+    shard_size = max(1, state.get('debate_shard_size') or DEFAULT_DEBATE_SHARD_SIZE)
+    if (state.get('debate_mode') or DEFAULT_DEBATE_MODE) == "map_reduce" and len(hypotheses) > shard_size:
+        return {"debate_minutes": map_reduce_debate(state, hypotheses, shard_size, usage), "usage": usage.records()}
+
+    result = run_devils_advocate(state, debate_task, [hypotheses, state['input']], usage=usage)
+    if result is None:
+        result = "Debate skipped due to error."
+
+    return {"debate_minutes": str(result), "usage": usage.records()}
+
+def map_reduce_debate(state: AgentState, hypotheses: list, shard_size: int, usage: NodeUsage = None) -> str:
+    """
+    Critiques shards of hypotheses in parallel, then reduces the critiques in one call.
+
+    Args:
+        state (AgentState): The current state of the workflow.
+        hypotheses (list): The successful hypotheses.
+        shard_size (int): Hypotheses per shard.
+        usage (NodeUsage): Collector of the calls of the node (see :mod:`accounting`).
+
+    Returns:
+        str: The debate minutes.
+    """
+    shards = [hypotheses[i:i + shard_size] for i in range(0, len(hypotheses), shard_size)]
+    print(f"Map-reduce debate: {len(shards)} shard(s) of up to {shard_size} hypothesis(es).")
+
+    # Map: shard critiques run concurrently on the dedicated LLM executor
+    futures = [
+        get_llm_executor().submit(run_devils_advocate, state, debate_task, [shard, state['input']], f"Debate shard {i + 1}/{len(shards)}", usage)
+        for i, shard in enumerate(shards)
+    ]
+    critiques = []
+    for shard, future in zip(shards, futures):
+        result = future.result()
+        if result is not None:
+            critiques.append({"experts": [h['expert_name'] for h in shard], "critique": str(result)})
+
+    if not critiques:
+        return "Debate skipped due to error."
+
+    # Reduce: conflicts and synergies across the shard critiques
+    result = run_devils_advocate(state, debate_reduce_task, [critiques, state['input']], "Debate reduce", usage)
+    if result is None:
+        print("⚠️ Debate reduce failed, keeping the shard critiques as minutes.")
+        return "\n\n".join(f"### {', '.join(c['experts'])}\n{c['critique']}" for c in critiques)
+    return str(result)
 
 def synthesis_node(state: AgentState):
     """
@@ -291,11 +711,7 @@ def synthesis_node(state: AgentState):
     print("--- SYNTHESIS ---")
     
     # Determine models to try
-    primary_model = state.get('model_name')
-    models_to_try = [primary_model] if primary_model else []
-    for m in FALLBACK_MODELS:
-        if m not in models_to_try:
-            models_to_try.append(m)
+    models_to_try = get_models_to_try(state, "synthesis")
             
     # Append language instruction if specified
     synthesis_input = state['input']
@@ -303,26 +719,42 @@ def synthesis_node(state: AgentState):
         synthesis_input += f"\n\nIMPORTANT: Please write the final solution/report in {state['language']}."
 
     result = None
+    usage = NodeUsage(state, "synthesis")
     
     for model in models_to_try:
+        if not model_health.allow_request(model):
+            print(f"⏭️ Skipping {model} for Synthesis (circuit open).")
+            continue
+        call = usage.call(model, "Synthesizer")
         try:
             print(f"🔄 Attempting Synthesis with model: {model}")
             synthesizer = Synthesizer().get_agent(temperature=state.get('temperature', 0.7), model_name=model)
-            task = synthesis_task(synthesizer, state['debate_minutes'], state['hypotheses'], synthesis_input)
+            task = synthesis_task(synthesizer, state['debate_minutes'], distinct_hypotheses(state['hypotheses']), synthesis_input)
             
-            # Memory disabled
-            crew = Crew(agents=[synthesizer], tasks=[task], verbose=True)
-            @retry_llm
-            def run_crew():
-                res = crew.kickoff()
-                # Check for error strings
-                if isinstance(res, str) and ("Task Failed" in res or "Crew Execution Failed" in res or "LLM Call Failed" in res):
-                     raise Exception(f"CrewAI reported failure: {res[:200]}...")
-                return res
-
-            result = run_crew()
+            # Pre-flight: skip models whose context cannot hold the prompt (or trim it)
+            tokens = preflight(synthesizer, task, model, state.get('context_policy'))
+            if tokens is None:
+                # The model was not called: give back a half-open probe
+                model_health.release_probe(model)
+                call.skip()
+                continue
+            key = crew_cache_key(synthesizer, task, model, state.get('temperature', 0.7))
+            if uses_direct_llm(state, "synthesis"):
+                # Single chat completion validated against the SynthesisReport schema
+                result = llm_cache.call(key, call.compute(lambda: retry_llm(complete, call.retry)(synthesizer, task, model, state.get('temperature', 0.7), tokens, SynthesisReport)), mode=state.get('cache_mode'))
+            else:
+                # Memory disabled
+                crew = Crew(agents=[synthesizer], tasks=[task], verbose=True)
+                result = llm_cache.call(key, call.compute(lambda: retry_llm(kickoff_crew, call.retry)(crew, model, tokens)), mode=state.get('cache_mode'))
+            model_health.record_success(model)
+            call.success(tokens, result)
             break
+        except FatalLLMError:
+            # Auth / configuration error: no fallback model can succeed
+            raise
         except Exception as e:
+            record_model_error(model, e)
+            call.failure()
             print(f"⚠️ Synthesis failed with model {model}: {e}")
             continue
             
@@ -334,7 +766,8 @@ def synthesis_node(state: AgentState):
              "iterations": state['iterations'] + 1,
              "knowledge_gaps": ["Technical failure during synthesis"],
              "visualization_code": "",
-             "input": state['input']
+             "input": state['input'],
+             "usage": usage.records()
          }
 
     # Extract info using robust manual parsing
@@ -400,7 +833,8 @@ def synthesis_node(state: AgentState):
         "iterations": state['iterations'] + 1, 
         "knowledge_gaps": gaps, 
         "visualization_code": viz_code, 
-        "input": new_input
+        "input": new_input,
+        "usage": usage.records()
     }
 
 def check_confidence(state: AgentState):
@@ -415,16 +849,26 @@ def check_confidence(state: AgentState):
 
 workflow = StateGraph(AgentState)
 
+workflow.add_node("speculate", speculate_node)
 workflow.add_node("recruit", recruit_node)
+workflow.add_node("prefetch", prefetch_node)
 workflow.add_node("hypothesis", hypothesis_node)
+workflow.add_node("digest", digest_node)
 workflow.add_node("cross_pollination", cross_pollination_node)
+workflow.add_node("dedup", dedup_node)
 workflow.add_node("debate", debate_node)
 workflow.add_node("synthesis", synthesis_node)
 
-workflow.set_entry_point("recruit")
-workflow.add_edge("recruit", "hypothesis")
-workflow.add_edge("hypothesis", "cross_pollination")
-workflow.add_edge("cross_pollination", "debate")
+# The fixed experts start in parallel with the recruitment
+workflow.add_edge(START, "recruit")
+workflow.add_edge(START, "speculate")
+workflow.add_edge("speculate", END)
+workflow.add_edge("recruit", "prefetch")
+workflow.add_edge("prefetch", "hypothesis")
+workflow.add_edge("hypothesis", "digest")
+workflow.add_edge("digest", "cross_pollination")
+workflow.add_edge("cross_pollination", "dedup")
+workflow.add_edge("dedup", "debate")
 workflow.add_edge("debate", "synthesis")
 
 workflow.add_conditional_edges(
@@ -436,4 +880,5 @@ workflow.add_conditional_edges(
     }
 )
 
-app = workflow.compile()
+# State is checkpointed after every node so interrupted runs can be resumed
+app = workflow.compile(checkpointer=checkpointer)
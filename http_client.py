@@ -0,0 +1,119 @@
+"""
+Shared HTTP layer for every outbound request of the project (except LLM calls, made by LiteLLM).
+
+A bare ``requests.get`` opens a new TCP and TLS connection per call. Under parallel
+expert search this handshake, and the absence of any bound on concurrent requests to
+the same host, dominate the tail latency. This module provides:
+
+* :func:`get_session`: a process-wide ``requests`` session with keep-alive connection
+  pools, retries on transient gateway errors, a default ``(connect, read)`` timeout and
+  a per-host concurrency limit. It is thread-safe and shared by the tools.
+
+Settings: ``NEXUS_HTTP_CONNECT_TIMEOUT``, ``NEXUS_HTTP_READ_TIMEOUT``,
+``NEXUS_HTTP_POOL_SIZE`` (connections kept per host) and ``NEXUS_HTTP_PER_HOST``
+(concurrent requests per host).
+"""
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CONNECT_TIMEOUT = float(os.environ.get("NEXUS_HTTP_CONNECT_TIMEOUT", 5))
+DEFAULT_READ_TIMEOUT = float(os.environ.get("NEXUS_HTTP_READ_TIMEOUT", 20))
+DEFAULT_POOL_SIZE = int(os.environ.get("NEXUS_HTTP_POOL_SIZE", 16))
+DEFAULT_PER_HOST = int(os.environ.get("NEXUS_HTTP_PER_HOST", 4))
+USER_AGENT = "Nexus-Science/1.0"
+
+
+class HostStats:
+    """
+    Thread-safe request counters and latencies per host.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def record(self, host: str, latency: float, ok: bool):
+        with self._lock:
+            h = self._hosts.setdefault(host, {"requests": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0})
+            h["requests"] += 1
+            h["errors"] += 0 if ok else 1
+            h["total_s"] += latency
+            h["max_s"] = max(h["max_s"], latency)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the requests, errors, mean and max latency of every host.
+        """
+        with self._lock:
+            return {
+                host: {"requests": h["requests"], "errors": h["errors"], "mean_s": round(h["total_s"] / h["requests"], 3), "max_s": round(h["max_s"], 3)}
+                for host, h in self._hosts.items()
+            }
+
+
+http_stats = HostStats()
+
+
+class PooledSession(requests.Session):
+    """
+    ``requests`` session with connection pooling, retries, a default timeout and a per-host concurrency limit.
+
+    Args:
+        timeout (tuple): Default ``(connect, read)`` timeout of every request.
+        pool_size (int): Connections kept alive per host.
+        per_host (int): Maximum concurrent requests per host.
+        retries (int): Retries on connection errors and 502/503/504 responses.
+    """
+    def __init__(self, timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT), pool_size: int = DEFAULT_POOL_SIZE,
+                 per_host: int = DEFAULT_PER_HOST, retries: int = 2):
+        super().__init__()
+        self.timeout = timeout
+        self.per_host = per_host
+        self._slots = {}
+        self._slots_lock = threading.Lock()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(502, 503, 504), allowed_methods=("GET", "HEAD"))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers["User-Agent"] = USER_AGENT
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._slots_lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlparse(url).hostname or ""
+        with self._slot(host):
+            started = time.monotonic()
+            ok = False
+            try:
+                response = super().request(method, url, **kwargs)
+                ok = response.status_code < 500
+                return response
+            finally:
+                http_stats.record(host, time.monotonic() - started, ok)
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> PooledSession:
+    """
+    Returns the process-wide pooled session, creating it on first use.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = PooledSession()
+        return _session
+
@@ -0,0 +1,195 @@
+"""
+Offline literature index with BM25 ranking.
+
+Every abstract fetched by the Arxiv and HAL tools is harvested, in full, into a compact
+on-disk inverted index (SQLite: one row per document, one posting per term and
+document). Dumps can be bulk-imported as well (JSON Lines with ``title``, ``abstract``,
+``authors`` and ``link``/``id`` fields, e.g. the Arxiv metadata snapshot).
+
+The :class:`tools.LocalLiteratureTool` searches this index with BM25: results come in
+milliseconds, without network, and the index grows with every run, so recurring
+research domains get faster over time.
+
+The index lives in ``NEXUS_LITERATURE_INDEX_PATH``; an empty path disables it.
+
+    python literature_index.py import arxiv-metadata.jsonl
+    python literature_index.py search "underwater swarm coordination"
+"""
+import json
+import math
+import os
+import sqlite3
+import sys
+import threading
+from collections import Counter
+
+from utils import tokenize
+
+DEFAULT_INDEX_PATH = os.environ.get("NEXUS_LITERATURE_INDEX_PATH", os.path.join(".nexus_cache", "literature_index.sqlite"))
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    link TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+"""
+
+
+def document_key(record: dict) -> str:
+    """
+    Identifies a document across sources: its link, or its normalized title.
+    """
+    return record.get("link") or " ".join(tokenize(record.get("title", "")))
+
+
+class LiteratureIndex:
+    """
+    Thread-safe on-disk inverted index of abstracts, searched with BM25.
+
+    Args:
+        path (str): Path of the SQLite file (created on first use).
+    """
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self):
+        # Called with the lock held
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def add(self, records: list, source: str = "import") -> int:
+        """
+        Indexes documents; documents already present (same link or title) are skipped.
+
+        Args:
+            records (list): Dicts with ``title``, ``abstract`` and optionally ``authors`` (str or list), ``link``, ``source``.
+            source (str): Source recorded for records without one.
+
+        Returns:
+            int: The number of documents added.
+        """
+        if not self.enabled:
+            return 0
+        added = 0
+        with self._lock:
+            conn = self._connect()
+            for record in records:
+                title, abstract = str(record.get("title") or "").strip(), str(record.get("abstract") or "").strip()
+                key = document_key(record)
+                if not title or not key:
+                    continue
+                authors = record.get("authors") or ""
+                if isinstance(authors, list):
+                    authors = ", ".join(str(a) for a in authors)
+                terms = Counter(tokenize(f"{title} {title} {abstract}"))
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO documents (key, source, title, authors, abstract, link, length) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, record.get("source") or source, title, authors, abstract, record.get("link") or "", sum(terms.values())),
+                )
+                if cursor.rowcount == 0:
+                    continue
+                conn.executemany("INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)", [(t, cursor.lastrowid, n) for t, n in terms.items()])
+                added += 1
+            conn.commit()
+        return added
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """
+        Returns the best matching documents of a query, ranked with BM25.
+
+        Returns:
+            list: Dicts with ``title``, ``authors``, ``abstract``, ``link``, ``source`` and ``score``.
+        """
+        terms = set(tokenize(query))
+        if not self.enabled or not terms:
+            return []
+        with self._lock:
+            conn = self._connect()
+            count, total_length = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM documents").fetchone()
+            if not count:
+                return []
+            average_length = total_length / count
+            scores = Counter()
+            for term in terms:
+                postings = conn.execute(
+                    "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN documents d ON d.id = p.doc_id WHERE p.term = ?", (term,)
+                ).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf, length in postings:
+                    scores[doc_id] += idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / average_length))
+            results = []
+            for doc_id, score in scores.most_common(limit):
+                title, authors, abstract, link, source = conn.execute(
+                    "SELECT title, authors, abstract, link, source FROM documents WHERE id = ?", (doc_id,)
+                ).fetchone()
+                results.append({"title": title, "authors": authors, "abstract": abstract, "link": link, "source": source, "score": round(score, 3)})
+            return results
+
+    def __len__(self):
+        if not self.enabled:
+            return 0
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def import_jsonl(self, path: str, batch_size: int = 1000) -> int:
+        """
+        Bulk-imports a JSON Lines dump (one document per line).
+
+        Returns:
+            int: The number of documents added.
+        """
+        added, batch = 0, []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not record.get("link") and record.get("id"):
+                    record["link"] = f"https://arxiv.org/abs/{record['id']}"
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    added += self.add(batch, source=os.path.basename(path))
+                    batch = []
+        return added + self.add(batch, source=os.path.basename(path))
+
+
+literature_index = LiteratureIndex()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "import":
+        print(f"{literature_index.import_jsonl(sys.argv[2])} document(s) added, {len(literature_index)} in the index.")
+    elif len(sys.argv) == 3 and sys.argv[1] == "search":
+        for doc in literature_index.search(sys.argv[2]):
+            print(f"[{doc['score']}] {doc['title']} ({doc['source']})\n    {doc['link']}")
+    else:
+        print("Usage: python literature_index.py import <dump.jsonl> | search <query>")
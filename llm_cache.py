@@ -0,0 +1,348 @@
+"""
+Persistent, content-addressed cache for LLM (crew) responses.
+
+Responses are stored in SQLite, keyed on a hash of the normalized prompt (agent
+role/goal/backstory and task text), the model, the temperature, the tool set and
+the expected output schema. Entries expire after a TTL and the least recently
+used ones are evicted once the entry or byte budget is exceeded.
+
+The cache mode is chosen per run (``state['cache_mode']``):
+
+* ``read_through``: serve hits from the cache, call the model and store on miss.
+* ``write_only``: always call the model, store the fresh response.
+* ``bypass``: no cache at all (default).
+
+Identical requests in flight at the same time (e.g. two Streamlit sessions running
+the same query) are coalesced into a single upstream call.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+from execution import run_blocking
+
+CACHE_MODES = ("read_through", "write_only", "bypass")
+DEFAULT_CACHE_MODE = os.environ.get("NEXUS_LLM_CACHE_MODE", "bypass")
+DEFAULT_CACHE_PATH = os.environ.get("NEXUS_LLM_CACHE_PATH", os.path.join(".nexus_cache", "llm_cache.sqlite"))
+
+# No response computed (the leader failed or was cancelled)
+_MISSING = object()
+
+
+class LeaderCancelled(Exception):
+    """
+    Raised to the followers of a coalesced request whose leader was cancelled: they compute the response themselves.
+    """
+
+
+class CachedResponse:
+    """
+    Minimal stand-in for a ``CrewOutput`` rebuilt from the cache.
+
+    Exposes the attributes the nodes read: ``raw``, ``json_dict``, ``pydantic`` and ``str()``.
+    """
+    def __init__(self, raw: str, json_dict: dict = None):
+        self.raw = raw
+        self.json_dict = json_dict
+        self.pydantic = None
+        self.tasks_output = []
+        self.token_usage = None
+
+    def __str__(self):
+        return self.raw
+
+
+def _normalize(text) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip()
+
+
+def make_cache_key(prompt: str, model: str, temperature: float, tools=(), schema: str = "") -> str:
+    """
+    Builds the content address of an LLM request.
+
+    Args:
+        prompt (str): The full prompt text (normalized for whitespace).
+        model (str): The model name.
+        temperature (float): The sampling temperature.
+        tools (iterable): Names of the tools available to the agent.
+        schema (str): The name of the structured output schema, if any.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    payload = json.dumps({
+        "prompt": _normalize(prompt),
+        "model": model,
+        "temperature": round(float(temperature), 3),
+        "tools": sorted(tools),
+        "schema": schema or "",
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def crew_prompt(agent, task) -> str:
+    """
+    Returns the prompt material of a single-agent, single-task crew.
+    """
+    return "\n".join([
+        str(getattr(agent, "role", "")),
+        str(getattr(agent, "goal", "")),
+        str(getattr(agent, "backstory", "")),
+        str(getattr(task, "description", "")),
+        str(getattr(task, "expected_output", "")),
+    ])
+
+
+def crew_cache_key(agent, task, model: str, temperature: float) -> str:
+    """
+    Builds the cache key of a single-agent, single-task crew.
+    """
+    prompt = crew_prompt(agent, task)
+    tools = [getattr(t, "name", type(t).__name__) for t in (getattr(agent, "tools", None) or [])]
+    schema = getattr(getattr(task, "output_pydantic", None), "__name__", "")
+    return make_cache_key(prompt, model, temperature, tools, schema)
+
+
+def serialize_result(result) -> str:
+    """
+    Serializes a crew result into the JSON payload stored in the cache.
+    """
+    json_dict = getattr(result, "json_dict", None)
+    pydantic_output = getattr(result, "pydantic", None)
+    if not isinstance(json_dict, dict):
+        json_dict = pydantic_output.model_dump() if hasattr(pydantic_output, "model_dump") else None
+    return json.dumps({"raw": str(result), "json_dict": json_dict}, ensure_ascii=False)
+
+
+def deserialize_result(payload: str) -> CachedResponse:
+    data = json.loads(payload)
+    return CachedResponse(data.get("raw", ""), data.get("json_dict"))
+
+
+class LLMCache:
+    """
+    SQLite-backed LLM response cache with TTL, LRU eviction and in-flight coalescing.
+
+    Args:
+        path (str): Path of the SQLite database file (created on first use).
+        ttl (float): Time-to-live of an entry in seconds.
+        max_entries (int): Maximum number of stored responses.
+        max_bytes (int): Maximum total size of stored payloads.
+    """
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = 7 * 24 * 3600, max_entries: int = 5000, max_bytes: int = 200 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        return self._conn
+
+    def get(self, key: str):
+        """
+        Returns the stored payload for a key, or None if missing or expired.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT payload, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return row[0]
+
+    def put(self, key: str, payload: str):
+        """
+        Stores a payload and evicts expired and least recently used entries.
+        """
+        now = time.time()
+        size = len(payload.encode("utf-8"))
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self):
+        """
+        Removes every stored response.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Returns hit, miss and coalescing counters.
+        """
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+    def _lookup(self, key, mode):
+        if mode != "read_through":
+            return None
+        payload = self.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return deserialize_result(payload)
+
+    def _join_or_lead(self, key):
+        """
+        Returns ``(future, is_leader)`` for an in-flight request key.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _finish(self, key, future, result=_MISSING, error=None):
+        """
+        Releases an in-flight key and resolves its followers; always called by the leader.
+        """
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+        if future.done():
+            return
+        if result is not _MISSING:
+            # Computed, even if storing it failed or the leader was cancelled while storing it
+            future.set_result(result)
+        elif isinstance(error, Exception):
+            future.set_exception(error)
+        else:
+            # Cancelled or interrupted leader: followers must get an ordinary exception
+            future.set_exception(LeaderCancelled(key))
+
+    def _store(self, key, result):
+        """
+        Stores a fresh response; a failed cache write (e.g. "database is locked") never fails the call.
+        """
+        try:
+            self.put(key, serialize_result(result))
+        except Exception as e:
+            print(f"⚠️ LLM cache: response not stored ({e}).")
+
+    def call(self, key: str, compute, mode: str = None):
+        """
+        Returns the cached response for ``key`` or runs ``compute()`` (blocking).
+
+        Args:
+            key (str): The cache key (see :func:`crew_cache_key`).
+            compute (callable): Produces the response on a miss.
+            mode (str): One of :data:`CACHE_MODES`. Defaults to ``NEXUS_LLM_CACHE_MODE``.
+        """
+        mode = _check_mode(mode)
+        if mode == "bypass":
+            return compute()
+        cached = self._lookup(key, mode)
+        if cached is not None:
+            return cached
+
+        future, is_leader = self._join_or_lead(key)
+        if not is_leader:
+            try:
+                return future.result()
+            except LeaderCancelled:
+                return self.call(key, compute, mode)
+        result, error = _MISSING, None
+        try:
+            result = compute()
+            self._store(key, result)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._finish(key, future, result, error)
+        return result
+
+    async def acall(self, key: str, acompute, mode: str = None):
+        """
+        Async variant of :meth:`call`; ``acompute()`` must return an awaitable.
+        """
+        mode = _check_mode(mode)
+        if mode == "bypass":
+            return await acompute()
+        cached = await run_blocking(self._lookup, key, mode)
+        if cached is not None:
+            return cached
+
+        future, is_leader = self._join_or_lead(key)
+        if not is_leader:
+            try:
+                # Shielded: a cancelled follower must not cancel the shared future
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except LeaderCancelled:
+                return await self.acall(key, acompute, mode)
+        result, error = _MISSING, None
+        try:
+            result = await acompute()
+            await run_blocking(self._store, key, result)
+        except BaseException as e:
+            # Includes cancellation (e.g. a straggler past its deadline): followers must not wait forever
+            error = e
+            raise
+        finally:
+            self._finish(key, future, result, error)
+        return result
+
+
+def _check_mode(mode):
+    mode = mode or DEFAULT_CACHE_MODE
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unknown cache mode '{mode}'. Expected one of {CACHE_MODES}.")
+    return mode
+
+
+llm_cache = LLMCache()
@@ -1,6 +1,10 @@
 import os
+import sys
+import asyncio
 from dotenv import load_dotenv
-from graph import app
+from graph import app, cancel_speculations
+from checkpoint import run_config
+from accounting import export_usage, usage_report
 from rich.console import Console
 from rich.markdown import Markdown
 
@@ -10,6 +14,22 @@ console = Console()
 
 from utils import format_output
 
+async def run_graph(inputs, config):
+    """
+    Runs the graph to completion, then cancels the speculative tasks the run did not use.
+
+    Args:
+        inputs (dict): The initial state, or None to continue from the last checkpoint.
+        config (dict): The run config (see ``checkpoint.run_config``).
+
+    Returns:
+        dict: The final state.
+    """
+    try:
+        return await app.ainvoke(inputs, config)
+    finally:
+        cancel_speculations(config)
+
 def main():
     """
     Main entry point for the Nexus-Science application.
@@ -21,7 +41,9 @@ def main():
 
     input_query = "générer un algorithme parfait pour gérer les déplacements d’un essaim de drones sous-marins en mode attaque"
     
+    config = run_config()
     console.print(f"[bold green]Démarrage de Nexus-Science avec l'entrée :[/bold green] {input_query}")
+    console.print(f"[dim]Run id : {config['configurable']['thread_id']} (reprise : python main.py --resume <run_id>)[/dim]")
     
     initial_state = {
         "input": input_query,
@@ -34,9 +56,38 @@ def main():
     }
     
     # Run the graph
-    # Using stream to show progress if needed, or just invoke
-    final_state = app.invoke(initial_state)
+    # The graph has async nodes, so it must be run through the async API
+    final_state = asyncio.run(run_graph(initial_state, config))
     
+    save_report(final_state)
+
+def resume(run_id):
+    """
+    Resumes an interrupted run from its last completed node.
+
+    Args:
+        run_id (str): The run id printed when the run was started.
+    """
+    config = run_config(run_id)
+    snapshot = app.get_state(config)
+    if not snapshot.values:
+        console.print(f"[bold red]Error: no checkpoint found for run '{run_id}'.[/bold red]")
+        return
+
+    if snapshot.next:
+        console.print(f"[bold green]Reprise du run {run_id} à partir de :[/bold green] {', '.join(snapshot.next)}")
+        # Passing None as input continues from the last checkpoint
+        final_state = asyncio.run(run_graph(None, config))
+    else:
+        console.print(f"[bold blue]Le run {run_id} est déjà terminé.[/bold blue]")
+        final_state = snapshot.values
+
+    save_report(final_state)
+
+def save_report(final_state):
+    """
+    Prints the report of a finished run and saves it to nexus_science_report.md.
+    """
     # Format and print output
     report = format_output(final_state)
     
@@ -47,5 +98,16 @@ def main():
         f.write(report)
     console.print("[bold blue]Rapport enregistré dans nexus_science_report.md[/bold blue]")
 
+    # Per node / expert / model / iteration / tier accounting, for dashboards
+    export_usage(final_state.get('usage') or [], "nexus_science_usage.json")
+    console.print("[bold blue]Coûts, tokens et latences enregistrés dans nexus_science_usage.json[/bold blue]")
+
+    # Latency / tokens split between the model tiers, to tune node_tiers
+    for tier, usage in usage_report(final_state.get('usage'))['by_tier'].items():
+        console.print(f"[dim]Tier {tier} : {usage['calls']} appels, {usage['latency_s']}s, {usage['prompt_tokens']} tokens en entrée, {usage['completion_tokens']} en sortie[/dim]")
+
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) == 3 and sys.argv[1] == "--resume":
+        resume(sys.argv[2])
+    else:
+        main()
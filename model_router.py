@@ -0,0 +1,298 @@
+"""
+Adaptive ordering of the fallback model chain.
+
+Every real LLM call (cache hits excluded) reports its latency, its outcome and the
+tokens it produced. The router keeps an exponentially weighted moving average (EWMA)
+of the latency, the success rate and the output tokens per second of each model, and
+persists them on disk (at most every ``NEXUS_ROUTER_SAVE_INTERVAL`` seconds, and at
+exit) so that the knowledge survives restarts.
+
+In the ``adaptive`` routing mode, the chain of a node is reordered so that the
+fastest healthy model is tried first:
+
+* healthy models (success rate above ``NEXUS_ROUTER_MIN_SUCCESS``) come first, by
+  expected time per successful call (latency / success rate);
+* models never observed follow, in their static order;
+* unhealthy models come last.
+
+A failed model is not banned forever: its failure record fades with a half-life
+(``NEXUS_ROUTER_HALF_LIFE``), and with probability ``NEXUS_ROUTER_EXPLORATION`` the
+least recently observed model is moved to the front, so that recovered or unseen
+models get traffic again.
+
+The ``static`` mode keeps the selected model first, then :data:`graph.FALLBACK_MODELS`.
+
+Run ``python model_router.py`` to print the current ranking.
+"""
+import atexit
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from rate_limiter import estimate_tokens
+
+ROUTING_MODES = ("static", "adaptive")
+DEFAULT_ROUTING_MODE = os.environ.get("NEXUS_MODEL_ROUTING", "static")
+DEFAULT_ROUTER_PATH = os.environ.get("NEXUS_ROUTER_PATH", os.path.join(".nexus_cache", "model_router.json"))
+# Weight of the newest observation in the moving averages
+DEFAULT_ALPHA = float(os.environ.get("NEXUS_ROUTER_ALPHA", 0.3))
+# Probability, per node, of trying the least recently observed model first
+DEFAULT_EXPLORATION = float(os.environ.get("NEXUS_ROUTER_EXPLORATION", 0.1))
+DEFAULT_MIN_SUCCESS = float(os.environ.get("NEXUS_ROUTER_MIN_SUCCESS", 0.5))
+# Seconds after which half of a model's failure record is forgotten
+DEFAULT_HALF_LIFE = float(os.environ.get("NEXUS_ROUTER_HALF_LIFE", 3600))
+# Minimum seconds between two writes of the statistics (they are also written at exit)
+DEFAULT_SAVE_INTERVAL = float(os.environ.get("NEXUS_ROUTER_SAVE_INTERVAL", 30))
+
+
+def completion_tokens(result) -> int:
+    """
+    Returns the output tokens of a crew or completion result, estimated from its text when not reported.
+    """
+    usage = getattr(result, "token_usage", None)
+    if isinstance(usage, dict):
+        tokens = usage.get("completion_tokens")
+    else:
+        tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(tokens, int) and tokens > 0:
+        return tokens
+    return estimate_tokens(str(result))
+
+
+class ModelRouter:
+    """
+    Tracks per-model latency, success rate and throughput, and ranks the models.
+
+    Args:
+        path (str): JSON file holding the statistics. An empty path disables persistence.
+        alpha (float): EWMA weight of the newest observation.
+        exploration (float): Probability of promoting the least recently observed model.
+        min_success (float): Success rate under which a model is considered unhealthy.
+        half_life (float): Seconds for half of a failure record to fade.
+        save_interval (float): Minimum seconds between two writes of the statistics file.
+        clock (callable): Wall clock (persisted timestamps), injectable for tests.
+        rng (random.Random): Random source of the exploration, injectable for tests.
+    """
+    def __init__(self, path: str = DEFAULT_ROUTER_PATH, alpha: float = DEFAULT_ALPHA, exploration: float = DEFAULT_EXPLORATION,
+                 min_success: float = DEFAULT_MIN_SUCCESS, half_life: float = DEFAULT_HALF_LIFE, save_interval: float = DEFAULT_SAVE_INTERVAL,
+                 clock=time.time, rng=None):
+        self.path = path
+        self.alpha = alpha
+        self.exploration = exploration
+        self.min_success = min_success
+        self.half_life = half_life
+        self.save_interval = save_interval
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._stats = None
+        self._last_ranking = None
+        self._dirty = False
+        self._saved_at = None
+
+    def _load(self):
+        # Called with the lock held
+        if self._stats is not None:
+            return
+        self._stats = {}
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._stats = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Model router state unreadable ({e}). Starting from scratch.")
+
+    def flush(self, force: bool = True):
+        """
+        Writes the statistics to disk when they changed.
+
+        Args:
+            force (bool): Write now. Otherwise the write is skipped until ``save_interval``
+                seconds have passed since the previous one (or while another write runs).
+        """
+        if not self.path or not self._save_lock.acquire(blocking=force):
+            return
+        try:
+            with self._lock:
+                now = time.monotonic()
+                if not self._dirty or (not force and self._saved_at is not None and now - self._saved_at < self.save_interval):
+                    return
+                document = json.dumps(self._stats, indent=1)
+                self._dirty = False
+                self._saved_at = now
+            self._save(document)
+        finally:
+            self._save_lock.release()
+
+    def _save(self, document: str):
+        # Write-then-rename so a crash never leaves a truncated file
+        directory = os.path.dirname(self.path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(document)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not persist the model router state ({e}).")
+
+    def _ewma(self, previous, value):
+        return value if previous is None else self.alpha * value + (1 - self.alpha) * previous
+
+    def record(self, model: str, latency: float, success: bool, tokens: int = 0):
+        """
+        Records the outcome of one LLM call.
+
+        Args:
+            model (str): The model called.
+            latency (float): Duration of the call in seconds.
+            success (bool): Whether the call returned a usable result.
+            tokens (int): Output tokens of a successful call.
+        """
+        if not model:
+            return
+        with self._lock:
+            self._load()
+            s = self._stats.setdefault(model, {"latency": None, "success": None, "tokens_per_s": None, "calls": 0, "failures": 0, "last_seen": 0.0})
+            s["calls"] += 1
+            s["last_seen"] = self._clock()
+            s["success"] = self._ewma(s["success"], 1.0 if success else 0.0)
+            if success:
+                # Failures often return fast (429) or after a timeout: only successes measure speed
+                s["latency"] = self._ewma(s["latency"], latency)
+                if tokens and latency > 0:
+                    s["tokens_per_s"] = self._ewma(s["tokens_per_s"], tokens / latency)
+            else:
+                s["failures"] += 1
+            self._dirty = True
+        self.flush(force=False)
+
+    @contextmanager
+    def observe(self, model: str):
+        """
+        Measures the call made in the ``with`` block and records it.
+
+        The block may set ``call["tokens"]`` to the output tokens of its result.
+        An exception counts as a failure and is re-raised.
+        """
+        call = {"tokens": 0}
+        start = time.monotonic()
+        try:
+            yield call
+        except Exception:
+            self.record(model, time.monotonic() - start, False)
+            raise
+        self.record(model, time.monotonic() - start, True, call["tokens"])
+
+    def success_rate(self, stats: dict) -> float:
+        """
+        Returns the success rate of a model, its failure record fading since it was last seen.
+        """
+        if stats.get("success") is None:
+            return 1.0
+        age = max(0.0, self._clock() - stats.get("last_seen", 0.0))
+        decay = 0.5 ** (age / self.half_life) if self.half_life > 0 else 1.0
+        return 1.0 - (1.0 - stats["success"]) * decay
+
+    def _sort_key(self, model: str, position: int):
+        stats = self._stats.get(model) or {}
+        success = self.success_rate(stats)
+        if success < self.min_success:
+            return (2, -success, position)
+        if stats.get("latency") is None:
+            # Never succeeded yet: no speed estimate
+            return (1, 0.0, position)
+        return (0, stats["latency"] / max(success, 0.05), position)
+
+    def rank(self, models: list, explore: bool = True) -> list:
+        """
+        Reorders a model chain, fastest healthy model first.
+
+        Args:
+            models (list): The static chain (its order breaks ties).
+            explore (bool): Whether the exploration budget may promote a stale model.
+
+        Returns:
+            list: The same models, reordered.
+        """
+        with self._lock:
+            self._load()
+            ranked = [m for _, m in sorted((self._sort_key(m, i), m) for i, m in enumerate(models))]
+            if explore and len(ranked) > 1 and self._rng.random() < self.exploration:
+                stale = min(ranked[1:], key=lambda m: self._stats.get(m, {}).get("last_seen", 0.0))
+                ranked.remove(stale)
+                ranked.insert(0, stale)
+                print(f"🎲 Router exploration: trying {stale} first.")
+            elif ranked != self._last_ranking:
+                print(f"🧭 Model ranking: {' > '.join(ranked)}")
+            self._last_ranking = ranked
+            return ranked
+
+    def snapshot(self) -> dict:
+        """
+        Returns the statistics of every known model, best first, for monitoring.
+        """
+        with self._lock:
+            self._load()
+            models = [m for _, m in sorted((self._sort_key(m, 0), m) for m in self._stats)]
+            return {
+                m: {
+                    "latency_s": None if self._stats[m]["latency"] is None else round(self._stats[m]["latency"], 2),
+                    "success_rate": round(self.success_rate(self._stats[m]), 3),
+                    "tokens_per_s": None if self._stats[m]["tokens_per_s"] is None else round(self._stats[m]["tokens_per_s"], 1),
+                    "calls": self._stats[m]["calls"],
+                    "failures": self._stats[m]["failures"],
+                }
+                for m in models
+            }
+
+    def reset(self):
+        """
+        Forgets every statistic, on disk as well.
+        """
+        with self._lock:
+            self._stats = {}
+            self._last_ranking = None
+            self._dirty = True
+        self.flush()
+
+
+model_router = ModelRouter()
+# Statistics recorded since the last write
+atexit.register(model_router.flush)
+
+
+def order_models(models: list, mode: str = None) -> list:
+    """
+    Orders a node's model chain according to the routing mode.
+
+    Args:
+        models (list): The static chain (selected model first).
+        mode (str): ``"static"`` or ``"adaptive"``. Defaults to ``NEXUS_MODEL_ROUTING``.
+
+    Returns:
+        list: The chain to try.
+    """
+    mode = mode or DEFAULT_ROUTING_MODE
+    if mode not in ROUTING_MODES:
+        raise ValueError(f"Unknown routing mode '{mode}'. Expected one of {ROUTING_MODES}.")
+    if mode == "static":
+        return list(models)
+    return model_router.rank(models)
+
+
+if __name__ == "__main__":
+    ranking = model_router.snapshot()
+    if not ranking:
+        print(f"No statistics yet in {model_router.path}.")
+        raise SystemExit(0)
+    print("| Model | Latency (s) | Success | Tokens/s | Calls | Failures |")
+    print("|---|---|---|---|---|---|")
+    for model, s in ranking.items():
+        print(f"| {model} | {s['latency_s']} | {s['success_rate']} | {s['tokens_per_s']} | {s['calls']} | {s['failures']} |")
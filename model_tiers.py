@@ -0,0 +1,67 @@
+"""
+Per-node model tiers.
+
+By default every node uses the selected model, then the shared fallback list. Tiers let
+cheap phases run on fast small models while the phases that decide the quality of the
+report keep a strong model:
+
+* ``fast``: small, low-latency models (e.g. recruitment, cross-pollination);
+* ``strong``: large models (e.g. debate, synthesis).
+
+Each tier has its own fallback chain (:data:`TIER_MODELS`, overridable with
+``NEXUS_TIER_MODELS='{"fast": ["openrouter/..."]}'``). Nodes are assigned to tiers with
+``node_tiers`` in the state, or ``NEXUS_NODE_TIERS="recruit=fast,debate=strong"`` by
+default; unassigned nodes keep the default chain.
+
+Every call record of a run (:mod:`accounting`) carries the tier of its node, so the
+usage report splits latency, tokens and cost per tier (``by_tier``) to tune the tiers.
+"""
+import json
+import os
+
+MODEL_TIERS = ("fast", "strong")
+# Nodes that call an LLM and can be assigned a tier
+TIERED_NODES = ("recruit", "hypothesis", "cross_pollination", "debate", "synthesis")
+
+TIER_MODELS = {
+    "fast": [
+        "openrouter/mistralai/mistral-small-3.1-24b-instruct:free",
+        "openrouter/openai/gpt-oss-20b:free",
+        "openrouter/google/gemma-2-9b-it:free",
+    ],
+    "strong": [
+        "openrouter/meta-llama/llama-3.3-70b-instruct:free",
+        "openrouter/openai/gpt-oss-20b:free",
+        "openrouter/mistralai/mistral-small-3.1-24b-instruct:free",
+    ],
+}
+TIER_MODELS.update(json.loads(os.environ.get("NEXUS_TIER_MODELS", "{}")))
+
+DEFAULT_NODE_TIERS = dict(
+    item.strip().split("=", 1) for item in os.environ.get("NEXUS_NODE_TIERS", "").split(",") if "=" in item
+)
+
+
+def node_tier(state, node: str):
+    """
+    Returns the tier of a node, or None when it uses the default chain.
+
+    Args:
+        state (dict): The workflow state (``node_tiers`` overrides ``NEXUS_NODE_TIERS``).
+        node (str): The node name.
+    """
+    tiers = state.get('node_tiers')
+    if tiers is None:
+        tiers = DEFAULT_NODE_TIERS
+    tier = tiers.get(node) if node else None
+    if tier and tier not in MODEL_TIERS:
+        raise ValueError(f"Unknown model tier '{tier}' for node '{node}'. Expected one of {MODEL_TIERS}.")
+    return tier
+
+
+def tier_chain(state, tier: str) -> list:
+    """
+    Returns the fallback chain of a tier (``tier_models`` in the state overrides :data:`TIER_MODELS`).
+    """
+    chains = state.get('tier_models') or {}
+    return list(chains.get(tier) or TIER_MODELS[tier])
@@ -0,0 +1,107 @@
+"""
+Prefetching of search tool results after the recruitment.
+
+Experts discover what to search for inside their ReAct loop, so every search round
+trip sits on their critical path. Once the panel is known, the prefetch stage derives
+likely queries from the input and from each expert's role and skill, runs them
+concurrently against the tools the expert will have, and stores the results in the
+shared :data:`tool_cache.tool_cache`. Agent tool calls with the same or similar
+queries are then answered from memory: prefetched entries are served to queries
+sharing most of their words (see ``NEXUS_PREFETCH_SIMILARITY``), since an agent
+rarely phrases its query exactly like the guess.
+
+The queries run in the background: the hypothesis phase starts at once, and the
+first tool calls of the experts (after their first LLM turn) find the results ready.
+"""
+import asyncio
+import functools
+import os
+import re
+
+from agents import expert_tools
+from execution import run_blocking
+from tool_cache import tool_cache
+from tools import CACHED_TOOLS
+
+DEFAULT_TOOL_PREFETCH = os.environ.get("NEXUS_TOOL_PREFETCH", "0") == "1"
+# Concurrent prefetch queries
+DEFAULT_PREFETCH_CONCURRENCY = int(os.environ.get("NEXUS_PREFETCH_CONCURRENCY", 8))
+# Words of the input kept in a query (search engines ignore long queries)
+TOPIC_WORDS = 8
+
+_STOPWORDS = set("""
+the and for that with this from are was into how what which une des les pour que qui dans sur par avec est
+""".split())
+
+# Prefetches left running in the background (kept referenced until they finish)
+_background_tasks = set()
+
+
+def topic(input_query: str) -> str:
+    """
+    Returns the first content words of the input, used as the subject of every query.
+    """
+    # Iteration updates appended to the input are not part of the subject
+    text = input_query.split("[ITERATION UPDATE]")[0]
+    words = [w for w in re.findall(r"\w+", text.lower()) if len(w) > 2 and w not in _STOPWORDS]
+    return " ".join(words[:TOPIC_WORDS])
+
+
+def prefetch_queries(input_query: str, experts: list, web_search_enabled: bool = True) -> list:
+    """
+    Derives the likely tool queries of a panel.
+
+    Args:
+        input_query (str): The research query.
+        experts (list): The expert definitions.
+        web_search_enabled (bool): Whether the experts get search tools.
+
+    Returns:
+        list: Unique ``(tool, query)`` pairs, the tool being a CrewAI tool instance.
+    """
+    subject = topic(input_query)
+    seen, queries = set(), []
+    for expert in experts:
+        for tool in expert_tools(expert, web_search_enabled):
+            if not isinstance(tool, CACHED_TOOLS):
+                # Tools outside the shared cache (e.g. Serper) cannot be warmed
+                continue
+            # The bare subject is what experts most often search first
+            for query in (subject, f"{subject} {expert.get('skill', '')}", f"{subject} {expert.get('role', '')}"):
+                query = " ".join(query.split())
+                if (tool.name, query) not in seen:
+                    seen.add((tool.name, query))
+                    queries.append((tool, query))
+    return queries
+
+
+async def prefetch(input_query: str, experts: list, web_search_enabled: bool = True, concurrency: int = None) -> int:
+    """
+    Runs the derived queries concurrently; their results land in the tool cache.
+
+    Returns:
+        int: The number of queries run.
+    """
+    queries = prefetch_queries(input_query, experts, web_search_enabled)
+    semaphore = asyncio.Semaphore(concurrency or DEFAULT_PREFETCH_CONCURRENCY)
+
+    async def run(tool, query):
+        async with semaphore:
+            try:
+                # Tools are blocking: they run on the dedicated executor
+                await run_blocking(tool_cache.call, tool.name, query, functools.partial(tool._search, query), prefetch=True)
+            except Exception as e:
+                print(f"⚠️ Prefetch of '{query}' on {tool.name} failed: {e}")
+
+    await asyncio.gather(*(run(tool, query) for tool, query in queries))
+    return len(queries)
+
+
+def start_prefetch(input_query: str, experts: list, web_search_enabled: bool = True):
+    """
+    Starts :func:`prefetch` in the background and returns at once.
+    """
+    task = asyncio.ensure_future(prefetch(input_query, experts, web_search_enabled))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
@@ -0,0 +1,261 @@
+"""
+Reusable pool of worker processes with hard, per-call timeouts.
+
+Unlike a thread, a worker process can be killed. A call that exceeds its timeout,
+or whose caller is cancelled, kills the worker running it; a fresh worker is
+spawned on the next checkout. Healthy workers are reused across calls, so the
+import cost of CrewAI is only paid once per worker.
+
+Only picklable, importable callables and arguments can be sent to a worker.
+"""
+import asyncio
+import atexit
+import multiprocessing
+import queue
+import threading
+
+
+class RemoteCallError(Exception):
+    """
+    Raised in the parent when the call failed inside the worker (or the worker died).
+
+    The original exception is not re-raised (it may not be picklable): the message keeps
+    its ``ExceptionType: message``, and the HTTP ``status_code`` and ``Retry-After``
+    header are copied over, so that retry logic can still recognize rate limits and
+    provider errors and honour the provider's delay.
+
+    Args:
+        message (str): ``ExceptionType: message`` of the original exception.
+        type_name (str): Name of the original exception type.
+        status_code (int): HTTP status code of the original exception, if any.
+        headers (dict): ``Retry-After`` header of the original exception, if any.
+    """
+    def __init__(self, message: str, type_name: str = None, status_code: int = None, headers: dict = None):
+        super().__init__(message)
+        self.type_name = type_name
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class WorkerTimeout(TimeoutError):
+    """
+    Raised when a call exceeded its timeout and its worker was killed.
+    """
+
+
+def _error_payload(e: Exception) -> dict:
+    """
+    Returns the picklable description of an exception raised in a worker.
+
+    The status code and ``Retry-After`` header are looked up on the exception, its
+    HTTP response, then on the exceptions it wraps (CrewAI wraps LiteLLM errors).
+    """
+    payload = {"message": f"{type(e).__name__}: {e}", "type_name": type(e).__name__, "status_code": None, "headers": {}}
+    error = e
+    while error is not None and not (payload["status_code"] and payload["headers"]):
+        code = getattr(error, "status_code", None)
+        if payload["status_code"] is None and isinstance(code, int):
+            payload["status_code"] = code
+        headers = getattr(error, "headers", None) or getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+        except AttributeError:
+            value = None
+        if value is not None and not payload["headers"]:
+            payload["headers"] = {"retry-after": str(value)}
+        error = error.__cause__ or error.__context__
+    return payload
+
+
+def _worker_main(conn):
+    """
+    Worker process loop: receives ``(func, args)`` jobs and sends back ``(status, payload)``.
+    """
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        func, args = job
+        try:
+            conn.send(("ok", func(*args)))
+        except Exception as e:
+            conn.send(("error", _error_payload(e)))
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True, name="nexus-worker")
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.kill()
+        self.conn.close()
+
+
+class _Call:
+    """
+    A single job running on a checked-out worker. Returns the worker to the pool exactly once.
+    """
+    def __init__(self, pool, worker):
+        self.pool = pool
+        self.worker = worker
+        self._released = False
+        self._lock = threading.Lock()
+
+    def _release(self, healthy: bool) -> bool:
+        with self._lock:
+            if self._released:
+                return False
+            self._released = True
+        self.pool._checkin(self.worker, healthy)
+        return True
+
+    def kill(self):
+        """
+        Kills the worker running this call (no-op if the call already finished).
+        """
+        if self._release(False):
+            self.pool.killed += 1
+
+    def run(self, func, args, timeout):
+        try:
+            self.worker.conn.send((func, args))
+            finished = self.worker.conn.poll(timeout)
+            if finished:
+                status, payload = self.worker.conn.recv()
+        except (EOFError, OSError) as e:
+            # Worker died, or was killed by a cancellation while we were waiting
+            self._release(False)
+            raise RemoteCallError(f"Worker process died: {e}") from e
+        if not finished:
+            self.kill()
+            raise WorkerTimeout(f"Worker call exceeded {timeout}s and was killed.")
+        self._release(True)
+        if status == "error":
+            raise RemoteCallError(**payload)
+        return payload
+
+
+class ProcessPool:
+    """
+    Pool of up to ``max_workers`` reusable worker processes.
+
+    Args:
+        max_workers (int): Maximum number of concurrent worker processes.
+        start_method (str): Multiprocessing start method ("spawn" is safe with threads).
+    """
+    def __init__(self, max_workers: int = 4, start_method: str = "spawn"):
+        self.max_workers = max_workers
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self.calls = 0
+        self.killed = 0
+
+    def _checkout(self) -> _Worker:
+        self._slots.acquire()
+        self.calls += 1
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                try:
+                    return _Worker(self._ctx)
+                except Exception:
+                    self._slots.release()
+                    raise
+            if worker.is_alive():
+                return worker
+            worker.kill()
+
+    def _checkin(self, worker: _Worker, healthy: bool):
+        if healthy and worker.is_alive():
+            self._idle.put(worker)
+        else:
+            worker.kill()
+        self._slots.release()
+
+    def run(self, func, args=(), timeout: float = None):
+        """
+        Runs ``func(*args)`` in a worker process and blocks until it returns.
+
+        Args:
+            func (callable): A picklable, importable function.
+            args (tuple): Picklable positional arguments.
+            timeout (float): Wall-clock limit in seconds; the worker is killed when exceeded.
+
+        Returns:
+            The (picklable) value returned by ``func``.
+        """
+        worker = self._checkout()
+        return _Call(self, worker).run(func, args, timeout)
+
+    async def arun(self, func, args=(), timeout: float = None, executor=None):
+        """
+        Async variant of :meth:`run`. Cancelling the caller kills the worker.
+
+        Args:
+            executor: Thread pool used to wait on the worker pipe (default asyncio executor if None).
+        """
+        loop = asyncio.get_running_loop()
+        checkout = loop.run_in_executor(executor, self._checkout)
+        try:
+            worker = await asyncio.shield(checkout)
+        except asyncio.CancelledError:
+            # The checkout may still complete: hand the worker back to the pool
+            checkout.add_done_callback(lambda f: f.cancelled() or f.exception() or self._checkin(f.result(), True))
+            raise
+
+        call = _Call(self, worker)
+        try:
+            return await loop.run_in_executor(executor, call.run, func, args, timeout)
+        except asyncio.CancelledError:
+            call.kill()
+            raise
+
+    def shutdown(self):
+        """
+        Stops every idle worker.
+        """
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def stats(self) -> dict:
+        return {"max_workers": self.max_workers, "idle": self._idle.qsize(), "calls": self.calls, "killed": self.killed}
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_process_pool(max_workers: int = 4) -> ProcessPool:
+    """
+    Returns the shared process pool, creating it on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPool(max_workers=max_workers)
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -0,0 +1,320 @@
+"""
+Process-wide, per-model rate limiting for LLM calls.
+
+Every model gets a limiter combining:
+
+* a token bucket on requests per minute (``rpm``),
+* a token bucket on tokens per minute (``tpm``, estimated from the prompt),
+* a cap on concurrent in-flight calls (``max_in_flight``).
+
+Slots are taken per provider request: :func:`install_litellm_limits` wraps
+``litellm.completion`` and ``litellm.acompletion``, which every CrewAI turn and direct
+call goes through, so each turn of a crew's ReAct loop takes (and releases) its own
+slot. All nodes and all concurrent runs of the process share the ``rate_limiter``, so
+parallel fan-outs stay just under the provider limits instead of triggering 429
+storms and synchronized retries. In the ``process`` execution mode, each worker
+process limits its own requests.
+
+Limiting is off by default: limits come from ``NEXUS_RATE_LIMIT_RPM`` /
+``NEXUS_RATE_LIMIT_TPM`` / ``NEXUS_MAX_IN_FLIGHT`` (0, the default, disables a limit)
+and can be set per model with
+``NEXUS_RATE_LIMITS='{"openrouter/model": {"rpm": 10, "max_in_flight": 2}}'``
+or :meth:`RateLimiterRegistry.configure`.
+"""
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+import litellm
+
+# Polling interval when waiting for an in-flight slot
+_POLL_INTERVAL = 0.1
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (about 4 characters per token).
+    """
+    return max(1, len(text or "") // 4)
+
+
+def request_tokens(kwargs: dict) -> int:
+    """
+    Estimates the prompt tokens of a LiteLLM request from its ``messages``.
+    """
+    messages = kwargs.get("messages") or []
+    return estimate_tokens("".join(str(m.get("content") or "") if isinstance(m, dict) else str(m) for m in messages))
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``per_minute / 60`` tokens per second.
+
+    Args:
+        per_minute (float): Bucket capacity and refill rate per minute. 0 means unlimited.
+        clock (callable): Monotonic clock, injectable for tests.
+    """
+    def __init__(self, per_minute: float, clock=time.monotonic):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._clock = clock
+        self._updated_at = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.capacity / 60.0)
+        self._updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Returns the seconds to wait before ``amount`` tokens are available (0 if available now).
+        """
+        if self.capacity <= 0:
+            return 0.0
+        self._refill()
+        # A request larger than the whole bucket only waits for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.capacity
+
+    def consume(self, amount: float):
+        if self.capacity > 0:
+            self.tokens -= min(amount, self.capacity)
+
+
+class ModelRateLimiter:
+    """
+    Rate limiter for a single model.
+
+    Args:
+        model (str): The model name.
+        rpm (int): Requests per minute (0 = unlimited).
+        tpm (int): Tokens per minute (0 = unlimited).
+        max_in_flight (int): Maximum concurrent calls (0 = unlimited).
+    """
+    def __init__(self, model: str, rpm: int = 0, tpm: int = 0, max_in_flight: int = 0, clock=time.monotonic):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_in_flight = max_in_flight
+        self._clock = clock
+        self._requests = TokenBucket(rpm, clock)
+        self._tokens = TokenBucket(tpm, clock)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def try_acquire(self, tokens: int = 0) -> float:
+        """
+        Tries to take a slot without blocking.
+
+        Returns:
+            float: 0 if the slot was taken, otherwise the suggested seconds to wait before retrying.
+        """
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return _POLL_INTERVAL
+            wait = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+            if wait > 0:
+                return wait
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            self.in_flight += 1
+            self.acquired += 1
+            return 0.0
+
+    def release(self):
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def _enter_queue(self):
+        with self._lock:
+            self.queue_depth += 1
+
+    def _leave_queue(self, waited: float):
+        with self._lock:
+            self.queue_depth -= 1
+            if waited > 0:
+                self.waited += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+
+    def acquire(self, tokens: int = 0):
+        """
+        Blocks the calling thread until a slot is available.
+        """
+        wait = self.try_acquire(tokens)
+        if wait == 0:
+            return
+        start = self._clock()
+        self._enter_queue()
+        try:
+            while wait > 0:
+                time.sleep(wait)
+                wait = self.try_acquire(tokens)
+        finally:
+            self._leave_queue(self._clock() - start)
+
+    async def aacquire(self, tokens: int = 0):
+        """
+        Waits on the event loop (without holding a thread) until a slot is available.
+        """
+        wait = self.try_acquire(tokens)
+        if wait == 0:
+            return
+        start = self._clock()
+        self._enter_queue()
+        try:
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self.try_acquire(tokens)
+        finally:
+            self._leave_queue(self._clock() - start)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the limits, queue depth and wait-time metrics of the model.
+        """
+        with self._lock:
+            return {
+                "rpm": self.rpm,
+                "tpm": self.tpm,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth,
+                "acquired": self.acquired,
+                "waited": self.waited,
+                "total_wait": round(self.total_wait, 2),
+                "max_wait": round(self.max_wait, 2),
+                "avg_wait": round(self.total_wait / self.waited, 2) if self.waited else 0.0,
+            }
+
+
+class RateLimiterRegistry:
+    """
+    Thread-safe registry holding one :class:`ModelRateLimiter` per model.
+
+    Args:
+        rpm (int): Default requests per minute.
+        tpm (int): Default tokens per minute.
+        max_in_flight (int): Default maximum concurrent calls per model.
+        overrides (dict): Per-model limits, e.g. ``{"model": {"rpm": 10}}``.
+    """
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_in_flight: int = 0, overrides: dict = None):
+        self.defaults = {"rpm": rpm, "tpm": tpm, "max_in_flight": max_in_flight}
+        self.overrides = dict(overrides or {})
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def configure(self, model: str, **limits):
+        """
+        Sets the limits of a model (rpm, tpm, max_in_flight). Applies to new calls.
+        """
+        with self._lock:
+            self.overrides[model] = {**self.overrides.get(model, {}), **limits}
+            self._limiters.pop(model, None)
+
+    def get(self, model: str) -> ModelRateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(model)
+            if limiter is None:
+                limiter = ModelRateLimiter(model, **{**self.defaults, **self.overrides.get(model, {})})
+                self._limiters[model] = limiter
+            return limiter
+
+    @contextmanager
+    def slot(self, model: str, tokens: int = 0):
+        """
+        Holds a rate-limited slot for a blocking call. No-op when ``model`` is None.
+        """
+        if model is None:
+            yield
+            return
+        limiter = self.get(model)
+        limiter.acquire(tokens)
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    @asynccontextmanager
+    async def aslot(self, model: str, tokens: int = 0):
+        """
+        Async variant of :meth:`slot`.
+        """
+        if model is None:
+            yield
+            return
+        limiter = self.get(model)
+        await limiter.aacquire(tokens)
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    def wrap_completion(self, completion):
+        """
+        Wraps ``litellm.completion`` so that each request holds a slot of its model until it returns.
+        """
+        @functools.wraps(completion)
+        def wrapper(*args, **kwargs):
+            with self.slot(kwargs.get("model") or (args[0] if args else None), request_tokens(kwargs)):
+                return completion(*args, **kwargs)
+        wrapper.rate_limited = True
+        return wrapper
+
+    def wrap_acompletion(self, acompletion):
+        """
+        Async variant of :meth:`wrap_completion`, for ``litellm.acompletion``.
+        """
+        @functools.wraps(acompletion)
+        async def wrapper(*args, **kwargs):
+            async with self.aslot(kwargs.get("model") or (args[0] if args else None), request_tokens(kwargs)):
+                return await acompletion(*args, **kwargs)
+        wrapper.rate_limited = True
+        return wrapper
+
+    def snapshot(self) -> dict:
+        """
+        Returns the metrics of every known model limiter, keyed by model name.
+        """
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.model: limiter.snapshot() for limiter in limiters}
+
+    def reset(self):
+        """
+        Forgets all limiter state (buckets refilled, metrics cleared).
+        """
+        with self._lock:
+            self._limiters.clear()
+
+
+rate_limiter = RateLimiterRegistry(
+    rpm=int(os.environ.get("NEXUS_RATE_LIMIT_RPM", 0)),
+    tpm=int(os.environ.get("NEXUS_RATE_LIMIT_TPM", 0)),
+    max_in_flight=int(os.environ.get("NEXUS_MAX_IN_FLIGHT", 0)),
+    overrides=json.loads(os.environ.get("NEXUS_RATE_LIMITS", "{}")),
+)
+
+
+def install_litellm_limits(registry: RateLimiterRegistry = rate_limiter):
+    """
+    Routes every ``litellm.completion`` / ``litellm.acompletion`` request through ``registry``.
+
+    Idempotent: functions already wrapped are left as they are.
+    """
+    if not getattr(litellm.completion, "rate_limited", False):
+        litellm.completion = registry.wrap_completion(litellm.completion)
+    if not getattr(litellm.acompletion, "rate_limited", False):
+        litellm.acompletion = registry.wrap_acompletion(litellm.acompletion)
+
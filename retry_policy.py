@@ -0,0 +1,212 @@
+"""
+Retry policy and error taxonomy for LLM calls.
+
+Every error raised by an LLM call is classified before deciding what to do:
+
+* ``transient`` (429 rate limits, 5xx, connection resets, provider timeouts): retried
+  with exponential backoff; a provider ``Retry-After`` hint takes precedence.
+* ``model_unusable`` (context overflow, unknown model, bad request, schema mismatch,
+  hard timeouts): not retried; the node moves to its next fallback model at once.
+* ``fatal`` (authentication, permissions, missing API key): the run is aborted with
+  :class:`FatalLLMError`, since no other model or attempt can succeed.
+* ``unknown``: retried with a short backoff, as before.
+
+Decisions are counted per class (see :meth:`RetryPolicy.stats`). The policy is
+pluggable: subclass :class:`RetryPolicy` (``classify``, ``backoff``) and install it with
+:func:`set_retry_policy`.
+"""
+import random
+import re
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import litellm
+
+ERROR_CLASSES = ("transient", "model_unusable", "fatal", "unknown")
+
+_FATAL_PATTERNS = ("AuthenticationError", "PermissionDeniedError", "API key required", "Invalid API key", "No auth credentials")
+_UNUSABLE_PATTERNS = (
+    "ContextWindowExceeded", "context length", "context_length_exceeded", "maximum context", "too many tokens",
+    "NotFoundError", "No endpoints found", "not a valid model", "model_not_found",
+    "BadRequestError", "Structured output does not match", "ValidationError",
+)
+# Bare 429 / 503 are kept for the CrewAI messages that only carry the status code
+_TRANSIENT_PATTERNS = ("429", "RateLimitError", "503", "ServiceUnavailable", "InternalServerError", "APIConnectionError", "overloaded")
+
+_FATAL_CODES = {401, 403}
+_UNUSABLE_CODES = {400, 404, 413, 422}
+
+
+class FatalLLMError(Exception):
+    """
+    Raised when an LLM error makes the whole run pointless (e.g. invalid API key).
+
+    Nodes re-raise it instead of falling back to the next model.
+    """
+
+
+def _matches(text: str, patterns) -> bool:
+    return any(re.search(rf"(?<!\d){re.escape(p)}(?!\d)", text) for p in patterns)
+
+
+def _status_code(e: Exception, text: str):
+    code = getattr(e, "status_code", None)
+    if isinstance(code, int):
+        return code
+    match = re.search(r"(?:error|status)[ _]?code[\"':\s]*(\d{3})", text, re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+def classify_error(e: Exception) -> str:
+    """
+    Returns the class of an LLM error (one of :data:`ERROR_CLASSES`).
+
+    LiteLLM exception types are used when available; CrewAI and the process pool
+    often wrap them into plain exceptions, so the message is inspected as well.
+    """
+    if isinstance(e, FatalLLMError):
+        return "fatal"
+    if isinstance(e, (litellm.AuthenticationError, litellm.PermissionDeniedError)):
+        return "fatal"
+    if isinstance(e, (litellm.ContextWindowExceededError, litellm.NotFoundError, litellm.BadRequestError)):
+        return "model_unusable"
+    if isinstance(e, (litellm.RateLimitError, litellm.ServiceUnavailableError, litellm.InternalServerError, litellm.APIConnectionError)):
+        return "transient"
+    if isinstance(e, TimeoutError):
+        # Our wall-clock timeouts (see execution.py): the call would most likely hang again
+        return "model_unusable"
+
+    text = f"{type(e).__name__}: {e}"
+    code = _status_code(e, text)
+    if code in _FATAL_CODES or _matches(text, _FATAL_PATTERNS):
+        return "fatal"
+    if code in _UNUSABLE_CODES or _matches(text, _UNUSABLE_PATTERNS):
+        return "model_unusable"
+    if code is not None and (code == 429 or code >= 500):
+        return "transient"
+    if _matches(text, _TRANSIENT_PATTERNS):
+        return "transient"
+    return "unknown"
+
+
+def retry_after(e: Exception):
+    """
+    Extracts the provider's ``Retry-After`` hint from an error, in seconds (None if absent).
+    """
+    headers = getattr(e, "headers", None) or getattr(getattr(e, "response", None), "headers", None) or {}
+    value = None
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+    except AttributeError:
+        pass
+    if value is None:
+        match = re.search(r"retry[- _]after[\"':\s]*(\d+(?:\.\d+)?)", str(e), re.IGNORECASE)
+        value = match.group(1) if match else None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        # HTTP-date form
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides, for each failed attempt, whether to wait and retry, move on, or abort.
+
+    Args:
+        max_retries (int): Attempts per model for retriable errors.
+        base_delay (float): Base delay of the transient backoff.
+        max_delay (float): Cap of any delay, including ``Retry-After`` hints.
+    """
+    def __init__(self, max_retries: int = 3, base_delay: float = 5, max_delay: float = 60):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def classify(self, e: Exception) -> str:
+        return classify_error(e)
+
+    def backoff(self, error_class: str, e: Exception, attempt: int) -> float:
+        """
+        Returns the delay before retrying attempt ``attempt`` (0-based) of a retriable error.
+        """
+        if error_class == "transient":
+            hint = retry_after(e)
+            if hint is not None:
+                return min(self.max_delay, hint + random.uniform(0, 1))
+            # Exponential backoff for rate limits: 5, 10, 20... capped
+            return min(self.max_delay, (self.base_delay * (2 ** attempt)) + random.uniform(1, 5))
+        return min(self.max_delay, (2 * (2 ** attempt)) + random.uniform(0, 1))
+
+    def _count(self, error_class: str, decision: str):
+        with self._lock:
+            counters = self._stats.setdefault(error_class, {"errors": 0, "retry": 0, "next_model": 0, "abort": 0})
+            counters["errors"] += 1
+            counters[decision] += 1
+
+    def decide(self, e: Exception, attempt: int) -> float:
+        """
+        Returns the delay before the next attempt, or raises to stop retrying.
+
+        Raises:
+            FatalLLMError: For fatal errors (the run must stop).
+            Exception: The original error, when the node should move to its next model.
+        """
+        error_class = self.classify(e)
+        if error_class == "fatal":
+            self._count(error_class, "abort")
+            print(f"🛑 Erreur fatale ({e}). Arrêt du run.")
+            if isinstance(e, FatalLLMError):
+                raise e
+            raise FatalLLMError(str(e)) from e
+        if error_class == "model_unusable":
+            self._count(error_class, "next_model")
+            print(f"⏭️ Modèle inutilisable ({e}). Passage au modèle suivant.")
+            raise e
+        if attempt >= self.max_retries - 1:
+            self._count(error_class, "next_model")
+            print(f"❌ Échec définitif après {self.max_retries} tentatives.")
+            raise e
+
+        self._count(error_class, "retry")
+        delay = self.backoff(error_class, e, attempt)
+        if error_class == "transient":
+            print(f"⏳ Erreur transitoire ({type(e).__name__}). Attente de {delay:.1f}s avant nouvelle tentative {attempt+1}/{self.max_retries}...")
+        else:
+            print(f"⚠️ Erreur ({e}). Nouvelle tentative dans {delay:.1f}s... ({attempt+1}/{self.max_retries})")
+        return delay
+
+    def stats(self) -> dict:
+        """
+        Returns the decision counters per error class.
+        """
+        with self._lock:
+            return {k: dict(v) for k, v in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+retry_policy = RetryPolicy()
+
+
+def set_retry_policy(policy: RetryPolicy):
+    """
+    Installs the policy used by :func:`utils.retry_llm` and :func:`utils.async_retry_llm`.
+    """
+    global retry_policy
+    retry_policy = policy
+
+
+def get_retry_policy() -> RetryPolicy:
+    return retry_policy
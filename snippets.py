@@ -0,0 +1,152 @@
+"""
+Relevance-ranked, token-budgeted snippets for search tool observations.
+
+Tool observations stay in the expert's ReAct context for every following turn.
+Instead of cutting abstracts blindly after a fixed number of characters, each
+observation is reduced to a token budget (``NEXUS_OBSERVATION_TOKENS``, 0 disables):
+its sentences are scored against the query (query terms weighted by their rarity in
+the observation), and the best ones are packed into the budget, in their original
+order. The title, author, source and link lines of structured results are kept as
+they are, and every abstract keeps its best sentence when the budget allows it.
+"""
+import math
+import os
+import re
+import threading
+
+from utils import tokenize
+from token_budget import count_tokens
+
+DEFAULT_OBSERVATION_TOKENS = int(os.environ.get("NEXUS_OBSERVATION_TOKENS", 500))
+# Marks the sentences left out of a snippet
+ELLIPSIS = "…"
+
+# Lines identifying a structured search result, and the fields that can be reduced
+_FIELD = re.compile(r"^(Title|Titre|Authors|Auteurs|Source|Sources|Link|Lien)\s*:", re.IGNORECASE)
+_TEXT_FIELD = re.compile(r"^(Summary|Résumé)\s*:\s*", re.IGNORECASE)
+
+
+def split_sentences(text: str) -> list:
+    """
+    Splits a text into sentences (on end punctuation and line breaks).
+    """
+    return [s.strip() for s in re.split(r"(?<=[.!?])\s+|\n+", text) if s.strip()]
+
+
+class SnippetStats:
+    """
+    Thread-safe counters of the observations reduced and the tokens they saved.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def record(self, tokens_in: int, tokens_out: int):
+        with self._lock:
+            self._counters["observations"] += 1
+            self._counters["reduced"] += 1 if tokens_out < tokens_in else 0
+            self._counters["tokens_in"] += tokens_in
+            self._counters["tokens_out"] += tokens_out
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self._counters, "tokens_saved": self._counters["tokens_in"] - self._counters["tokens_out"]}
+
+    def reset(self):
+        with self._lock:
+            self._counters = {"observations": 0, "reduced": 0, "tokens_in": 0, "tokens_out": 0}
+
+
+snippet_stats = SnippetStats()
+
+
+def _rank(units: list, query: str) -> list:
+    # Returns (score, unit index, sentence index) triples, best first
+    query_terms = set(tokenize(query))
+    sentence_terms = [[set(tokenize(s)) for s in sentences] for _, sentences in units]
+    count = sum(len(terms) for terms in sentence_terms) or 1
+    document_frequency = {t: sum(t in terms for unit in sentence_terms for terms in unit) for t in query_terms}
+    idf = {t: math.log(1 + count / df) for t, df in document_frequency.items() if df}
+    ranked = []
+    for u, unit in enumerate(sentence_terms):
+        for i, terms in enumerate(unit):
+            # Earlier sentences win ties (abstracts lead with their main claim)
+            ranked.append((sum(idf.get(t, 0.0) for t in terms & query_terms), -i, u, i))
+    ranked.sort(reverse=True)
+    return [(score, u, i) for score, _, u, i in ranked]
+
+
+def compress_observation(text: str, query: str, max_tokens: int = None) -> str:
+    """
+    Reduces a tool observation to its sentences most relevant to the query, within a token budget.
+
+    Args:
+        text (str): The tool output.
+        query (str): The query that produced it.
+        max_tokens (int): Token budget of the observation. Defaults to ``NEXUS_OBSERVATION_TOKENS``; 0 disables.
+
+    Returns:
+        str: The observation, unchanged when it already fits.
+    """
+    max_tokens = DEFAULT_OBSERVATION_TOKENS if max_tokens is None else max_tokens
+    text = text or ""
+    tokens_in = count_tokens(text)
+    if max_tokens <= 0 or tokens_in <= max_tokens:
+        snippet_stats.record(tokens_in, tokens_in)
+        return text
+
+    # Title, author, source and link lines are kept as they are; the other lines
+    # (abstract fields, free text such as web search output) are reduced
+    lines = text.split("\n")
+    units, kept = [], 0
+    for n, line in enumerate(lines):
+        if _FIELD.match(line):
+            kept += count_tokens(line)
+            continue
+        field = _TEXT_FIELD.match(line)
+        prefix = field.group(0) if field else ""
+        sentences = split_sentences(line[len(prefix):])
+        if sentences:
+            units.append(((n, prefix), sentences))
+    if not units:
+        snippet_stats.record(tokens_in, tokens_in)
+        return text
+
+    budget = max_tokens - kept
+    ranked = _rank(units, query)
+    selected = set()
+    # Best sentence of every result first, then the best remaining sentences
+    for first_pass in (True, False):
+        covered = {u for u, _ in selected}
+        for _, u, i in ranked:
+            if (u, i) in selected or (first_pass and u in covered):
+                continue
+            cost = count_tokens(units[u][1][i]) + 1
+            if cost <= budget:
+                selected.add((u, i))
+                covered.add(u)
+                budget -= cost
+
+    def render(selected):
+        reduced = {}
+        for u, ((n, prefix), sentences) in enumerate(units):
+            chosen = [i for i in range(len(sentences)) if (u, i) in selected]
+            parts = []
+            for j, i in enumerate(chosen):
+                if i != (chosen[j - 1] + 1 if j else 0):
+                    parts.append(ELLIPSIS)
+                parts.append(sentences[i])
+            if chosen and chosen[-1] < len(sentences) - 1:
+                parts.append(ELLIPSIS)
+            # Free text lines without any selected sentence are dropped
+            reduced[n] = prefix + " ".join(parts) if parts else (prefix + ELLIPSIS if prefix else None)
+        return "\n".join(line if n not in reduced else reduced[n] for n, line in enumerate(lines) if reduced.get(n, line) is not None)
+
+    output = render(selected)
+    # Prefixes, ellipses and line breaks were not budgeted: drop the weakest sentences until it fits
+    order = [(u, i) for _, u, i in ranked if (u, i) in selected]
+    while order and count_tokens(output) > max_tokens:
+        selected.discard(order.pop())
+        output = render(selected)
+    snippet_stats.record(tokens_in, count_tokens(output))
+    return output
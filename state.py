@@ -1,4 +1,5 @@
-from typing import TypedDict, List, Dict, Any
+import operator
+from typing import TypedDict, List, Dict, Any, Annotated
 
 class AgentState(TypedDict):
     """
@@ -7,11 +8,36 @@ class AgentState(TypedDict):
     Attributes:
         input (str): The initial input query or problem statement.
         experts (List[Dict[str, str]]): A list of recruited experts, where each expert is a dictionary containing details like name, role, bias, and skill.
-        hypotheses (List[Dict[str, str]]): A list of hypotheses generated by the experts.
+        hypotheses (List[Dict[str, str]]): A list of hypotheses generated by the experts (with an optional compressed 'digest').
         debate_minutes (str): The minutes or transcript of the debate between experts and the Devil's Advocate.
         final_solution (str): The synthesized final solution.
         confidence_score (float): The confidence score of the solution (0-100).
         iterations (int): The number of iterations the workflow has gone through.
+        speculative_experts (bool): Start the hypotheses of the fixed experts (AlphaEvolve) while the recruiter runs.
+        speculation_id (str): Id of the speculative hypothesis tasks started for this run (set by the graph).
+        tool_prefetch (bool): Run the likely searches of the panel in the background after the recruitment, warming the shared tool cache.
+        execution_mode (str): How parallel nodes run crews: "thread" (dedicated executor), "native" (CrewAI akickoff) or "process" (killable worker processes).
+        expert_timeout (float): Wall-clock limit of a single expert call in seconds (0 = none); in "process" mode the worker is killed.
+        direct_llm_nodes (List[str]): Tool-less nodes ("debate", "synthesis") run as a single direct LLM call instead of a CrewAI crew.
+        cross_topology (str): Who reads whom during cross-pollination: "all_to_all", "ring", "random_k" or "dissimilar_k".
+        cross_neighbours (int): Hypotheses read by each expert with the sparse topologies.
+        digest_mode (str): Hypothesis compression before cross-pollination and debate: "off", "extractive" or "llm".
+        digest_tokens (int): Token budget of each hypothesis digest.
+        dedup_mode (str): Near-duplicate hypotheses before the debate: "off", "merge" (left out, their experts named with the representative) or "drop".
+        dedup_threshold (float): Estimated similarity (MinHash of word shingles) above which two hypotheses are near-duplicates.
+        dedup_report (Dict[str, Any]): Similarity matrix, pruned hypotheses and debate tokens saved by the dedup node (set by the graph).
+        iteration_mode (str): Knowledge-gap loops: "full" (every expert regenerates) or "incremental" (only the experts concerned by a gap revise).
+        debate_mode (str): "single" (one Devil's Advocate call) or "map_reduce" (parallel shard critiques, then one reduce call).
+        debate_shard_size (int): Hypotheses per shard in the "map_reduce" debate mode.
+        node_tiers (Dict[str, str]): Model tier ("fast" or "strong") of each node; nodes absent use the selected model and the default fallback list.
+        tier_models (Dict[str, List[str]]): Fallback chain of each tier, overriding model_tiers.TIER_MODELS.
+        model_routing (str): Order of the model chain: "static" (selected model first) or "adaptive" (fastest healthy model first, see model_router).
+        context_policy (str): What to do with a model whose context cannot hold the prompt: "skip" it or "trim" the prompt.
+        cache_mode (str): LLM response cache mode for the run: "read_through", "write_only" or "bypass".
+        node_deadlines (Dict[str, float]): Seconds after which a parallel node ("hypothesis", "cross_pollination") stops waiting once the quorum is met.
+        expert_quorum (float): Successful experts a parallel node waits for (past its deadline when one is set), as a fraction (0.8) or a count (4). None waits for all.
+        straggler_policy (str): What to do with experts still running past the deadline: "cancel" or "background".
+        usage (List[Dict[str, Any]]): Every LLM call of the run (node, expert, model, iteration, tokens, latency, retries, fallback hops, cost), appended by each node (see accounting).
     """
     input: str
     experts: List[Dict[str, str]]  # List of dicts with keys: name, role, bias, skill
@@ -28,3 +54,28 @@ class AgentState(TypedDict):
     web_search_enabled: bool
     model_name: str
     language: str
+    speculative_experts: bool
+    speculation_id: str
+    tool_prefetch: bool
+    execution_mode: str
+    expert_timeout: float
+    direct_llm_nodes: List[str]
+    cross_topology: str
+    cross_neighbours: int
+    digest_mode: str
+    digest_tokens: int
+    dedup_mode: str
+    dedup_threshold: float
+    dedup_report: Dict[str, Any]
+    iteration_mode: str
+    debate_mode: str
+    debate_shard_size: int
+    node_tiers: Dict[str, str]
+    tier_models: Dict[str, List[str]]
+    model_routing: str
+    context_policy: str
+    cache_mode: str
+    node_deadlines: Dict[str, float]
+    expert_quorum: float
+    straggler_policy: str
+    usage: Annotated[List[Dict[str, Any]], operator.add]
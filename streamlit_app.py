@@ -1,19 +1,54 @@
 import streamlit as st
 import os
-import requests
+from http_client import get_session, http_stats
 import streamlit.components.v1 as components
 from dotenv import load_dotenv
-from graph import app
+from graph import app, cancel_speculations, DEBATE_MODES, DEFAULT_DEBATE_MODE, DEFAULT_DEBATE_SHARD_SIZE, DEFAULT_SPECULATIVE_EXPERTS
 @st.cache_data
 def cached_render_dagre_graph(nodes, edges):
     return render_dagre_graph(nodes, edges)
 
 from visualization import update_graph_state, COLOR_ACTIVE, get_agent_tooltip, render_dagre_graph, update_node_visuals, ICONS, COLOR_RECRUITER
 from utils import format_output
+from accounting import usage_json, usage_report
+from circuit_breaker import model_health
+from rate_limiter import rate_limiter
+from retry_policy import get_retry_policy
+from llm_cache import CACHE_MODES, DEFAULT_CACHE_MODE
+from direct_llm import DIRECT_LLM_NODES, DEFAULT_DIRECT_LLM_NODES
+from execution import EXECUTION_MODES, DEFAULT_EXECUTION_MODE, DEFAULT_EXPERT_TIMEOUT
+from topology import TOPOLOGIES, DEFAULT_TOPOLOGY, DEFAULT_NEIGHBOURS
+from digest import DIGEST_MODES, DEFAULT_DIGEST_MODE, DEFAULT_DIGEST_TOKENS
+from dedup import DEDUP_MODES, DEFAULT_DEDUP_MODE, DEFAULT_DEDUP_THRESHOLD
+from gap_routing import ITERATION_MODES, DEFAULT_ITERATION_MODE
+from prefetch import DEFAULT_TOOL_PREFETCH
+from tool_cache import tool_cache
+from snippets import snippet_stats
+from token_budget import CONTEXT_POLICIES, DEFAULT_CONTEXT_POLICY
+from model_router import ROUTING_MODES, DEFAULT_ROUTING_MODE, model_router
+from model_tiers import MODEL_TIERS, TIERED_NODES, TIER_MODELS, DEFAULT_NODE_TIERS
+from checkpoint import run_config
 
 # Load environment variables
 load_dotenv()
 
+def resume(run_id):
+    """
+    Resumes an interrupted run from its last completed node.
+
+    The run is picked up by the streaming block of :func:`main` on the next rerun.
+
+    Args:
+        run_id (str): The run id shown when the run was started.
+    """
+    st.session_state['research_started'] = True
+    st.session_state['research_finished'] = False
+    st.session_state['run_id'] = run_id
+    st.session_state['resuming'] = True
+    # Graph is rebuilt from the checkpointed state
+    st.session_state.pop('nodes', None)
+    st.session_state.pop('edges', None)
+
 def main():
     st.set_page_config(page_title="Nexus-Science Agent", page_icon="🔬", layout="wide")
     
@@ -37,7 +72,7 @@ def main():
         def get_openrouter_models(free_only=True):
             """Fetches the list of models from OpenRouter API."""
             try:
-                response = requests.get("https://openrouter.ai/api/v1/models")
+                response = get_session().get("https://openrouter.ai/api/v1/models")
                 if response.status_code == 200:
                     models = response.json()["data"]
                     if free_only:
@@ -101,6 +136,96 @@ def main():
              model_name = f"openrouter/{model_name}"
         
         language = st.selectbox("Output Language", ["Français", "English", "Español", "Deutsch"], help="Language for the final report.")
+        cache_mode = st.selectbox("LLM Response Cache", list(CACHE_MODES), index=list(CACHE_MODES).index(DEFAULT_CACHE_MODE), help="read_through: reuse cached answers for identical prompts; write_only: refresh the cache; bypass: no cache.")
+
+        with st.expander("⚡ Performance"):
+            execution_mode = st.selectbox("Expert Execution", list(EXECUTION_MODES), index=list(EXECUTION_MODES).index(DEFAULT_EXECUTION_MODE), help="thread: shared thread pool; native: CrewAI async; process: worker processes killed when the timeout fires.")
+            expert_timeout = st.slider("Expert Timeout (s)", min_value=0, max_value=900, value=int(DEFAULT_EXPERT_TIMEOUT), step=30, help="Wall-clock limit of a single expert call. 0 disables it.")
+            direct_llm_nodes = st.multiselect("Direct LLM Nodes", list(DIRECT_LLM_NODES), default=DEFAULT_DIRECT_LLM_NODES, help="Run these tool-less phases as a single chat completion instead of a CrewAI crew.")
+            cross_topology = st.selectbox("Cross-Pollination Topology", list(TOPOLOGIES), index=list(TOPOLOGIES).index(DEFAULT_TOPOLOGY), help="all_to_all: every expert reads every hypothesis (O(n²) tokens); ring / random_k / dissimilar_k: each expert reads k hypotheses (O(n·k)).")
+            cross_neighbours = st.slider("Cross-Pollination Neighbours (k)", min_value=1, max_value=6, value=DEFAULT_NEIGHBOURS, help="Hypotheses read by each expert with the sparse topologies.")
+            digest_mode = st.selectbox("Hypothesis Digest", list(DIGEST_MODES), index=list(DIGEST_MODES).index(DEFAULT_DIGEST_MODE), help="Compress each hypothesis once before cross-pollination and debate. extractive: free sentence selection; llm: one cheap-model call per hypothesis.")
+            digest_tokens = st.slider("Digest Budget (tokens)", min_value=100, max_value=1000, value=DEFAULT_DIGEST_TOKENS, step=50)
+            dedup_mode = st.selectbox("Duplicate Hypotheses", list(DEDUP_MODES), index=list(DEDUP_MODES).index(DEFAULT_DEDUP_MODE), help="Leave near-identical hypotheses out of the debate. merge: the debate names every expert who proposed it; drop: the duplicates are ignored. In both modes the text of a duplicate is not read.")
+            dedup_threshold = st.slider("Duplicate Similarity", min_value=0.5, max_value=1.0, value=DEFAULT_DEDUP_THRESHOLD, step=0.05, help="Estimated word-shingle similarity above which two hypotheses are near-duplicates.")
+            iteration_mode = st.selectbox("Gap Iterations", list(ITERATION_MODES), index=list(ITERATION_MODES).index(DEFAULT_ITERATION_MODE), help="full: every expert regenerates its hypothesis; incremental: only the experts concerned by a knowledge gap revise theirs.")
+            debate_mode = st.selectbox("Debate Mode", list(DEBATE_MODES), index=list(DEBATE_MODES).index(DEFAULT_DEBATE_MODE), help="single: one call with every hypothesis; map_reduce: shards critiqued in parallel, then one call merging the critiques.")
+            debate_shard_size = st.slider("Debate Shard Size", min_value=1, max_value=4, value=DEFAULT_DEBATE_SHARD_SIZE, help="Hypotheses per shard in map_reduce mode.")
+            context_policy = st.selectbox("Oversized Prompts", list(CONTEXT_POLICIES), index=list(CONTEXT_POLICIES).index(DEFAULT_CONTEXT_POLICY), help="skip: move to the next model when the prompt exceeds the context window; trim: shorten the prompt to fit.")
+            model_routing = st.selectbox("Model Routing", list(ROUTING_MODES), index=list(ROUTING_MODES).index(DEFAULT_ROUTING_MODE), help="static: selected model first, then the fallback list; adaptive: fastest healthy model first, from latency and success rates measured across runs.")
+            speculative_experts = st.checkbox("Speculative Fixed Experts", value=DEFAULT_SPECULATIVE_EXPERTS, help="Start the AlphaEvolve hypothesis while the recruiter runs instead of after it.")
+            tool_prefetch = st.checkbox("Prefetch Searches", value=DEFAULT_TOOL_PREFETCH, help="After recruitment, run the likely searches of each expert in the background so their tool calls are served from the cache.")
+            expert_deadline = st.slider("Expert Deadline (s)", min_value=0, max_value=600, value=0, step=15, help="After this delay, parallel phases stop waiting for slow experts once the quorum is met. 0 waits for every expert.")
+            expert_quorum = st.slider("Expert Quorum (%)", min_value=10, max_value=100, value=80, step=10, help="Share of experts that must have answered before the deadline can cut stragglers (ignored when the deadline is 0).")
+            straggler_policy = st.selectbox("Stragglers", ["cancel", "background"], help="cancel: stop late experts; background: let them finish (their answers still fill the cache).")
+
+        with st.expander("🎚️ Model Tiers"):
+            st.caption("Run cheap phases on fast models and keep a strong model where quality matters. 'default' uses the model selected above.")
+            node_tiers = {}
+            for node in TIERED_NODES:
+                tier = st.selectbox(f"Tier: {node}", ["default"] + list(MODEL_TIERS), index=(["default"] + list(MODEL_TIERS)).index(DEFAULT_NODE_TIERS.get(node, "default")), key=f"tier_{node}")
+                if tier != "default":
+                    node_tiers[node] = tier
+            tier_models = {}
+            for tier in MODEL_TIERS:
+                tier_options = TIER_MODELS[tier] + [m for m in model_options if f"openrouter/{m}" not in TIER_MODELS[tier]]
+                first = st.selectbox(f"First model of the '{tier}' tier", tier_options, key=f"tier_model_{tier}", help="The rest of the tier's fallback chain follows.")
+                if not first.startswith("openrouter/"):
+                    first = f"openrouter/{first}"
+                tier_models[tier] = [first] + [m for m in TIER_MODELS[tier] if m != first]
+
+        st.markdown("---")
+        with st.expander("📊 Latency & Tokens per Tier"):
+            # Split of the last run of this session, from its call records
+            usage = st.session_state.get('final_tiers')
+            if usage:
+                st.table([{"tier": t, **u} for t, u in usage.items()])
+            else:
+                st.caption("No finished run yet.")
+
+        with st.expander("🩺 Model Health (Circuit Breakers)"):
+            health = model_health.snapshot()
+            if health:
+                st.table([{"model": m, **h} for m, h in health.items()])
+            else:
+                st.caption("No model called yet.")
+
+        with st.expander("🧭 Model Ranking (adaptive routing)"):
+            ranking = model_router.snapshot()
+            if ranking:
+                st.table([{"model": m, **stats} for m, stats in ranking.items()])
+            else:
+                st.caption("No model called yet.")
+
+        with st.expander("🔎 Search Tool Cache"):
+            st.table([tool_cache.stats()])
+            st.caption("Observation snippets (tokens sent to the experts):")
+            st.table([snippet_stats.snapshot()])
+            hosts = http_stats.snapshot()
+            if hosts:
+                st.table([{"host": h, **stats} for h, stats in hosts.items()])
+
+        with st.expander("⏱️ Rate Limiters (queue & waits)"):
+            limits = rate_limiter.snapshot()
+            if limits:
+                st.table([{"model": m, **limit} for m, limit in limits.items()])
+            else:
+                st.caption("No model called yet.")
+
+        with st.expander("🔁 Retry Decisions (per error class)"):
+            decisions = get_retry_policy().stats()
+            if decisions:
+                st.table([{"class": c, **counts} for c, counts in decisions.items()])
+            else:
+                st.caption("No LLM error yet.")
+
+        with st.expander("⏯️ Resume a Run"):
+            resume_run_id = st.text_input("Run id", help="Run id of an interrupted research (shown under the graph).")
+            if st.button("Resume", disabled=not resume_run_id):
+                if app.get_state(run_config(resume_run_id)).values:
+                    resume(resume_run_id)
+                else:
+                    st.error(f"No checkpoint found for run '{resume_run_id}'.")
 
     # Main input
     query = st.text_area("Enter your research query:", height=100, placeholder="e.g., Generate a perfect algorithm for underwater drone swarm attack mode...")
@@ -118,6 +243,8 @@ def main():
         st.session_state['query'] = query # Persist query too if needed
         # Reset research_finished flag if a new research is started
         st.session_state['research_finished'] = False
+        st.session_state['run_id'] = run_config()['configurable']['thread_id']
+        st.session_state['resuming'] = False
         
         # Initialize nodes as dictionaries
         st.session_state['nodes'] = [] 
@@ -148,6 +275,8 @@ def main():
         # Placeholder for the graph
         st.markdown("### 🕸️ Agent Communication Graph")
         graph_placeholder = st.empty()
+        if st.session_state.get('run_id'):
+            st.caption(f"Run id: {st.session_state['run_id']}")
 
         # Initialize Graph State in Session State if not exists
         if 'nodes' not in st.session_state:
@@ -191,7 +320,7 @@ def main():
                         st.markdown(report)
                     
                     st.markdown("### 💾 Exporter le Rapport")
-                    col1, col2 = st.columns(2)
+                    col1, col2, col3 = st.columns(3)
                     with col1:
                         st.download_button(
                             label="📥 Télécharger en Markdown",
@@ -208,6 +337,14 @@ def main():
                             mime="text/plain",
                             use_container_width=True
                         )
+                    with col3:
+                        st.download_button(
+                            label="📊 Coûts & Latences (JSON)",
+                            data=st.session_state.get('final_usage', "{}"),
+                            file_name="nexus_science_usage.json",
+                            mime="application/json",
+                            use_container_width=True
+                        )
             
             else:
                 # Research NOT finished, run the stream
@@ -224,6 +361,29 @@ def main():
                     "web_search_enabled": web_search,
                     "model_name": model_name,
                     "language": language,
+                    "cache_mode": cache_mode,
+                    "speculative_experts": speculative_experts,
+                    "tool_prefetch": tool_prefetch,
+                    "execution_mode": execution_mode,
+                    "expert_timeout": expert_timeout,
+                    "direct_llm_nodes": direct_llm_nodes,
+                    "cross_topology": cross_topology,
+                    "cross_neighbours": cross_neighbours,
+                    "digest_mode": digest_mode,
+                    "digest_tokens": digest_tokens,
+                    "dedup_mode": dedup_mode,
+                    "dedup_threshold": dedup_threshold,
+                    "iteration_mode": iteration_mode,
+                    "debate_mode": debate_mode,
+                    "debate_shard_size": debate_shard_size,
+                    "node_tiers": node_tiers,
+                    "tier_models": tier_models,
+                    "model_routing": model_routing,
+                    "context_policy": context_policy,
+                    "node_deadlines": {"hypothesis": expert_deadline, "cross_pollination": expert_deadline},
+                    # Without a deadline the quorum would cut experts at once: wait for all of them
+                    "expert_quorum": expert_quorum / 100.0 if expert_deadline else None,
+                    "straggler_policy": straggler_policy,
                     "iterations": 0
                 }
                 
@@ -234,37 +394,64 @@ def main():
                 # Run the graph with streaming
                 import asyncio
                 
+                config = run_config(st.session_state.get('run_id'))
+                st.session_state['run_id'] = config['configurable']['thread_id']
+                stream_input = initial_state
                 state_monitor = initial_state.copy()
                 final_state = None
                 step_counter = 0
+
+                if st.session_state.get('resuming', False):
+                    # Continue from the last checkpoint instead of starting over
+                    snapshot = app.get_state(config)
+                    stream_input = None
+                    state_monitor = dict(snapshot.values)
+                    if state_monitor.get('experts'):
+                        st.session_state['nodes'], st.session_state['edges'] = update_graph_state(
+                            "recruit", {"experts": state_monitor['experts']}, st.session_state['nodes'], st.session_state['edges']
+                        )
+                    if not snapshot.next:
+                        final_state = state_monitor.copy()
                 
                 async def run_research():
                     nonlocal state_monitor, final_state, step_counter
-                    async for output in app.astream(initial_state):
-                        for key, value in output.items():
-                            step_counter += 1
-                            state_monitor.update(value)
+                    try:
+                        async for output in app.astream(stream_input, config):
+                            for key, value in output.items():
+                                step_counter += 1
+                                value = value or {}
+                                # Nodes return their own LLM calls: accumulate them like the graph reducer does
+                                state_monitor.update({**value, "usage": (state_monitor.get('usage') or []) + value.get('usage', [])})
+                                if key in ("digest", "dedup", "speculate", "prefetch"):
+                                    # Internal steps (compression, background start): no agent to highlight
+                                    continue
                             
-                            # Update Graph State
-                            st.session_state['nodes'], st.session_state['edges'] = update_graph_state(
-                                key, value, st.session_state['nodes'], st.session_state['edges'],
-                                iter_current=min(state_monitor.get('iterations', 0) + 1, state_monitor.get('max_iterations', 3)),
-                                iter_total=state_monitor.get('max_iterations', 3)
-                            )
+                                # Update Graph State
+                                st.session_state['nodes'], st.session_state['edges'] = update_graph_state(
+                                    key, value, st.session_state['nodes'], st.session_state['edges'],
+                                    iter_current=min(state_monitor.get('iterations', 0) + 1, state_monitor.get('max_iterations', 3)),
+                                    iter_total=state_monitor.get('max_iterations', 3)
+                                )
                             
-                            if key == "synthesis":
-                                final_state = state_monitor.copy()
+                                if key == "synthesis":
+                                    final_state = state_monitor.copy()
 
-                            # Update Graph
-                            with graph_placeholder:
-                                 components.html(cached_render_dagre_graph(st.session_state['nodes'], st.session_state['edges']), height=500)
+                                # Update Graph
+                                with graph_placeholder:
+                                     components.html(cached_render_dagre_graph(st.session_state['nodes'], st.session_state['edges']), height=500)
+                    finally:
+                        # Speculative tasks the run did not use (failed recruitment, stopped run)
+                        cancel_speculations(config)
                 
                 asyncio.run(run_research())
+                st.session_state['resuming'] = False
 
                 if final_state:
                     # Format output
                     report = format_output(final_state)
                     st.session_state['final_report'] = report
+                    st.session_state['final_usage'] = usage_json(final_state.get('usage') or [])
+                    st.session_state['final_tiers'] = usage_report(final_state.get('usage'))['by_tier']
                     st.session_state['research_finished'] = True
                     
                     st.divider()
@@ -275,7 +462,7 @@ def main():
                          st.markdown(report)
                          
                     st.markdown("### 💾 Exporter le Rapport")
-                    col1, col2 = st.columns(2)
+                    col1, col2, col3 = st.columns(3)
                     with col1:
                         st.download_button(
                             label="📥 Télécharger en Markdown",
@@ -292,6 +479,14 @@ def main():
                             mime="text/plain",
                             use_container_width=True
                         )
+                    with col3:
+                        st.download_button(
+                            label="📊 Coûts & Latences (JSON)",
+                            data=st.session_state.get('final_usage', "{}"),
+                            file_name="nexus_science_usage.json",
+                            mime="application/json",
+                            use_container_width=True
+                        )
                 
         except Exception as e:
             st.error(f"An error occurred: {e}")
@@ -46,6 +46,32 @@ def hypothesis_task(agent, input_query):
         agent=agent
     )
 
+def revision_task(agent, previous_hypothesis, gaps, input_query):
+    """
+    Creates a task for revising a previous hypothesis against specific knowledge gaps.
+
+    Used by the incremental iterations: only the experts concerned by a gap revise their hypothesis.
+
+    Args:
+        agent (Agent): The expert agent revising its hypothesis.
+        previous_hypothesis (str): The expert's hypothesis from the previous iteration.
+        gaps (list): The knowledge gaps routed to this expert.
+        input_query (str): The original problem statement.
+
+    Returns:
+        Task: A CrewAI Task object for the revision.
+    """
+    gaps_text = "\n".join([f"- {g}" for g in gaps])
+    return Task(
+        description=f"Vous avez proposé l'hypothèse suivante pour '{input_query}' :\n{previous_hypothesis}\n\n"
+                    f"La synthèse a identifié ces lacunes (Knowledge Gaps) relevant de votre expertise :\n{gaps_text}\n\n"
+                    f"VOTRE TÂCHE : Révisez votre hypothèse pour combler ces lacunes. "
+                    f"Conservez tel quel ce qui reste valide et ne modifiez que ce que les lacunes exigent. "
+                    f"Si vous utilisez des outils de recherche, faites-le SEQUENTIELLEMENT (un par un), ne jamais appeler plusieurs outils en même temps.",
+        expected_output="L'hypothèse complète révisée, qui comble les lacunes indiquées.",
+        agent=agent
+    )
+
 def debate_task(agent, hypotheses, input_query):
     """
     Creates a task for debating the proposed hypotheses.
@@ -58,7 +84,12 @@ def debate_task(agent, hypotheses, input_query):
     Returns:
         Task: A CrewAI Task object for the debate phase.
     """
-    hypotheses_text = "\n\n".join([f"{h['expert_name']}: {h['hypothesis']}" for h in hypotheses])
+    # Compressed digests (see digest.py) replace the full text when available;
+    # experts whose near-duplicate hypothesis was merged (see dedup.py) are named with it
+    hypotheses_text = "\n\n".join([
+        f"{h['expert_name']}{' (rejoint par ' + ', '.join(h['merged_from']) + ')' if h.get('merged_from') else ''}: {h.get('digest') or h['hypothesis']}"
+        for h in hypotheses
+    ])
     return Task(
         description=f"Examinez les hypothèses suivantes pour le problème '{input_query}' :\n{hypotheses_text}\n\n"
                     f"Critiquez-les agressivement. Identifiez les hallucinations, les erreurs de corrélation/causalité et les biais méthodologiques. "
@@ -67,6 +98,27 @@ def debate_task(agent, hypotheses, input_query):
         agent=agent
     )
 
+def debate_reduce_task(agent, shard_critiques, input_query):
+    """
+    Creates a task for merging the critiques of hypothesis shards (map-reduce debate).
+
+    Args:
+        agent (Agent): The Devil's Advocate agent.
+        shard_critiques (List[Dict]): One dict per shard with the critiqued 'experts' and the 'critique'.
+        input_query (str): The original problem statement.
+
+    Returns:
+        Task: A CrewAI Task object producing the debate minutes.
+    """
+    critiques_text = "\n\n".join([f"### Critique de {', '.join(c['experts'])}\n{c['critique']}" for c in shard_critiques])
+    return Task(
+        description=f"Les hypothèses pour le problème '{input_query}' ont été critiquées par groupes :\n{critiques_text}\n\n"
+                    f"Confrontez ces critiques. Identifiez les conflits entre les hypothèses des différents groupes, "
+                    f"les synergies possibles et les défauts communs. Mettez les experts au défi sur les points les plus faibles.",
+        expected_output="Les minutes du débat : conflits, synergies et défauts majeurs des hypothèses, avec les clarifications exigées.",
+        agent=agent
+    )
+
 from models import ExpertList, SynthesisReport
 
 # ... (rest of imports)
@@ -99,6 +151,20 @@ def synthesis_task(agent, debate_minutes, hypotheses, input_query):
         agent=agent
     )
 
+def format_other_hypotheses(other_hypotheses):
+    """
+    Formats the hypotheses shown to an expert during cross-pollination.
+
+    The compressed ``digest`` of a hypothesis is used instead of its full text when available.
+
+    Args:
+        other_hypotheses (list): List of hypotheses from other experts.
+
+    Returns:
+        str: One bullet per hypothesis, with the expert name and role.
+    """
+    return "\n\n".join([f"- {h['expert_name']} ({h.get('role', 'Expert')}): {h.get('digest') or h['hypothesis']}" for h in other_hypotheses])
+
 def cross_pollination_task(agent, current_hypothesis, other_hypotheses, input_query):
     """
     Creates a task for cross-pollinating ideas between experts.
@@ -112,7 +178,7 @@ def cross_pollination_task(agent, current_hypothesis, other_hypotheses, input_qu
     Returns:
         Task: A CrewAI task for enriching the hypothesis.
     """
-    others_text = "\n\n".join([f"- {h['expert_name']} ({h.get('role', 'Expert')}): {h['hypothesis']}" for h in other_hypotheses])
+    others_text = format_other_hypotheses(other_hypotheses)
     
     return Task(
         description=f"Vous êtes {agent.role}. Vous avez proposé une hypothèse pour '{input_query}'.\n"
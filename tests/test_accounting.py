@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from accounting import NodeUsage, estimate_cost, export_usage, usage_report
+from circuit_breaker import model_health
+from model_router import ModelRouter
+from graph import debate_node
+from utils import format_output, retry_llm
+
+class TestAccounting(unittest.TestCase):
+
+    def test_success_failure_and_hops(self):
+        usage = NodeUsage({"iterations": 1}, "hypothesis")
+        usage.call("m1", "Alice").failure()
+        call = usage.call("m2", "Alice")
+        result = call.compute(lambda: SimpleNamespace(token_usage={"prompt_tokens": 120, "completion_tokens": 30}))()
+        record = call.success(100, result)
+        self.assertEqual((record["prompt_tokens"], record["completion_tokens"]), (120, 30))
+        self.assertEqual(record["fallback_hops"], 1)
+        self.assertEqual(record["iteration"], 1)
+        self.assertFalse(record["cached"])
+        # Hops are counted per expert
+        self.assertEqual(usage.call("m1", "Bob").hops, 0)
+        self.assertEqual(len(usage.records("Alice")), 2)
+
+    def test_cache_hits_cost_nothing(self):
+        usage = NodeUsage({}, "synthesis")
+        # The cache answered: the compute wrapper never ran
+        record = usage.call("gpt-4o").success(500, "cached answer")
+        self.assertTrue(record["cached"])
+        self.assertEqual((record["prompt_tokens"], record["cost_usd"]), (0, 0.0))
+
+    def test_cost_estimate(self):
+        self.assertGreater(estimate_cost("gpt-4o", 1000, 1000), 0)
+        self.assertEqual(estimate_cost("openrouter/unknown/model", 1000, 1000), 0.0)
+
+    @patch('time.sleep')
+    def test_retries_are_counted(self, mock_sleep):
+        usage = NodeUsage({}, "debate")
+        call = usage.call("m", "Debate")
+        func = MagicMock(side_effect=[Exception("503 Service Unavailable"), "ok"])
+        self.assertEqual(call.compute(lambda: retry_llm(func, call.retry)())(), "ok")
+        self.assertEqual(call.success(10, "ok")["retries"], 1)
+
+    def test_report_and_export(self):
+        records = [
+            {"node": "hypothesis", "expert": "Alice", "model": "m1", "iteration": 0, "ok": False, "cached": False, "prompt_tokens": 0, "completion_tokens": 0, "latency_s": 1.0, "retries": 2, "fallback_hops": 0, "cost_usd": 0.0},
+            {"node": "hypothesis", "expert": "Alice", "model": "m2", "iteration": 0, "ok": True, "cached": False, "prompt_tokens": 100, "completion_tokens": 50, "latency_s": 3.0, "retries": 0, "fallback_hops": 1, "cost_usd": 0.01},
+            {"node": "synthesis", "expert": "Synthesizer", "model": "m2", "iteration": 1, "ok": True, "cached": False, "prompt_tokens": 400, "completion_tokens": 200, "latency_s": 5.0, "retries": 0, "fallback_hops": 0, "cost_usd": 0.03},
+        ]
+        report = usage_report(records)
+        self.assertEqual(report["totals"]["calls"], 3)
+        self.assertEqual(report["totals"]["fallback_hops"], 1)
+        self.assertEqual(report["by_node"]["hypothesis"]["failures"], 1)
+        self.assertEqual(report["by_model"]["m2"]["prompt_tokens"], 500)
+        self.assertEqual(report["by_expert"]["Alice"]["retries"], 2)
+        self.assertEqual(report["by_iteration"]["1"]["cost_usd"], 0.03)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "usage.json")
+            export_usage(records, path)
+            with open(path) as f:
+                exported = json.load(f)
+        self.assertEqual(exported["calls"], records)
+        self.assertEqual(exported["by_node"]["synthesis"]["latency_s"], 5.0)
+
+        output = format_output({"experts": [], "usage": records})
+        self.assertIn("## 5. Coûts, Tokens & Latence", output)
+        self.assertIn("| Synthesizer | 1 | 0 | 0 | 400 | 200 |", output)
+        self.assertNotIn("## 5.", format_output({"experts": []}))
+
+class TestAccountingInGraph(unittest.TestCase):
+
+    def setUp(self):
+        model_health.reset()
+        # Router statistics persist on disk: keep the mocked calls out of them
+        router = ModelRouter("")
+        for target in ("execution.model_router", "direct_llm.model_router"):
+            patcher = patch(target, router)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        model_health.reset()
+
+    @patch('graph.preflight', return_value=100)
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_debate_node_returns_usage(self, mock_crew, mock_da, mock_task, mock_preflight):
+        mock_crew.return_value.kickoff.side_effect = [TimeoutError("too slow"), "Debate minutes"]
+        state = {'input': 'test', 'hypotheses': [], 'model_name': 'openrouter/first-model', 'iterations': 2}
+        result = debate_node(state)
+
+        self.assertEqual(result['debate_minutes'], "Debate minutes")
+        failed, succeeded = result['usage']
+        self.assertEqual((failed['model'], failed['ok']), ('openrouter/first-model', False))
+        self.assertEqual((succeeded['node'], succeeded['iteration'], succeeded['fallback_hops']), ('debate', 2, 1))
+        self.assertEqual(succeeded['prompt_tokens'], 100)
+
+    @patch('graph.preflight', side_effect=[None, 100])
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_model_skipped_by_preflight_is_recorded(self, mock_crew, mock_da, mock_task, mock_preflight):
+        mock_crew.return_value.kickoff.return_value = "Debate minutes"
+        state = {'input': 'test', 'hypotheses': [], 'model_name': 'openrouter/small-context', 'iterations': 0}
+        skipped, succeeded = debate_node(state)['usage']
+        self.assertEqual((skipped['model'], skipped['ok'], skipped['skipped']), ('openrouter/small-context', False, True))
+        self.assertEqual(succeeded['fallback_hops'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
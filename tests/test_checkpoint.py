@@ -0,0 +1,100 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from typing import TypedDict, List
+from langgraph.graph import StateGraph, END
+from checkpoint import SqliteCheckpointSaver, run_config
+
+class MiniState(TypedDict):
+    input: str
+    hypotheses: List[str]
+    debate_minutes: str
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.saver = SqliteCheckpointSaver(path=os.path.join(self.tmpdir.name, "checkpoints.sqlite"))
+        self.calls = {"hypothesis": 0, "debate": 0}
+        self.fail_debate = True
+
+        def hypothesis(state):
+            self.calls["hypothesis"] += 1
+            return {"hypotheses": ["H1" * 100, "H2" * 100]}
+
+        def debate(state):
+            self.calls["debate"] += 1
+            if self.fail_debate:
+                raise RuntimeError("process died")
+            return {"debate_minutes": "minutes"}
+
+        workflow = StateGraph(MiniState)
+        workflow.add_node("hypothesis", hypothesis)
+        workflow.add_node("debate", debate)
+        workflow.set_entry_point("hypothesis")
+        workflow.add_edge("hypothesis", "debate")
+        workflow.add_edge("debate", END)
+        self.app = workflow.compile(checkpointer=self.saver)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resume_from_last_completed_node(self):
+        config = run_config("run-1")
+        with self.assertRaises(RuntimeError):
+            self.app.invoke({"input": "q", "hypotheses": [], "debate_minutes": ""}, config)
+
+        snapshot = self.app.get_state(config)
+        self.assertEqual(snapshot.next, ("debate",))
+        self.assertEqual(len(snapshot.values["hypotheses"]), 2)
+
+        self.fail_debate = False
+        final_state = self.app.invoke(None, config)
+        self.assertEqual(final_state["debate_minutes"], "minutes")
+        # Hypotheses were not paid for twice
+        self.assertEqual(self.calls["hypothesis"], 1)
+
+    def test_only_updated_channels_are_written(self):
+        self.fail_debate = False
+        config = run_config("run-2")
+        self.app.invoke({"input": "q", "hypotheses": [], "debate_minutes": ""}, config)
+
+        conn = self.saver._connect()
+        hypotheses_blobs = conn.execute(
+            "SELECT COUNT(*) FROM blobs WHERE thread_id = ? AND channel = 'hypotheses'", ("run-2",)
+        ).fetchone()[0]
+        checkpoints = conn.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", ("run-2",)).fetchone()[0]
+        # Initial input + hypothesis node only, although several checkpoints were stored
+        self.assertEqual(hypotheses_blobs, 2)
+        self.assertGreater(checkpoints, hypotheses_blobs)
+
+    def test_list_and_delete_thread(self):
+        self.fail_debate = False
+        config = run_config("run-3")
+        self.app.invoke({"input": "q", "hypotheses": [], "debate_minutes": ""}, config)
+        history = list(self.saver.list(config))
+        self.assertGreater(len(history), 1)
+        self.assertEqual(len(list(self.saver.list(config, limit=1))), 1)
+
+        self.saver.delete_thread("run-3")
+        self.assertIsNone(self.saver.get_tuple(config))
+
+    def test_async_run_keeps_sqlite_off_the_event_loop(self):
+        self.fail_debate = False
+        threads = set()
+        put = self.saver.put
+
+        def recording_put(*args, **kwargs):
+            threads.add(threading.current_thread())
+            return put(*args, **kwargs)
+
+        self.saver.put = recording_put
+        final_state = asyncio.run(self.app.ainvoke({"input": "q", "hypotheses": [], "debate_minutes": ""}, run_config("run-4")))
+        self.assertEqual(final_state["debate_minutes"], "minutes")
+        self.assertTrue(threads)
+        self.assertNotIn(threading.main_thread(), threads)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from circuit_breaker import CircuitBreaker, model_health, CLOSED, OPEN, HALF_OPEN
+from model_router import ModelRouter
+from graph import debate_node
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("model-a", failure_threshold=2, cooldown=30, clock=self.clock)
+
+    def test_trips_after_threshold(self):
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.snapshot()['trip_count'], 1)
+
+    def test_half_open_single_probe(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 31
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        # Only one probe in flight
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_probe_success_closes(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 31
+        self.breaker.allow_request()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_probe_failure_reopens(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 31
+        self.breaker.allow_request()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.snapshot()['trip_count'], 2)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_unused_probe_is_released(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 31
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.release_probe()
+        # The next caller probes at once instead of waiting a full cool-down
+        self.assertTrue(self.breaker.allow_request())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+
+class TestModelHealthInGraph(unittest.TestCase):
+
+    def setUp(self):
+        model_health.reset()
+        # Router statistics persist on disk: keep the mocked calls out of them
+        router = ModelRouter("")
+        for target in ("execution.model_router", "direct_llm.model_router"):
+            patcher = patch(target, router)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        model_health.reset()
+
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_open_model_is_skipped(self, mock_crew, mock_da, mock_task):
+        mock_crew_instance = MagicMock()
+        mock_crew.return_value = mock_crew_instance
+        mock_crew_instance.kickoff.return_value = "Debate minutes"
+
+        tripped = "openrouter/tripped-model"
+        for _ in range(model_health.failure_threshold):
+            model_health.record_failure(tripped)
+
+        state = {'input': 'test', 'hypotheses': [], 'model_name': tripped}
+        result = debate_node(state)
+
+        self.assertEqual(result['debate_minutes'], "Debate minutes")
+        used_models = [c.kwargs['model_name'] for c in mock_da.return_value.get_agent.call_args_list]
+        self.assertNotIn(tripped, used_models)
+        self.assertEqual(model_health.snapshot()[tripped]['state'], OPEN)
+
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_prompt_errors_do_not_trip_the_breaker(self, mock_crew, mock_da, mock_task):
+        model = "openrouter/healthy-model"
+        mock_crew.return_value.kickoff.side_effect = Exception("BadRequestError: context_length_exceeded")
+        state = {'input': 'test', 'hypotheses': [], 'model_name': model}
+        for _ in range(model_health.failure_threshold + 1):
+            debate_node(state)
+        self.assertEqual(model_health.snapshot()[model]['state'], CLOSED)
+        self.assertEqual(model_health.snapshot()[model]['total_failures'], 0)
+
+    @patch('graph.preflight', side_effect=[None, 100])
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_skipped_probe_is_given_back(self, mock_crew, mock_da, mock_task, mock_preflight):
+        mock_crew.return_value.kickoff.return_value = "Debate minutes"
+        model = "openrouter/small-context"
+        breaker = model_health.get(model)
+        for _ in range(model_health.failure_threshold):
+            breaker.record_failure()
+        breaker.opened_at -= breaker.cooldown
+        debate_node({'input': 'test', 'hypotheses': [], 'model_name': model})
+        # Skipped by the pre-flight check while half-open: the next caller may probe it
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow_request())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import time
+import unittest
+from unittest.mock import patch
+from dedup import distinct_hypotheses, estimated_similarity, minhash, prune_duplicates, similarity_matrix
+from graph import dedup_node, debate_node
+
+BASE = ("Coordinated underwater drone swarms can map coral reefs by sharing acoustic position estimates, "
+        "using decentralized consensus so that the loss of a single drone never stops the survey. "
+        "Energy budgets are balanced by rotating the leader role among the drones with the most battery left.")
+# Cross-pollination typically yields such paraphrases: same text, a sentence appended
+NEAR_DUPLICATE = BASE + " Tidal currents are compensated with a shared flow model."
+DIFFERENT = ("Protein misfolding diseases could be screened with cheap microfluidic assays measuring "
+             "aggregation kinetics in patient serum, calibrated against known amyloid standards.")
+
+class TestDedup(unittest.TestCase):
+
+    def test_similarity_estimate(self):
+        self.assertEqual(estimated_similarity(minhash(BASE), minhash(BASE)), 1.0)
+        self.assertGreater(estimated_similarity(minhash(BASE), minhash(NEAR_DUPLICATE)), 0.7)
+        self.assertLess(estimated_similarity(minhash(BASE), minhash(DIFFERENT)), 0.1)
+        self.assertEqual(estimated_similarity(minhash(""), minhash(BASE)), 0.0)
+
+    def test_matrix_is_symmetric(self):
+        matrix = similarity_matrix([BASE, NEAR_DUPLICATE, DIFFERENT])
+        self.assertEqual([matrix[i][i] for i in range(3)], [1.0] * 3)
+        self.assertEqual(matrix[0][1], matrix[1][0])
+
+    def test_merge_keeps_most_detailed(self):
+        hypotheses = [
+            {"expert_name": "A", "hypothesis": BASE},
+            {"expert_name": "B", "hypothesis": NEAR_DUPLICATE},
+            {"expert_name": "C", "hypothesis": DIFFERENT},
+            {"expert_name": "D", "hypothesis": "Error", "failed": True},
+        ]
+        result, report = prune_duplicates(hypotheses, "merge", 0.7)
+        self.assertEqual(result[0]["duplicate_of"], "B")
+        self.assertEqual(result[1]["merged_from"], ["A"])
+        self.assertEqual([h["expert_name"] for h in distinct_hypotheses(result)], ["B", "C"])
+        self.assertEqual(report["experts"], ["A", "B", "C"])
+        self.assertEqual(report["pruned"][0]["expert_name"], "A")
+        self.assertGreater(report["tokens_saved"], 0)
+        # The input is not modified, and flags are recomputed on the next pass
+        self.assertNotIn("duplicate_of", hypotheses[0])
+        result, report = prune_duplicates(result, "drop", 0.99)
+        self.assertEqual(report["pruned"], [])
+        self.assertFalse(any("duplicate_of" in h or "merged_from" in h for h in result))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            prune_duplicates([], "fuzzy")
+
+    def test_cheap_enough(self):
+        started = time.monotonic()
+        similarity_matrix([BASE * 20] * 10)
+        self.assertLess(time.monotonic() - started, 2.0)
+
+    def test_dedup_node_and_debate(self):
+        state = {"input": "Reefs", "hypotheses": [{"expert_name": "A", "hypothesis": BASE}, {"expert_name": "B", "hypothesis": NEAR_DUPLICATE}], "dedup_mode": "off"}
+        self.assertEqual(dedup_node(state), {})
+
+        state.update({"dedup_mode": "merge", "dedup_threshold": 0.7})
+        update = dedup_node(state)
+        self.assertEqual(len(update["dedup_report"]["pruned"]), 1)
+        state.update(update)
+        with patch("graph.run_devils_advocate", return_value="critique") as run:
+            debate_node(state)
+        debated = run.call_args.args[2][0]
+        self.assertEqual([h["expert_name"] for h in debated], ["B"])
+
+if __name__ == '__main__':
+    unittest.main()
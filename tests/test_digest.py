@@ -0,0 +1,68 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+from digest import add_digests, adigest, extractive_digest
+from graph import digest_node
+from token_budget import count_tokens
+
+LONG_HYPOTHESIS = " ".join([
+    "Protein folding is driven by a rugged energy landscape.",
+    "The weather was pleasant during the conference.",
+    "Chaperone proteins smooth the folding energy landscape and prevent misfolding.",
+    "Many participants enjoyed the coffee breaks.",
+    "Misfolding of proteins on a rugged landscape explains aggregation diseases.",
+] * 4)
+
+class TestDigest(unittest.TestCase):
+
+    def test_short_text_is_unchanged(self):
+        self.assertEqual(extractive_digest("A short hypothesis.", 100), "A short hypothesis.")
+
+    def test_extractive_digest_fits_budget_and_keeps_key_sentences(self):
+        digest = extractive_digest(LONG_HYPOTHESIS, 40)
+        self.assertLessEqual(count_tokens(digest), 40)
+        self.assertIn("folding energy landscape", digest)
+        self.assertNotIn("coffee", digest)
+
+    def test_single_long_sentence_is_truncated(self):
+        digest = extractive_digest("word " * 500, 20)
+        self.assertLessEqual(len(digest), 20 * 4 + 2)
+
+    @patch('digest.llm_digest', new_callable=AsyncMock)
+    def test_llm_mode_falls_back_to_extractive(self, mock_llm_digest):
+        mock_llm_digest.side_effect = Exception("429 RateLimitError")
+        digest = asyncio.run(adigest(LONG_HYPOTHESIS, "llm", 60, cache_mode="bypass"))
+        self.assertLessEqual(count_tokens(digest), 60)
+
+    @patch('digest.llm_digest', new_callable=AsyncMock)
+    def test_add_digests_skips_failed_and_digested(self, mock_llm_digest):
+        mock_llm_digest.return_value = "compressed"
+        hypotheses = [
+            {"expert_name": "A", "hypothesis": LONG_HYPOTHESIS},
+            {"expert_name": "B", "hypothesis": LONG_HYPOTHESIS, "digest": "already"},
+            {"expert_name": "C", "hypothesis": "Error: Unable to generate hypothesis.", "failed": True},
+        ]
+        result = asyncio.run(add_digests(hypotheses, "llm", 60, cache_mode="bypass"))
+        self.assertEqual([h.get("digest") for h in result], ["compressed", "already", None])
+        self.assertEqual(mock_llm_digest.await_count, 1)
+
+    @patch('digest.llm_digest', new_callable=AsyncMock)
+    def test_llm_digest_calls_are_accounted(self, mock_llm_digest):
+        mock_llm_digest.return_value = "compressed"
+        state = {"hypotheses": [{"expert_name": "A", "hypothesis": LONG_HYPOTHESIS}], "digest_mode": "llm", "digest_tokens": 60, "cache_mode": "bypass", "iterations": 1}
+        result = asyncio.run(digest_node(state))
+        [record] = result["usage"]
+        self.assertEqual((record["node"], record["expert"], record["iteration"], record["ok"]), ("digest", "A", 1, True))
+
+    def test_digest_node(self):
+        state = {"hypotheses": [{"expert_name": "A", "hypothesis": LONG_HYPOTHESIS}], "digest_mode": "off"}
+        self.assertEqual(asyncio.run(digest_node(state)), {})
+
+        state["digest_mode"] = "extractive"
+        state["digest_tokens"] = 60
+        result = asyncio.run(digest_node(state))
+        self.assertEqual(result["hypotheses"][0]["hypothesis"], LONG_HYPOTHESIS)
+        self.assertLessEqual(count_tokens(result["hypotheses"][0]["digest"]), 60)
+
+if __name__ == '__main__':
+    unittest.main()
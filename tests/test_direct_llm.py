@@ -0,0 +1,75 @@
+import asyncio
+import json
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from direct_llm import acomplete, build_messages, complete, uses_direct_llm
+from models import SynthesisReport
+from model_router import ModelRouter
+from rate_limiter import rate_limiter
+
+def fake_response(content):
+    usage = SimpleNamespace(prompt_tokens=12, completion_tokens=5, total_tokens=17)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+class TestDirectLLM(unittest.TestCase):
+
+    def setUp(self):
+        rate_limiter.reset()
+        # Router statistics persist on disk: keep the mocked calls out of them
+        router = ModelRouter("")
+        for target in ("execution.model_router", "direct_llm.model_router"):
+            patcher = patch(target, router)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.agent = SimpleNamespace(role="Devil's Advocate", goal="Find flaws", backstory="A skeptic.")
+        self.task = SimpleNamespace(description="Critique H1.", expected_output="A critique.")
+
+    def test_build_messages(self):
+        messages = build_messages(self.agent, self.task)
+        self.assertEqual([m["role"] for m in messages], ["system", "user"])
+        self.assertIn("Devil's Advocate", messages[0]["content"])
+        self.assertIn("Find flaws", messages[0]["content"])
+        self.assertIn("Critique H1.", messages[1]["content"])
+        self.assertIn("A critique.", messages[1]["content"])
+
+    def test_uses_direct_llm(self):
+        self.assertTrue(uses_direct_llm({'direct_llm_nodes': ['debate']}, "debate"))
+        self.assertFalse(uses_direct_llm({'direct_llm_nodes': ['debate']}, "synthesis"))
+
+    @patch('direct_llm.litellm.completion')
+    def test_complete_returns_text(self, mock_completion):
+        mock_completion.return_value = fake_response("Critique")
+        result = complete(self.agent, self.task, "meta-llama/llama-3.3-70b-instruct:free", 0.3, 10)
+
+        self.assertEqual(str(result), "Critique")
+        self.assertEqual(result.token_usage["total_tokens"], 17)
+        kwargs = mock_completion.call_args.kwargs
+        self.assertEqual(kwargs["model"], "openrouter/meta-llama/llama-3.3-70b-instruct:free")
+        self.assertEqual(kwargs["temperature"], 0.3)
+        self.assertNotIn("response_format", kwargs)
+
+    @patch('direct_llm.litellm.completion')
+    def test_structured_output_is_validated(self, mock_completion):
+        report = {"solution": "S", "confidence_score": 85, "knowledge_gaps": ["G"]}
+        mock_completion.return_value = fake_response("```json\n" + json.dumps(report) + "\n```")
+        result = complete(self.agent, self.task, "openrouter/m", response_model=SynthesisReport)
+
+        self.assertIs(mock_completion.call_args.kwargs["response_format"], SynthesisReport)
+        self.assertEqual(result.json_dict["confidence_score"], 85)
+        self.assertEqual(json.loads(str(result))["knowledge_gaps"], ["G"])
+
+    @patch('direct_llm.litellm.completion')
+    def test_structured_output_mismatch_raises(self, mock_completion):
+        mock_completion.return_value = fake_response('{"answer": "no solution field"}')
+        with self.assertRaises(ValueError):
+            complete(self.agent, self.task, "openrouter/m", response_model=SynthesisReport)
+
+    @patch('direct_llm.litellm.acompletion', new_callable=AsyncMock)
+    def test_acomplete(self, mock_acompletion):
+        mock_acompletion.return_value = fake_response("Async critique")
+        result = asyncio.run(acomplete(self.agent, self.task, "openrouter/m"))
+        self.assertEqual(str(result), "Async critique")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,29 @@
 
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+from circuit_breaker import model_health
+from literature_index import LiteratureIndex
+from model_router import ModelRouter
+from rate_limiter import rate_limiter
 from graph import recruit_node, hypothesis_node, debate_node, synthesis_node
 
 class TestErrorHandling(unittest.TestCase):
 
+    def setUp(self):
+        # Circuit breakers and rate limiters are process-wide: start every test with healthy models
+        model_health.reset()
+        rate_limiter.reset()
+        # Router statistics persist on disk: keep the mocked calls out of them
+        router = ModelRouter("")
+        for target in ("execution.model_router", "direct_llm.model_router"):
+            patcher = patch(target, router)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Experts must not open (or create) the default literature index
+        patcher = patch("agents.literature_index", LiteratureIndex(""))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch('time.sleep', return_value=None)
     @patch('graph.recruit_task')
     @patch('graph.RecruiterAgent')
@@ -24,7 +43,7 @@ class TestErrorHandling(unittest.TestCase):
         self.assertEqual(len(result['experts']), 4)
         self.assertEqual(result['experts'][0]['name'], "Expert A")
 
-    @patch('time.sleep', return_value=None)
+    @patch('asyncio.sleep', new_callable=AsyncMock)
     @patch('graph.hypothesis_task')
     @patch('graph.create_expert_agent')
     @patch('graph.Crew')
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+import execution
+from execution import akickoff_crew, crew_spec, gather_with_quorum, resolve_quorum
+from llm_cache import CachedResponse
+from retry_policy import FatalLLMError
+from utils import async_retry_llm
+
+class TestExecution(unittest.TestCase):
+
+    def test_thread_mode_uses_dedicated_executor(self):
+        crew = MagicMock()
+        crew.kickoff.side_effect = lambda: threading.current_thread().name
+
+        result = asyncio.run(akickoff_crew(crew, "thread"))
+        self.assertTrue(result.startswith("nexus-llm"))
+
+    def test_executor_is_sized_from_settings(self):
+        with patch("execution._executor", None), patch("execution.DEFAULT_LLM_WORKERS", 3):
+            executor = execution.get_llm_executor()
+            self.assertEqual(executor._max_workers, 3)
+        executor.shutdown(wait=False)
+
+    def test_native_mode_uses_akickoff(self):
+        crew = MagicMock()
+        crew.akickoff = AsyncMock(return_value="native result")
+
+        result = asyncio.run(akickoff_crew(crew, "native"))
+        self.assertEqual(result, "native result")
+        crew.kickoff.assert_not_called()
+
+    def test_failure_string_raises(self):
+        crew = MagicMock()
+        crew.akickoff = AsyncMock(return_value="Task Failed: boom")
+        with self.assertRaises(Exception):
+            asyncio.run(akickoff_crew(crew, "native"))
+
+    def test_timeout_bounds_thread_mode(self):
+        crew = MagicMock()
+        crew.kickoff.side_effect = lambda: time.sleep(1)
+        with self.assertRaises(TimeoutError):
+            asyncio.run(akickoff_crew(crew, "thread", timeout=0.1))
+
+    def test_process_mode_requires_spec(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(akickoff_crew(MagicMock(), "process"))
+
+    @patch('execution.get_process_pool')
+    def test_process_mode_runs_spec_in_pool(self, mock_get_pool):
+        pool = MagicMock()
+        pool.arun = AsyncMock(return_value='{"raw": "remote hypothesis", "json_dict": null}')
+        mock_get_pool.return_value = pool
+        crew = MagicMock()
+        spec = crew_spec({"name": "E"}, "hypothesis_task", ["q"], "model-a")
+
+        result = asyncio.run(akickoff_crew(crew, "process", spec=spec, timeout=30))
+        self.assertIsInstance(result, CachedResponse)
+        self.assertEqual(str(result), "remote hypothesis")
+        crew.kickoff.assert_not_called()
+        self.assertEqual(pool.arun.await_args.args[1], (spec,))
+        self.assertEqual(pool.arun.await_args.kwargs["timeout"], 30)
+
+    @patch('time.sleep')
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    def test_async_retry_does_not_retry_timeouts(self, mock_async_sleep, mock_time_sleep):
+        calls = []
+
+        @async_retry_llm
+        async def hung():
+            calls.append(1)
+            raise TimeoutError("killed")
+
+        with self.assertRaises(TimeoutError):
+            asyncio.run(hung())
+        self.assertEqual(len(calls), 1)
+
+    @patch('time.sleep')
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    def test_async_retry_awaits_sleep(self, mock_async_sleep, mock_time_sleep):
+        calls = []
+
+        @async_retry_llm
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise Exception("429 RateLimitError")
+            return "ok"
+
+        self.assertEqual(asyncio.run(flaky()), "ok")
+        self.assertEqual(mock_async_sleep.await_count, 2)
+        mock_time_sleep.assert_not_called()
+
+    def test_resolve_quorum(self):
+        self.assertEqual(resolve_quorum(None, 6), 6)
+        self.assertEqual(resolve_quorum(0.8, 6), 5)
+        self.assertEqual(resolve_quorum(4, 6), 4)
+        self.assertEqual(resolve_quorum(10, 6), 6)
+        self.assertEqual(resolve_quorum(1.0, 6), 6)
+
+    def test_quorum_after_deadline_cancels_stragglers(self):
+        cancelled = []
+
+        async def expert(delay, value):
+            try:
+                await asyncio.sleep(delay)
+                return value
+            except asyncio.CancelledError:
+                cancelled.append(value)
+                raise
+
+        async def run():
+            coros = [expert(0.01, "a"), expert(0.02, "b"), expert(5, "slow")]
+            return await gather_with_quorum(coros, quorum=2, deadline=0.1)
+
+        start = time.monotonic()
+        results = asyncio.run(run())
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertEqual(results, ["a", "b", None])
+        self.assertEqual(cancelled, ["slow"])
+
+    def test_deadline_waits_until_quorum(self):
+        async def expert(delay, value):
+            await asyncio.sleep(delay)
+            return value
+
+        async def run():
+            coros = [expert(0.01, {"failed": True}), expert(0.2, {"ok": 1}), expert(5, {"ok": 2})]
+            return await gather_with_quorum(coros, quorum=1, deadline=0.05, is_success=lambda r: not r.get("failed"))
+
+        results = asyncio.run(run())
+        # The failed result does not count: the gather waits for the second expert
+        self.assertEqual(results[:2], [{"failed": True}, {"ok": 1}])
+        self.assertIsNone(results[2])
+
+    def test_no_deadline_waits_for_all(self):
+        async def expert(delay, value):
+            await asyncio.sleep(delay)
+            return value
+
+        async def run():
+            return await gather_with_quorum([expert(0.05, 1), expert(0.01, 2)])
+
+        self.assertEqual(asyncio.run(run()), [1, 2])
+
+    def test_quorum_without_deadline_returns_early(self):
+        async def expert(delay, value):
+            await asyncio.sleep(delay)
+            return value
+
+        async def run():
+            coros = [expert(0.01, 1), expert(0.02, 2), expert(0.03, 3), expert(5, 4)]
+            return await gather_with_quorum(coros, quorum=3)
+
+        start = time.monotonic()
+        self.assertEqual(asyncio.run(run()), [1, 2, 3, None])
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_fatal_error_aborts_at_once(self):
+        async def fatal():
+            await asyncio.sleep(0.01)
+            raise FatalLLMError("Invalid API key")
+
+        async def run():
+            return await gather_with_quorum([fatal(), asyncio.sleep(5)], deadline=10)
+
+        start = time.monotonic()
+        with self.assertRaises(FatalLLMError):
+            asyncio.run(run())
+        self.assertLess(time.monotonic() - start, 2)
+
+if __name__ == '__main__':
+    unittest.main()
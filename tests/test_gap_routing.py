@@ -0,0 +1,28 @@
+import unittest
+from gap_routing import gap_relevance, route_gaps
+
+EXPERTS = [
+    {"name": "Bio", "role": "Biologist", "skill": "Protein folding", "bias": "Empirical", "backstory": "Molecular biology lab."},
+    {"name": "Eco", "role": "Economist", "skill": "Market design", "bias": "Rational agents", "backstory": "Pricing and incentives."},
+    {"name": "CS", "role": "Computer Scientist", "skill": "Optimization algorithms", "bias": "Formal", "backstory": "Graph search."},
+]
+
+class TestGapRouting(unittest.TestCase):
+
+    def test_relevance_uses_word_prefixes(self):
+        self.assertGreater(gap_relevance("Missing biological evidence on protein stability", EXPERTS[0]), 0)
+        self.assertEqual(gap_relevance("Missing biological evidence", EXPERTS[1]), 0)
+
+    def test_gaps_go_to_relevant_experts_only(self):
+        routing = route_gaps(["No data on protein misfolding rates", "Pricing incentives are unclear"], EXPERTS, per_gap=1)
+        self.assertEqual(routing, {"Bio": ["No data on protein misfolding rates"], "Eco": ["Pricing incentives are unclear"]})
+
+    def test_unmatched_gap_goes_to_everyone(self):
+        routing = route_gaps(["Zzz qwerty"], EXPERTS)
+        self.assertEqual(sorted(routing), ["Bio", "CS", "Eco"])
+
+    def test_no_gaps(self):
+        self.assertEqual(route_gaps([], EXPERTS), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,32 @@
 import unittest
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 import json
-from graph import recruit_node, hypothesis_node, debate_node, synthesis_node, check_confidence
+from circuit_breaker import model_health
+from agents import get_alpha_evolve_expert
+from rate_limiter import rate_limiter
+from graph import recruit_node, hypothesis_node, speculate_node, cancel_speculations, debate_node, synthesis_node, check_confidence, _speculations
+from models import SynthesisReport
+from literature_index import LiteratureIndex
+from model_router import ModelRouter
 
 class TestGraph(unittest.TestCase):
 
+    def setUp(self):
+        # Circuit breakers and rate limiters are process-wide: start every test with healthy models
+        model_health.reset()
+        rate_limiter.reset()
+        # Router statistics persist on disk: keep the mocked calls out of them
+        router = ModelRouter("")
+        for target in ("execution.model_router", "direct_llm.model_router"):
+            patcher = patch(target, router)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Experts must not open (or create) the default literature index
+        patcher = patch("agents.literature_index", LiteratureIndex(""))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @patch('graph.recruit_task')
     @patch('graph.RecruiterAgent')
     @patch('graph.Crew')
@@ -78,6 +100,85 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(result['hypotheses'][0]['expert_name'], 'Alice')
         self.assertEqual(result['hypotheses'][0]['hypothesis'], "Hypothesis content")
 
+    @patch('graph.akickoff_crew', new_callable=AsyncMock)
+    @patch('graph.revision_task')
+    @patch('graph.hypothesis_task')
+    @patch('graph.create_expert_agent')
+    @patch('graph.Crew')
+    def test_hypothesis_node_incremental(self, mock_crew, mock_create_expert, mock_hypothesis_task, mock_revision_task, mock_kickoff):
+        mock_kickoff.return_value = "Revised hypothesis"
+        experts = [
+            {"name": "Bio", "role": "Biologist", "bias": "Empirical", "skill": "Protein folding", "backstory": "Lab."},
+            {"name": "Eco", "role": "Economist", "bias": "Rational", "skill": "Market design", "backstory": "Pricing."},
+        ]
+        state = {
+            'input': 'test',
+            'experts': experts,
+            'hypotheses': [
+                {"expert_name": "Bio", "hypothesis": "H Bio", "digest": "D Bio"},
+                {"expert_name": "Eco", "hypothesis": "H Eco", "digest": "D Eco"},
+            ],
+            'knowledge_gaps': ["Protein misfolding rates are unknown"],
+            'iterations': 1,
+            'iteration_mode': 'incremental'
+        }
+
+        result = asyncio.run(hypothesis_node(state))
+
+        bio, eco = result['hypotheses']
+        self.assertEqual(bio['hypothesis'], "Revised hypothesis")
+        self.assertTrue(bio['revised'])
+        self.assertEqual(eco, {"expert_name": "Eco", "hypothesis": "H Eco", "digest": "D Eco"})
+        self.assertEqual(mock_kickoff.await_count, 1)
+        mock_hypothesis_task.assert_not_called()
+        self.assertEqual(mock_revision_task.call_args.args[1:3], ("H Bio", ["Protein misfolding rates are unknown"]))
+
+    @patch('graph.akickoff_crew', new_callable=AsyncMock)
+    @patch('graph.hypothesis_task')
+    @patch('graph.create_expert_agent')
+    @patch('graph.Crew')
+    def test_speculative_fixed_expert(self, mock_crew, mock_create_expert, mock_hypothesis_task, mock_kickoff):
+        mock_kickoff.return_value = "Hypothesis content"
+        fixed = get_alpha_evolve_expert()
+        alice = {"name": "Alice", "role": "Scientist", "bias": "None", "skill": "Physics", "backstory": "Lab."}
+        state = {'input': 'test', 'experts': [], 'iterations': 0, 'speculative_experts': True}
+
+        async def run():
+            speculation = await speculate_node(state)
+            # The fixed expert is already running before the panel is known
+            await asyncio.sleep(0)
+            self.assertEqual(mock_kickoff.await_count, 1)
+            return await hypothesis_node({**state, **speculation, 'experts': [alice, fixed]})
+
+        result = asyncio.run(run())
+
+        self.assertEqual([h['expert_name'] for h in result['hypotheses']], ["Alice", fixed['name']])
+        # One call per expert: the speculative hypothesis was reused, not regenerated
+        self.assertEqual(mock_kickoff.await_count, 2)
+
+    def test_speculation_disabled(self):
+        self.assertEqual(asyncio.run(speculate_node({'input': 'test', 'speculative_experts': False})), {})
+
+    @patch('graph.generate_hypothesis')
+    def test_unused_speculations_are_cancelled_when_the_run_ends(self, mock_generate):
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        mock_generate.side_effect = slow
+        config = {"configurable": {"thread_id": "run-x"}}
+
+        async def run():
+            speculation = await speculate_node({'input': 'test', 'iterations': 0, 'speculative_experts': True}, config)
+            tasks = [task for _, task, _ in _speculations[speculation['speculation_id']].values()]
+            # The recruiter failed: the hypothesis node never takes the tasks
+            cancel_speculations(config)
+            await asyncio.sleep(0)
+            return speculation, tasks
+
+        speculation, tasks = asyncio.run(run())
+        self.assertNotIn(speculation['speculation_id'], _speculations)
+        self.assertTrue(all(task.cancelled() for task in tasks))
+
     @patch('graph.debate_task')
     @patch('graph.DevilsAdvocate')
     @patch('graph.Crew')
@@ -94,6 +195,55 @@ class TestGraph(unittest.TestCase):
         result = debate_node(state)
         self.assertEqual(result['debate_minutes'], "Debate minutes")
 
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_debate_node_drops_failed_hypotheses(self, mock_crew, mock_devils_advocate, mock_task):
+        mock_crew.return_value.kickoff.return_value = "Debate minutes"
+        state = {
+            'input': 'test',
+            'hypotheses': [
+                {'expert_name': 'Alice', 'hypothesis': 'H1'},
+                {'expert_name': 'Bob', 'hypothesis': 'Error: Unable to generate hypothesis.', 'failed': True}
+            ]
+        }
+
+        debate_node(state)
+        debated = mock_task.call_args[0][1]
+        self.assertEqual([h['expert_name'] for h in debated], ['Alice'])
+
+    @patch('graph.debate_reduce_task')
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_debate_node_map_reduce(self, mock_crew, mock_devils_advocate, mock_task, mock_reduce_task):
+        mock_crew.return_value.kickoff.return_value = "Critique"
+        hypotheses = [{"expert_name": f"E{i}", "hypothesis": f"H{i}"} for i in range(4)]
+        state = {'input': 'test', 'hypotheses': hypotheses, 'debate_mode': 'map_reduce', 'debate_shard_size': 2}
+
+        result = debate_node(state)
+
+        self.assertEqual(result['debate_minutes'], "Critique")
+        shards = sorted([[h['expert_name'] for h in c.args[1]] for c in mock_task.call_args_list])
+        self.assertEqual(shards, [["E0", "E1"], ["E2", "E3"]])
+        critiques = mock_reduce_task.call_args.args[1]
+        self.assertEqual([c['experts'] for c in critiques], [["E0", "E1"], ["E2", "E3"]])
+
+    @patch('graph.debate_reduce_task')
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_debate_node_map_reduce_keeps_critiques_when_reduce_fails(self, mock_crew, mock_devils_advocate, mock_task, mock_reduce_task):
+        mock_crew.return_value.kickoff.return_value = "Critique"
+        mock_reduce_task.side_effect = Exception("context length exceeded")
+        hypotheses = [{"expert_name": f"E{i}", "hypothesis": f"H{i}"} for i in range(3)]
+        state = {'input': 'test', 'hypotheses': hypotheses, 'debate_mode': 'map_reduce', 'debate_shard_size': 2}
+
+        result = debate_node(state)
+
+        self.assertIn("### E0, E1\nCritique", result['debate_minutes'])
+        self.assertIn("### E2\nCritique", result['debate_minutes'])
+
     @patch('graph.synthesis_task')
     @patch('graph.Synthesizer')
     @patch('graph.Crew')
@@ -115,6 +265,28 @@ class TestGraph(unittest.TestCase):
         self.assertEqual(result['confidence_score'], 85.5)
         self.assertEqual(result['iterations'], 1)
 
+    @patch('graph.complete')
+    @patch('graph.synthesis_task')
+    @patch('graph.Synthesizer')
+    @patch('graph.Crew')
+    def test_synthesis_node_direct_llm(self, mock_crew, mock_synthesizer, mock_task, mock_complete):
+        mock_complete.return_value = '{"solution": "S", "confidence_score": 90, "knowledge_gaps": [], "visualization_code": ""}'
+
+        state = {
+            'input': 'test',
+            'debate_minutes': 'minutes',
+            'hypotheses': [],
+            'iterations': 0,
+            'direct_llm_nodes': ['synthesis']
+        }
+
+        result = synthesis_node(state)
+
+        mock_crew.assert_not_called()
+        self.assertIs(mock_complete.call_args.args[-1], SynthesisReport)
+        self.assertEqual(result['final_solution'], "S")
+        self.assertEqual(result['confidence_score'], 90)
+
     def test_check_confidence(self):
         # Test end condition (high confidence)
         state = {'confidence_score': 100, 'iterations': 1}
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from http_client import PooledSession, http_stats
+from tools import HalTool, get_arxiv_client
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    active = 0
+    peak = 0
+    ports = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            cls.ports.add(self.client_address[1])
+        time.sleep(0.1)
+        with cls.lock:
+            cls.active -= 1
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class TestHttpClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        SlowHandler.peak = 0
+        SlowHandler.ports = set()
+
+    def test_per_host_limit(self):
+        session = PooledSession(per_host=2)
+        threads = [threading.Thread(target=lambda: session.get(self.url)) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertLessEqual(SlowHandler.peak, 2)
+        self.assertIn("127.0.0.1", http_stats.snapshot())
+
+    def test_connections_are_reused(self):
+        session = PooledSession()
+        for _ in range(3):
+            self.assertEqual(session.get(self.url).json(), {"ok": True})
+        # Keep-alive: a single TCP connection served the three requests
+        self.assertEqual(len(SlowHandler.ports), 1)
+
+    def test_default_timeout(self):
+        session = PooledSession(timeout=(1, 2))
+        with patch("requests.Session.request") as request:
+            request.return_value.status_code = 200
+            session.get(self.url)
+        self.assertEqual(request.call_args.kwargs["timeout"], (1, 2))
+
+    def test_arxiv_client_keeps_api_delay(self):
+        # The Arxiv API terms ask for one request every 3 seconds
+        self.assertEqual(get_arxiv_client().delay_seconds, 3)
+
+    def test_tools_use_pooled_session(self):
+        self.assertIsInstance(get_arxiv_client()._session, PooledSession)
+        with patch("tools.get_session") as get_session, patch("tools.literature_index"):
+            get_session.return_value.get.return_value.json.return_value = {"response": {"docs": [{"title_s": ["T"], "uri_s": "u"}]}}
+            self.assertIn("Titre: T", HalTool()._search("swarm"))
+        get_session.return_value.get.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
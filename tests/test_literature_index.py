@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from literature_index import LiteratureIndex
+from utils import tokenize
+from tools import HalTool, LocalLiteratureTool
+from agents import expert_tools
+
+DOCS = [
+    {"title": "Swarm coordination of underwater drones", "abstract": "Decentralized control for autonomous underwater vehicles.", "authors": ["A. Diver"], "link": "u1"},
+    {"title": "Protein folding with deep learning", "abstract": "Structure prediction from sequences.", "authors": "B. Fold", "link": "u2"},
+    {"title": "Market design for spectrum auctions", "abstract": "Auction theory applied to drones and radio spectrum.", "link": "u3"},
+]
+
+class TestLiteratureIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = LiteratureIndex(os.path.join(self.tmp.name, "index.sqlite"))
+
+    def tearDown(self):
+        self.index._conn and self.index._conn.close()
+        self.tmp.cleanup()
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Les Équations de la Chaleur"), ["equations", "chaleur"])
+
+    def test_bm25_ranking(self):
+        self.assertEqual(self.index.add(DOCS, source="test"), 3)
+        results = self.index.search("underwater drones swarm")
+        self.assertEqual(results[0]["link"], "u1")
+        self.assertEqual(results[0]["authors"], "A. Diver")
+        # The auction paper only matches "drones"
+        self.assertEqual([r["link"] for r in results], ["u1", "u3"])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+        self.assertEqual(self.index.search("quantum gravity"), [])
+
+    def test_duplicates_are_skipped(self):
+        self.index.add(DOCS)
+        self.assertEqual(self.index.add(DOCS[:1]), 0)
+        self.assertEqual(len(self.index), 3)
+
+    def test_import_jsonl(self):
+        path = os.path.join(self.tmp.name, "dump.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"id": "2401.00001", "title": "Heat equation solvers", "abstract": "Finite elements."}) + "\n\n")
+        self.assertEqual(self.index.import_jsonl(path), 1)
+        self.assertEqual(self.index.search("heat solvers")[0]["link"], "https://arxiv.org/abs/2401.00001")
+
+    def test_disabled(self):
+        index = LiteratureIndex("")
+        self.assertEqual(index.add(DOCS), 0)
+        self.assertEqual(index.search("drones"), [])
+
+    def test_tools_harvest_and_search(self):
+        with patch("tools.literature_index", self.index), patch("tools.get_session") as get_session:
+            get_session.return_value.get.return_value.json.return_value = {"response": {"docs": [
+                {"title_s": ["Ocean swarms"], "abstract_s": ["Long abstract " * 50], "uri_s": "hal-1"}
+            ]}}
+            HalTool()._search("ocean swarms")
+            result = LocalLiteratureTool()._run("ocean swarm")
+        self.assertIn("Ocean swarms", result)
+        self.assertIn("Source: hal", result)
+        # The full abstract is indexed, not the truncated observation
+        self.assertGreater(len(self.index.search("ocean")[0]["abstract"]), 300)
+
+    def test_researchers_keep_local_index_offline(self):
+        self.index.add(DOCS)
+        librarian = {"name": "Research Librarian", "role": "Research Librarian"}
+        with patch("agents.literature_index", self.index):
+            tools = expert_tools(librarian, web_search_enabled=False)
+            self.assertEqual([type(t) for t in tools], [LocalLiteratureTool])
+            self.assertEqual(expert_tools({"name": "Eco", "role": "Economist"}, web_search_enabled=False), [])
+
+    def test_missing_index_is_not_created(self):
+        librarian = {"name": "Research Librarian", "role": "Research Librarian"}
+        with patch("agents.literature_index", self.index):
+            self.assertEqual(expert_tools(librarian, web_search_enabled=False), [])
+        self.assertFalse(os.path.exists(self.index.path))
+
+if __name__ == '__main__':
+    unittest.main()
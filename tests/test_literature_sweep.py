@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from literature_index import LiteratureIndex
+from tools import ARXIV_LABELS, HAL_LABELS, HalTool, LiteratureSweepTool, format_records, merge_results, parse_records
+from tool_cache import tool_cache
+from agents import expert_tools
+
+class TestLiteratureSweep(unittest.TestCase):
+
+    def setUp(self):
+        tool_cache.reset()
+
+    def tearDown(self):
+        tool_cache.reset()
+
+    def test_merge_deduplicates_and_ranks(self):
+        merged = merge_results([
+            ("arxiv", [{"title": "Ocean Swarms", "abstract": "short", "link": "a1"}, {"title": "Other", "link": "a2"}]),
+            ("hal", [{"title": "ocean swarms!", "abstract": "a longer abstract", "link": "h1"}]),
+        ])
+        self.assertEqual([d["title"] for d in merged], ["Ocean Swarms", "Other"])
+        self.assertEqual(merged[0]["sources"], ["arxiv", "hal"])
+        self.assertEqual(merged[0]["abstract"], "a longer abstract")
+
+    def test_sweep_fans_out_concurrently(self):
+        barrier = threading.Barrier(4, timeout=5)
+
+        def fetcher(source):
+            def fetch(query):
+                # Every search waits for the others: passes only if they all run at once
+                barrier.wait()
+                return [{"title": f"{source} {query}", "abstract": "", "link": f"{source}:{query}"}]
+            return fetch
+
+        fetchers = {source: fetcher(source) for source in ("arxiv", "hal")}
+        started = time.monotonic()
+        with patch("tools.sweep_fetchers", return_value=fetchers):
+            result = LiteratureSweepTool()._run(queries=["swarms", "drones", "swarms"], sources=["arxiv", "HAL", "unknown"])
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result.count("Title:"), 4)
+        self.assertIn("Sources: hal", result)
+
+    def test_sweep_reports_source_errors(self):
+        def failing(query):
+            raise ConnectionError("down")
+
+        fetchers = {"arxiv": lambda q: [{"title": "Paper", "link": "a"}], "hal": failing}
+        with patch("tools.sweep_fetchers", return_value=fetchers):
+            result = LiteratureSweepTool()._run(queries=["swarms"], sources=["arxiv", "hal"])
+        self.assertIn("Title: Paper", result)
+        self.assertIn("⚠️ hal (swarms): down", result)
+
+    def test_sweep_reuses_the_search_tool_cache(self):
+        with patch("tools.literature_index", LiteratureIndex("")), patch("tools.get_session") as get_session:
+            get_session.return_value.get.return_value.json.return_value = {"response": {"docs": [
+                {"title_s": ["Ocean\n  swarms"], "authFullName_s": ["A. Diver"], "abstract_s": ["Long abstract " * 50], "uri_s": "hal-1"}
+            ]}}
+            HalTool()._run("ocean swarms")
+            result = LiteratureSweepTool()._run(queries=["ocean swarms"], sources=["hal"])
+        # The expert's HAL search is served again, not fetched under another key
+        self.assertEqual(get_session.return_value.get.call_count, 1)
+        self.assertIn("Title: Ocean swarms", result)
+        self.assertIn("Authors: A. Diver", result)
+
+    def test_records_round_trip(self):
+        records = [{"title": "Ocean swarms", "authors": "A. Diver", "abstract": "Drones at sea.", "link": "hal-1"}]
+        for labels in (ARXIV_LABELS, HAL_LABELS):
+            self.assertEqual(parse_records("\n".join(format_records(records, labels)), labels), records)
+        self.assertEqual(parse_records("Aucun résultat trouvé sur HAL.", HAL_LABELS), [])
+
+    def test_researchers_get_the_sweep(self):
+        with patch("agents.literature_index", LiteratureIndex("")):
+            tools = expert_tools({"name": "Research Librarian", "role": "Research Librarian"})
+        self.assertIn(LiteratureSweepTool, [type(t) for t in tools])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+from llm_cache import LLMCache, make_cache_key, serialize_result
+
+class TestLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = LLMCache(path=os.path.join(self.tmpdir.name, "cache.sqlite"))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_normalizes_prompt(self):
+        k1 = make_cache_key("Hello   world\n", "m", 0.7, ["B", "A"])
+        k2 = make_cache_key("Hello world", "m", 0.7, ["A", "B"])
+        self.assertEqual(k1, k2)
+        self.assertNotEqual(k1, make_cache_key("Hello world", "m", 0.2, ["A", "B"]))
+        self.assertNotEqual(k1, make_cache_key("Hello world", "other", 0.7, ["A", "B"]))
+
+    def test_read_through_hit(self):
+        compute = MagicMock(return_value="answer")
+        self.assertEqual(self.cache.call("k", compute, mode="read_through"), "answer")
+        cached = self.cache.call("k", compute, mode="read_through")
+        self.assertEqual(str(cached), "answer")
+        self.assertEqual(compute.call_count, 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_write_only_and_bypass_call_upstream(self):
+        compute = MagicMock(return_value="answer")
+        self.cache.call("k", compute, mode="write_only")
+        self.cache.call("k", compute, mode="write_only")
+        self.cache.call("k", compute, mode="bypass")
+        self.assertEqual(compute.call_count, 3)
+        # write_only stored the response
+        self.assertIsNotNone(self.cache.get("k"))
+
+    def test_ttl_expiry(self):
+        self.cache.ttl = 0.05
+        self.cache.put("k", serialize_result("old"))
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get("k"))
+
+    def test_lru_eviction(self):
+        self.cache.max_entries = 2
+        self.cache.put("a", serialize_result("A"))
+        self.cache.put("b", serialize_result("B"))
+        self.cache.get("a")  # 'b' becomes least recently used
+        self.cache.put("c", serialize_result("C"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("b"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_json_dict_round_trip(self):
+        result = MagicMock()
+        result.json_dict = {"experts": [{"name": "Alice"}]}
+        result.__str__.return_value = "raw"
+        self.cache.call("k", lambda: result, mode="read_through")
+        cached = self.cache.call("k", lambda: None, mode="read_through")
+        self.assertEqual(cached.json_dict, {"experts": [{"name": "Alice"}]})
+        self.assertIsNone(cached.pydantic)
+
+    def test_concurrent_requests_are_coalesced(self):
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "shared"
+
+        async def run():
+            return await asyncio.gather(*(self.cache.acall("k", upstream, mode="read_through") for _ in range(5)))
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([str(r) for r in results], ["shared"] * 5)
+        self.assertEqual(self.cache.stats()['coalesced'], 4)
+
+    def test_failed_write_returns_fresh_response(self):
+        self.cache.put = MagicMock(side_effect=sqlite3.OperationalError("database is locked"))
+        self.assertEqual(self.cache.call("k", lambda: "answer", mode="write_only"), "answer")
+        self.assertEqual(self.cache._inflight, {})
+
+    def test_leader_cancelled_while_storing_releases_key(self):
+        def slow_put(key, payload):
+            time.sleep(0.2)
+
+        self.cache.put = slow_put
+
+        async def upstream():
+            return "answer"
+
+        async def run():
+            leader = asyncio.ensure_future(self.cache.acall("k", upstream, mode="write_only"))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return await asyncio.wait_for(self.cache.acall("k", upstream, mode="write_only"), timeout=2)
+
+        self.assertEqual(asyncio.run(run()), "answer")
+        self.assertEqual(self.cache._inflight, {})
+
+    def test_followers_of_cancelled_leader_recompute(self):
+        calls = []
+
+        async def upstream():
+            calls.append(1)
+            await asyncio.sleep(0.1 if len(calls) == 1 else 0)
+            return "answer"
+
+        async def run():
+            leader = asyncio.ensure_future(self.cache.acall("k", upstream, mode="read_through"))
+            await asyncio.sleep(0.01)
+            follower = asyncio.ensure_future(self.cache.acall("k", upstream, mode="read_through"))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await asyncio.wait_for(follower, timeout=2)
+
+        self.assertEqual(str(asyncio.run(run())), "answer")
+        self.assertEqual(len(calls), 2)
+
+if __name__ == '__main__':
+    unittest.main()
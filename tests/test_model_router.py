@@ -0,0 +1,110 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from model_router import ModelRouter, order_models, completion_tokens
+from execution import kickoff_crew
+from graph import get_models_to_try, FALLBACK_MODELS
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestModelRouter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "router.json")
+        self.clock = FakeClock()
+        self.router = ModelRouter(self.path, alpha=0.5, exploration=0.0, half_life=600, clock=self.clock)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fastest_healthy_model_first(self):
+        self.router.record("slow", 20.0, True, 400)
+        self.router.record("fast", 5.0, True, 400)
+        self.assertEqual(self.router.rank(["slow", "fast", "unseen"]), ["fast", "slow", "unseen"])
+
+    def test_failing_model_goes_last(self):
+        self.router.record("primary", 2.0, True)
+        for _ in range(3):
+            self.router.record("primary", 1.0, False)
+        self.router.record("backup", 10.0, True)
+        self.assertEqual(self.router.rank(["primary", "backup", "unseen"]), ["backup", "unseen", "primary"])
+
+    def test_failure_record_fades(self):
+        for _ in range(3):
+            self.router.record("primary", 1.0, False)
+        self.assertLess(self.router.success_rate(self.router._stats["primary"]), 0.5)
+        self.clock.now += 3 * 600
+        self.assertGreater(self.router.success_rate(self.router._stats["primary"]), 0.5)
+
+    def test_exploration_promotes_stalest_model(self):
+        router = ModelRouter("", exploration=1.0, clock=self.clock, rng=random.Random(0))
+        router.record("a", 1.0, True)
+        self.clock.now += 10
+        router.record("b", 2.0, True)
+        # "c" was never observed: it is the stalest
+        self.assertEqual(router.rank(["a", "b", "c"])[0], "c")
+        self.assertEqual(router.rank(["a", "b", "c"], explore=False), ["a", "b", "c"])
+
+    def test_state_persists_across_instances(self):
+        self.router.record("m", 3.0, True, 300)
+        reloaded = ModelRouter(self.path, clock=self.clock)
+        snapshot = reloaded.snapshot()
+        self.assertEqual(snapshot["m"]["calls"], 1)
+        self.assertEqual(snapshot["m"]["tokens_per_s"], 100.0)
+
+    def test_writes_are_debounced(self):
+        router = ModelRouter(self.path, save_interval=3600, clock=self.clock)
+        router.record("m", 1.0, True)
+        router.record("m", 1.0, True)
+        self.assertEqual(ModelRouter(self.path).snapshot()["m"]["calls"], 1)
+        router.flush()
+        self.assertEqual(ModelRouter(self.path).snapshot()["m"]["calls"], 2)
+
+    def test_observe_records_failures(self):
+        with self.assertRaises(ValueError):
+            with self.router.observe("m"):
+                raise ValueError("boom")
+        self.assertEqual(self.router.snapshot()["m"]["failures"], 1)
+
+    def test_completion_tokens(self):
+        result = MagicMock()
+        result.token_usage = {"completion_tokens": 42}
+        self.assertEqual(completion_tokens(result), 42)
+        self.assertGreater(completion_tokens("a reported answer without usage"), 0)
+
+class TestRoutingModes(unittest.TestCase):
+
+    def test_static_mode_keeps_selected_model_first(self):
+        models = get_models_to_try({"model_name": "openrouter/custom", "model_routing": "static"})
+        self.assertEqual(models, ["openrouter/custom"] + FALLBACK_MODELS)
+
+    def test_adaptive_mode_uses_router(self):
+        with patch("model_router.model_router.rank", side_effect=lambda models: list(reversed(models))) as rank:
+            models = get_models_to_try({"model_name": "openrouter/custom", "model_routing": "adaptive"})
+        rank.assert_called_once()
+        self.assertEqual(models[-1], "openrouter/custom")
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            order_models(["a"], "fastest")
+
+    def test_kickoff_reports_to_router(self):
+        crew = MagicMock()
+        crew.kickoff.return_value = "A valid answer"
+        with patch("execution.model_router.record") as record:
+            kickoff_crew(crew, "openrouter/m")
+        model, latency, success, tokens = record.call_args[0]
+        self.assertEqual(model, "openrouter/m")
+        self.assertTrue(success)
+        self.assertGreater(tokens, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from accounting import NodeUsage, usage_report
+from model_tiers import node_tier, tier_chain, TIER_MODELS
+from model_router import ModelRouter
+from graph import get_models_to_try, debate_node, FALLBACK_MODELS
+
+class TestModelTiers(unittest.TestCase):
+
+    def setUp(self):
+        # Router statistics persist on disk: keep the mocked calls out of them
+        router = ModelRouter("")
+        for target in ("execution.model_router", "direct_llm.model_router"):
+            patcher = patch(target, router)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_untiered_node_uses_default_chain(self):
+        state = {"model_name": "openrouter/custom", "node_tiers": {"debate": "strong"}}
+        self.assertEqual(get_models_to_try(state, "recruit"), ["openrouter/custom"] + FALLBACK_MODELS)
+
+    def test_tiered_node_uses_its_chain(self):
+        state = {"model_name": "openrouter/custom", "node_tiers": {"recruit": "fast"}}
+        self.assertEqual(get_models_to_try(state, "recruit"), TIER_MODELS["fast"])
+
+    def test_state_overrides_tier_chain(self):
+        state = {"node_tiers": {"synthesis": "strong"}, "tier_models": {"strong": ["openrouter/big"]}}
+        self.assertEqual(tier_chain(state, "strong"), ["openrouter/big"])
+        self.assertEqual(get_models_to_try(state, "synthesis"), ["openrouter/big"])
+
+    def test_unknown_tier(self):
+        with self.assertRaises(ValueError):
+            node_tier({"node_tiers": {"debate": "huge"}}, "debate")
+
+    def test_usage_is_reported_per_tier(self):
+        state = {"node_tiers": {"recruit": "fast", "synthesis": "strong"}}
+        records = []
+        for node, cached in (("recruit", False), ("hypothesis", False), ("synthesis", True)):
+            usage = NodeUsage(state, node)
+            call = usage.call("m")
+            if not cached:
+                call.compute(lambda: None)()
+            call.success(100, "answer")
+            records += usage.records()
+        by_tier = usage_report(records)["by_tier"]
+        self.assertEqual(set(by_tier), {"fast", "default", "strong"})
+        self.assertEqual(by_tier["fast"]["prompt_tokens"], 100)
+        # Cache hits are charged no tokens
+        self.assertEqual((by_tier["strong"]["calls"], by_tier["strong"]["prompt_tokens"]), (1, 0))
+
+    @patch('graph.debate_task')
+    @patch('graph.DevilsAdvocate')
+    @patch('graph.Crew')
+    def test_debate_runs_on_strong_tier(self, mock_crew, mock_da, mock_task):
+        mock_crew.return_value.kickoff.return_value = "Debate minutes"
+        state = {"input": "q", "hypotheses": [{"expert_name": "A", "hypothesis": "H"}], "node_tiers": {"debate": "strong"}}
+
+        result = debate_node(state)
+
+        self.assertEqual(mock_da.return_value.get_agent.call_args[1]["model_name"], TIER_MODELS["strong"][0])
+        self.assertEqual(usage_report(result["usage"])["by_tier"]["strong"]["calls"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import time
+import unittest
+from process_pool import ProcessPool, RemoteCallError, WorkerTimeout
+from retry_policy import classify_error, retry_after
+
+class ProviderError(Exception):
+    def __init__(self, message, status_code, headers):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers
+
+def rate_limited():
+    # Wrapped like CrewAI wraps LiteLLM errors
+    try:
+        raise ProviderError("slow down", 429, {"Retry-After": "12"})
+    except ProviderError as e:
+        raise RuntimeError("Agent execution failed") from e
+
+class TestProcessPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ProcessPool(max_workers=2)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_runs_in_reused_worker(self):
+        pid = self.pool.run(os.getpid)
+        self.assertNotEqual(pid, os.getpid())
+        self.assertEqual(self.pool.run(os.getpid), pid)
+        self.assertEqual(self.pool.run(divmod, (7, 2)), (3, 1))
+
+    def test_error_is_marshalled(self):
+        with self.assertRaises(RemoteCallError) as ctx:
+            self.pool.run(int, ("not a number",))
+        self.assertIn("ValueError", str(ctx.exception))
+        self.assertEqual(ctx.exception.type_name, "ValueError")
+        # The worker survives a regular exception
+        self.assertEqual(self.pool.stats()["killed"], 0)
+
+    def test_retry_hints_are_marshalled(self):
+        with self.assertRaises(RemoteCallError) as ctx:
+            self.pool.run(rate_limited)
+        self.assertEqual(ctx.exception.status_code, 429)
+        self.assertEqual(retry_after(ctx.exception), 12.0)
+        self.assertEqual(classify_error(ctx.exception), "transient")
+
+    def test_timeout_kills_worker(self):
+        pid = self.pool.run(os.getpid)
+        start = time.monotonic()
+        with self.assertRaises(WorkerTimeout):
+            self.pool.run(time.sleep, (30,), timeout=0.5)
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertEqual(self.pool.stats()["killed"], 1)
+        # A fresh worker replaces the killed one
+        self.assertNotEqual(self.pool.run(os.getpid), pid)
+
+    def test_cancellation_kills_worker(self):
+        async def run():
+            task = asyncio.ensure_future(self.pool.arun(time.sleep, (30,)))
+            await asyncio.sleep(3)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+        self.assertEqual(self.pool.stats()["killed"], 1)
+        self.assertEqual(asyncio.run(self.pool.arun(divmod, (9, 4))), (2, 1))
+
+if __name__ == '__main__':
+    unittest.main()
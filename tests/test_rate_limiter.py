@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+import unittest
+from rate_limiter import ModelRateLimiter, RateLimiterRegistry, TokenBucket
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_token_bucket_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock)  # 1 token per second
+        bucket.consume(60)
+        self.assertAlmostEqual(bucket.wait_time(1), 1.0)
+        clock.now = 5
+        self.assertEqual(bucket.wait_time(5), 0.0)
+
+    def test_requests_per_minute(self):
+        clock = FakeClock()
+        limiter = ModelRateLimiter("m", rpm=2, clock=clock)
+        self.assertEqual(limiter.try_acquire(), 0.0)
+        self.assertEqual(limiter.try_acquire(), 0.0)
+        # Third request must wait for half a minute (2 rpm refill)
+        self.assertAlmostEqual(limiter.try_acquire(), 30.0)
+
+    def test_tokens_per_minute(self):
+        clock = FakeClock()
+        limiter = ModelRateLimiter("m", tpm=1000, clock=clock)
+        self.assertEqual(limiter.try_acquire(800), 0.0)
+        self.assertGreater(limiter.try_acquire(800), 0.0)
+
+    def test_unlimited(self):
+        limiter = ModelRateLimiter("m")
+        for _ in range(100):
+            self.assertEqual(limiter.try_acquire(10000), 0.0)
+
+    def test_max_in_flight_and_metrics(self):
+        registry = RateLimiterRegistry(max_in_flight=2)
+        active = []
+        peak = []
+
+        async def call():
+            async with registry.aslot("m"):
+                active.append(1)
+                peak.append(len(active))
+                await asyncio.sleep(0.05)
+                active.pop()
+
+        async def run():
+            await asyncio.gather(*(call() for _ in range(6)))
+
+        asyncio.run(run())
+        self.assertLessEqual(max(peak), 2)
+        stats = registry.snapshot()["m"]
+        self.assertEqual(stats["acquired"], 6)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertGreater(stats["waited"], 0)
+        self.assertGreater(stats["max_wait"], 0)
+
+    def test_sync_slot_shared_across_threads(self):
+        registry = RateLimiterRegistry(max_in_flight=1)
+        active = []
+        peak = []
+
+        def call():
+            with registry.slot("m"):
+                active.append(1)
+                peak.append(len(active))
+                time.sleep(0.02)
+                active.pop()
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(max(peak), 1)
+
+    def test_configure_per_model(self):
+        registry = RateLimiterRegistry(rpm=20)
+        registry.configure("slow-model", rpm=5, max_in_flight=1)
+        self.assertEqual(registry.get("slow-model").rpm, 5)
+        self.assertEqual(registry.get("other").rpm, 20)
+
+    def test_no_model_is_noop(self):
+        registry = RateLimiterRegistry(max_in_flight=1)
+        with registry.slot(None):
+            pass
+        self.assertEqual(registry.snapshot(), {})
+
+    def test_each_provider_request_takes_a_slot(self):
+        registry = RateLimiterRegistry(max_in_flight=1)
+        in_flight = []
+
+        def completion(**kwargs):
+            in_flight.append(registry.get(kwargs["model"]).in_flight)
+            return "ok"
+
+        completion = registry.wrap_completion(completion)
+        # A crew kickoff makes one request per ReAct turn
+        for _ in range(3):
+            completion(model="m", messages=[{"role": "user", "content": "x" * 400}])
+        stats = registry.snapshot()["m"]
+        self.assertEqual(stats["acquired"], 3)
+        self.assertEqual(in_flight, [1, 1, 1])
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_async_requests_release_on_error(self):
+        registry = RateLimiterRegistry(max_in_flight=1)
+
+        async def acompletion(**kwargs):
+            raise ConnectionError("reset")
+
+        acompletion = registry.wrap_acompletion(acompletion)
+        with self.assertRaises(ConnectionError):
+            asyncio.run(acompletion(model="m", messages=[]))
+        self.assertEqual(registry.snapshot()["m"]["in_flight"], 0)
+
+    def test_litellm_requests_are_limited(self):
+        import litellm
+        import execution  # installs the wrappers
+        self.assertTrue(litellm.completion.rate_limited)
+        self.assertTrue(litellm.acompletion.rate_limited)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+import httpx
+import litellm
+from execution import gather_with_quorum
+from process_pool import RemoteCallError, WorkerTimeout
+from retry_policy import FatalLLMError, RetryPolicy, classify_error, retry_after, set_retry_policy
+from utils import retry_llm
+
+def rate_limit_error(headers=None):
+    response = httpx.Response(429, headers=headers or {}, request=httpx.Request("POST", "https://openrouter.ai"))
+    return litellm.RateLimitError("Rate limited", llm_provider="openrouter", model="m", response=response)
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = RetryPolicy()
+        set_retry_policy(self.policy)
+
+    def tearDown(self):
+        set_retry_policy(RetryPolicy())
+
+    def test_classify_litellm_exceptions(self):
+        self.assertEqual(classify_error(rate_limit_error()), "transient")
+        self.assertEqual(classify_error(litellm.ContextWindowExceededError("too long", model="m", llm_provider="openrouter")), "model_unusable")
+        self.assertEqual(classify_error(litellm.NotFoundError("no model", model="m", llm_provider="openrouter")), "model_unusable")
+        self.assertEqual(classify_error(litellm.AuthenticationError("bad key", llm_provider="openrouter", model="m")), "fatal")
+
+    def test_classify_wrapped_messages(self):
+        self.assertEqual(classify_error(Exception("Error code: 429 - rate limit")), "transient")
+        self.assertEqual(classify_error(Exception("503 Service Unavailable")), "transient")
+        self.assertEqual(classify_error(RemoteCallError("AuthenticationError: invalid key")), "fatal")
+        self.assertEqual(classify_error(Exception("Error code: 401 - No auth credentials found")), "fatal")
+        self.assertEqual(classify_error(Exception("This model's maximum context length is 8192 tokens")), "model_unusable")
+        self.assertEqual(classify_error(Exception("No endpoints found for openrouter/x")), "model_unusable")
+        self.assertEqual(classify_error(WorkerTimeout("killed")), "model_unusable")
+        self.assertEqual(classify_error(Exception("Write at most 400 words")), "unknown")
+
+    def test_retry_after(self):
+        self.assertEqual(retry_after(rate_limit_error({"retry-after": "7"})), 7.0)
+        self.assertEqual(retry_after(Exception("Please retry after 12 seconds")), 12.0)
+        self.assertIsNone(retry_after(Exception("boom")))
+
+    @patch('time.sleep')
+    def test_transient_honours_retry_after(self, mock_sleep):
+        func = MagicMock(side_effect=[rate_limit_error({"retry-after": "7"}), "ok"])
+        self.assertEqual(retry_llm(func)(), "ok")
+        self.assertGreaterEqual(mock_sleep.call_args.args[0], 7)
+        self.assertLess(mock_sleep.call_args.args[0], 8)
+        self.assertEqual(self.policy.stats()["transient"]["retry"], 1)
+
+    @patch('time.sleep')
+    def test_model_unusable_is_not_retried(self, mock_sleep):
+        func = MagicMock(side_effect=Exception("context_length_exceeded"))
+        with self.assertRaises(Exception):
+            retry_llm(func)()
+        self.assertEqual(func.call_count, 1)
+        mock_sleep.assert_not_called()
+        self.assertEqual(self.policy.stats()["model_unusable"]["next_model"], 1)
+
+    @patch('time.sleep')
+    def test_fatal_aborts(self, mock_sleep):
+        func = MagicMock(side_effect=Exception("AuthenticationError: Invalid API key"))
+        with self.assertRaises(FatalLLMError):
+            retry_llm(func)()
+        self.assertEqual(func.call_count, 1)
+        self.assertEqual(self.policy.stats()["fatal"]["abort"], 1)
+
+    def test_gather_propagates_fatal(self):
+        async def ok():
+            return "ok"
+
+        async def fatal():
+            raise FatalLLMError("Invalid API key")
+
+        with self.assertRaises(FatalLLMError):
+            asyncio.run(gather_with_quorum([ok(), fatal()]))
+
+if __name__ == '__main__':
+    unittest.main()
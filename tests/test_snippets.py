@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+from snippets import compress_observation, split_sentences, snippet_stats
+from token_budget import count_tokens
+from tools import HalTool, DDGTool
+from tool_cache import tool_cache
+
+FILLER = "The workshop was held in a large venue with many attendees. "
+
+class TestSnippets(unittest.TestCase):
+
+    def test_split_sentences(self):
+        self.assertEqual(split_sentences("One. Two?\nThree"), ["One.", "Two?", "Three"])
+
+    def test_short_observation_unchanged(self):
+        self.assertEqual(compress_observation("Titre: X", "swarm", max_tokens=100), "Titre: X")
+        self.assertEqual(compress_observation(FILLER * 50, "swarm", max_tokens=0), FILLER * 50)
+
+    def test_relevant_sentences_kept_within_budget(self):
+        abstract = FILLER * 10 + "Underwater drone swarms coordinate with acoustic consensus. " + FILLER * 10
+        text = f"Title: Paper A\nAuthors: A. Diver\nSummary: {abstract}\nLink: u1\n"
+        result = compress_observation(text, "underwater drone swarms", max_tokens=40)
+        self.assertLessEqual(count_tokens(result), 40)
+        self.assertIn("Underwater drone swarms coordinate with acoustic consensus.", result)
+        # Structural lines survive, the abstract is reduced around its relevant sentence
+        self.assertIn("Title: Paper A", result)
+        self.assertIn("Link: u1", result)
+        self.assertIn("Summary: … Underwater", result)
+
+    def test_every_result_keeps_its_best_sentence(self):
+        text = "\n".join(f"Title: P{n}\nSummary: {FILLER * 5}Swarm result {n}.\nLink: u{n}\n" for n in range(3))
+        result = compress_observation(text, "swarm result", max_tokens=60)
+        for n in range(3):
+            self.assertIn(f"Swarm result {n}.", result)
+
+    def test_free_text(self):
+        text = FILLER * 20 + "Swarm robotics relies on local rules."
+        result = compress_observation(text, "swarm robotics", max_tokens=20)
+        self.assertTrue(result.startswith("… Swarm robotics relies on local rules."))
+
+    def test_tools_compress_observations(self):
+        tool_cache.reset()
+        snippet_stats.reset()
+        long_result = "Titre: X\nRésumé: " + FILLER * 100 + "Swarm robotics is key.\nLien: u\n"
+        with patch.object(HalTool, "_search", return_value=long_result), patch("snippets.DEFAULT_OBSERVATION_TOKENS", 50):
+            result = HalTool()._run("swarm robotics")
+        self.assertIn("Swarm robotics is key.", result)
+        self.assertLessEqual(count_tokens(result), 50)
+        # The cache keeps the full result for other queries
+        self.assertEqual(tool_cache.get("HAL Search", "swarm robotics"), long_result)
+        self.assertGreater(snippet_stats.snapshot()["tokens_saved"], 0)
+        with patch("tools.DuckDuckGoSearchRun") as ddg, patch("snippets.DEFAULT_OBSERVATION_TOKENS", 30):
+            ddg.return_value.run.return_value = FILLER * 50 + "Drone swarms are cheap."
+            self.assertIn("Drone swarms are cheap.", DDGTool()._run("drone swarms"))
+        tool_cache.reset()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+import token_budget
+from token_budget import count_tokens, model_limits, preflight, prompt_budget, trim_text
+
+SMALL_MODEL = "openrouter/google/gemma-2-9b-it:free"
+
+def make_task(description):
+    agent = SimpleNamespace(role="Synthesizer", goal="Merge ideas", backstory="Careful.")
+    task = SimpleNamespace(description=description, expected_output="A JSON object.")
+    return agent, task
+
+class TestTokenBudget(unittest.TestCase):
+
+    def test_count_tokens(self):
+        self.assertGreater(count_tokens("hello world " * 100), count_tokens("hello world"))
+
+    @patch('tiktoken.get_encoding', side_effect=ConnectionError("no network"))
+    def test_encoding_is_loaded_without_download(self, mock_get_encoding):
+        with patch.object(token_budget, '_encoding', None), patch.object(token_budget, '_encoding_failed', False):
+            self.assertIsNotNone(token_budget._get_encoding())
+            self.assertEqual(count_tokens("hello world"), 2)
+        mock_get_encoding.assert_not_called()
+
+    def test_model_limits(self):
+        self.assertEqual(model_limits(SMALL_MODEL)["context"], 8192)
+        self.assertIsNone(model_limits("openrouter/unknown/model-xyz"))
+        self.assertLess(prompt_budget(SMALL_MODEL), 8192)
+
+    def test_trim_text_keeps_head_and_tail(self):
+        text = "INSTRUCTIONS " + "filler words " * 2000 + " FORMAT"
+        trimmed = trim_text(text, 300)
+        self.assertLessEqual(count_tokens(trimmed), 300)
+        self.assertTrue(trimmed.startswith("INSTRUCTIONS"))
+        self.assertTrue(trimmed.endswith("FORMAT"))
+        self.assertIn("trimmed", trimmed)
+
+    def test_preflight_fits(self):
+        agent, task = make_task("Short synthesis.")
+        self.assertIsNotNone(preflight(agent, task, SMALL_MODEL, "skip"))
+
+    def test_preflight_skips_oversized_prompt(self):
+        agent, task = make_task("hypothesis text " * 20000)
+        self.assertIsNone(preflight(agent, task, SMALL_MODEL, "skip"))
+        # Unknown limits: assumed to fit
+        self.assertIsNotNone(preflight(agent, task, "openrouter/unknown/model-xyz", "skip"))
+
+    def test_preflight_trims_oversized_prompt(self):
+        agent, task = make_task("Analyse: " + "hypothesis text " * 20000 + " Answer in JSON.")
+        tokens = preflight(agent, task, SMALL_MODEL, "trim")
+        self.assertIsNotNone(tokens)
+        self.assertLessEqual(tokens, prompt_budget(SMALL_MODEL))
+        self.assertTrue(task.description.endswith("Answer in JSON."))
+
+if __name__ == '__main__':
+    unittest.main()
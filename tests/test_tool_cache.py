@@ -0,0 +1,181 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from literature_index import LiteratureIndex
+from tool_cache import ToolCache, normalize_query, tool_cache
+from tools import HalTool, DDGTool
+from prefetch import prefetch, prefetch_queries, topic
+
+class TestToolCache(unittest.TestCase):
+
+    def test_normalization(self):
+        self.assertEqual(normalize_query("Swarm  Robotics, underwater!"), normalize_query("underwater swarm robotics"))
+
+    def test_exact_and_similar_hits(self):
+        cache = ToolCache(similarity=0.75)
+        cache.put("HAL Search", "underwater drone swarm coordination", "R")
+        self.assertEqual(cache.get("HAL Search", "Coordination of underwater drone swarm"), "R")
+        self.assertIsNone(cache.get("HAL Search", "protein folding"))
+        # Results are per tool
+        self.assertIsNone(cache.get("Arxiv Search", "underwater drone swarm coordination"))
+
+    def test_exact_only(self):
+        cache = ToolCache(similarity=1.0)
+        cache.put("t", "a b c d", "R")
+        self.assertIsNone(cache.get("t", "a b c d e"))
+
+    def test_exact_only_by_default(self):
+        cache = ToolCache()
+        cache.put("t", "underwater drone swarm coordination", "R")
+        self.assertIsNone(cache.get("t", "underwater drone swarm navigation"))
+
+    def test_failed_write_releases_query(self):
+        cache = ToolCache()
+        with patch.object(cache, "put", side_effect=sqlite3.OperationalError("database is locked")):
+            self.assertEqual(cache.call("t", "q", lambda: "R"), "R")
+        self.assertEqual(cache._inflight, {})
+        self.assertEqual(cache.call("t", "q", lambda: "R2"), "R2")
+
+    def test_errors_are_not_cached(self):
+        cache = ToolCache()
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise ConnectionError("down")
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                cache.call("t", "q", failing)
+        self.assertEqual(len(calls), 2)
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = ToolCache(ttl=60, clock=lambda: now[0])
+        cache.put("t", "q", "R")
+        now[0] = 61
+        self.assertIsNone(cache.get("t", "q"))
+
+    def test_memory_is_bounded(self):
+        cache = ToolCache(similarity=1.0, max_entries=2)
+        cache.put("t", "a", "A")
+        cache.put("t", "b", "B")
+        cache.get("t", "a")
+        cache.put("t", "c", "C")
+        # "b" was the least recently used
+        self.assertIsNone(cache.get("t", "b"))
+        self.assertEqual(cache.get("t", "a"), "A")
+
+    def test_concurrent_identical_queries_are_coalesced(self):
+        cache = ToolCache()
+        calls = []
+
+        def slow_search():
+            calls.append(1)
+            time.sleep(0.2)
+            return "R"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.call("t", "swarm robotics", slow_search))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["R"] * 4)
+        self.assertEqual(len(calls), 1)
+        stats = cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["coalesced"], 3)
+        self.assertEqual(stats["hit_ratio"], 0.75)
+        self.assertGreater(stats["saved_s"], 0)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tools.sqlite")
+            ToolCache(path=path).put("t", "swarm robotics", "R")
+            reloaded = ToolCache(path=path)
+            self.assertEqual(reloaded.call("t", "Robotics swarm", lambda: "network"), "R")
+            self.assertEqual(reloaded.stats()["disk_hits"], 1)
+
+    def test_tool_served_from_cache(self):
+        tool_cache.reset()
+        tool = HalTool()
+        with patch.object(HalTool, "_search", return_value="Titre: X") as search:
+            self.assertEqual(tool._run("swarm robotics"), "Titre: X")
+            self.assertEqual(tool._run("Robotics swarm"), "Titre: X")
+        search.assert_called_once()
+        tool_cache.reset()
+
+class TestPrefetch(unittest.TestCase):
+
+    experts = [
+        {"name": "Research Librarian", "role": "Research Librarian", "skill": "Literature review"},
+        {"name": "Eco", "role": "Economist", "skill": "Market design"},
+    ]
+
+    def setUp(self):
+        # Without a Serper key the experts search the web with DuckDuckGo
+        self.env = patch.dict(os.environ)
+        self.env.start()
+        os.environ.pop("SERPER_API_KEY", None)
+        # Experts must not open (or create) the default literature index
+        self.index = patch("agents.literature_index", LiteratureIndex(""))
+        self.index.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.index.stop()
+
+    def test_topic_drops_iteration_updates(self):
+        self.assertEqual(topic("Drone swarms for the ocean\n\n[ITERATION UPDATE] gaps"), "drone swarms ocean")
+
+    def test_queries_follow_expert_tools(self):
+        queries = prefetch_queries("Drone swarms", self.experts)
+        tools = {(tool.name, query) for tool, query in queries}
+        self.assertIn(("HAL Search", "drone swarms Literature review"), tools)
+        self.assertIn(("DuckDuckGo Search", "drone swarms Market design"), tools)
+        # Only the librarian gets the academic tools
+        self.assertNotIn(("HAL Search", "drone swarms Market design"), tools)
+        self.assertEqual(prefetch_queries("Drone swarms", self.experts, web_search_enabled=False), [])
+
+    def test_prefetch_warms_cache(self):
+        tool_cache.reset()
+        with patch.object(DDGTool, "_search", side_effect=lambda q: f"web:{q}"), \
+             patch.object(HalTool, "_search", side_effect=lambda q: f"hal:{q}") as hal_search, \
+             patch("tools.ArxivTool._search", side_effect=lambda q: f"arxiv:{q}"):
+            count = asyncio.run(prefetch("Drone swarms", self.experts))
+        self.assertGreater(count, 0)
+        # Each guess is fetched: the other prefetched entries never answer it
+        hal_queries = [q for tool, q in prefetch_queries("Drone swarms", self.experts) if tool.name == "HAL Search"]
+        self.assertEqual(sorted(c.args[0] for c in hal_search.call_args_list), sorted(hal_queries))
+        self.assertEqual(tool_cache.get("HAL Search", "drone swarms literature review"), "hal:drone swarms Literature review")
+        tool_cache.reset()
+
+    def test_agent_query_hits_prefetched_entry(self):
+        tool_cache.reset()
+        fetched = []
+
+        def search(q):
+            fetched.append(q)
+            return f"hal:{q}"
+
+        with patch.object(HalTool, "_search", side_effect=search), patch.object(DDGTool, "_search", return_value="web"), \
+             patch("tools.ArxivTool._search", return_value="arxiv"), patch("tools.compress_observation", side_effect=lambda text, query: text):
+            asyncio.run(prefetch("Coordination of drone swarms for ocean exploration", self.experts[:1], web_search_enabled=True))
+            prefetched = len(fetched)
+            # The librarian words the search its own way
+            result = HalTool()._run("drone swarm coordination ocean exploration literature review")
+        self.assertEqual(len(fetched), prefetched)
+        self.assertTrue(result.startswith("hal:"))
+        # Entries an agent fetched itself still need an exact match
+        tool_cache.put("HAL Search", "underwater acoustic networks", "hal:acoustic")
+        self.assertIsNone(tool_cache.get("HAL Search", "underwater acoustic sensor networks"))
+        tool_cache.reset()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from topology import lexical_similarity, select_neighbours
+
+def hyp(name, text):
+    return {"expert_name": name, "hypothesis": text}
+
+class TestTopology(unittest.TestCase):
+
+    def setUp(self):
+        self.hypotheses = [
+            hyp("A", "protein folding energy landscape"),
+            hyp("B", "protein folding energy kinetics"),
+            hyp("C", "market incentives and pricing"),
+            hyp("D", "graph algorithms for search"),
+        ]
+
+    def names(self, neighbours):
+        return [[h["expert_name"] for h in n] for n in neighbours]
+
+    def test_lexical_similarity(self):
+        self.assertEqual(lexical_similarity("protein folding", "folding protein"), 1.0)
+        self.assertEqual(lexical_similarity("protein folding", "market pricing"), 0.0)
+        self.assertEqual(lexical_similarity("", "anything"), 0.0)
+
+    def test_all_to_all(self):
+        neighbours = self.names(select_neighbours(self.hypotheses, "all_to_all"))
+        self.assertEqual(neighbours[0], ["B", "C", "D"])
+        self.assertTrue(all(len(n) == 3 for n in neighbours))
+
+    def test_ring(self):
+        neighbours = self.names(select_neighbours(self.hypotheses, "ring", k=1))
+        self.assertEqual(neighbours, [["B"], ["C"], ["D"], ["A"]])
+
+    def test_random_k_is_seeded(self):
+        first = self.names(select_neighbours(self.hypotheses, "random_k", k=2, seed="run:0"))
+        second = self.names(select_neighbours(self.hypotheses, "random_k", k=2, seed="run:0"))
+        self.assertEqual(first, second)
+        for name, n in zip("ABCD", first):
+            self.assertEqual(len(n), 2)
+            self.assertNotIn(name, n)
+
+    def test_dissimilar_k_skips_closest(self):
+        neighbours = self.names(select_neighbours(self.hypotheses, "dissimilar_k", k=2))
+        # A and B share most of their words: they never read each other
+        self.assertNotIn("B", neighbours[0])
+        self.assertNotIn("A", neighbours[1])
+
+    def test_k_is_capped_and_single_expert(self):
+        self.assertTrue(all(len(n) == 3 for n in select_neighbours(self.hypotheses, "ring", k=10)))
+        self.assertEqual(select_neighbours(self.hypotheses[:1], "random_k", k=2), [[]])
+
+    def test_unknown_topology(self):
+        with self.assertRaises(ValueError):
+            select_neighbours(self.hypotheses, "star")
+
+if __name__ == '__main__':
+    unittest.main()
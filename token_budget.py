@@ -0,0 +1,160 @@
+"""
+Pre-flight token budgeting against model context windows.
+
+Before a crew is dispatched, its prompt is measured and checked against the context
+and output limits of the model. A prompt that cannot fit would fail on every retry,
+so depending on the ``context_policy`` the model is either skipped (``skip``) or the
+variable middle of the task description (hypotheses, debate minutes) is trimmed to
+the budget (``trim``).
+
+Tokens are counted with the ``cl100k_base`` encoding bundled with LiteLLM (read from
+disk, never downloaded), and estimated at about 4 characters per token when it is
+unavailable. ``cl100k_base`` is an OpenAI tokenizer: the llama, mistral and gemma
+models of :data:`MODEL_LIMITS` split text differently, so prompt budgets keep a
+safety margin (``NEXUS_TOKEN_MARGIN``, 10 % by default).
+
+Limits come from :data:`MODEL_LIMITS`, then ``NEXUS_MODEL_LIMITS`` overrides
+(``'{"openrouter/model": {"context": 8192, "output": 2048}}'``), then LiteLLM's
+model map. Models with unknown limits are assumed to fit.
+"""
+import json
+import os
+import threading
+
+from llm_cache import crew_prompt
+from rate_limiter import estimate_tokens
+
+CONTEXT_POLICIES = ("skip", "trim")
+DEFAULT_CONTEXT_POLICY = os.environ.get("NEXUS_CONTEXT_POLICY", "skip")
+# Tokens kept free for the answer, capped by the model's own output limit
+DEFAULT_OUTPUT_RESERVE = int(os.environ.get("NEXUS_OUTPUT_RESERVE", 2048))
+# CrewAI's own system prompt (ReAct format, tool descriptions) around the task text
+CREW_OVERHEAD_TOKENS = int(os.environ.get("NEXUS_CREW_OVERHEAD_TOKENS", 800))
+# Below this many tokens left for the task description, trimming is pointless: skip the model
+MIN_TRIMMED_TOKENS = 500
+# Share of the prompt budget kept free for tokenizer mismatch (counts are cl100k_base approximations)
+DEFAULT_TOKEN_MARGIN = float(os.environ.get("NEXUS_TOKEN_MARGIN", 0.1))
+
+# OpenRouter free endpoints can be smaller than the paid ones
+MODEL_LIMITS = {
+    "openrouter/meta-llama/llama-3.3-70b-instruct:free": {"context": 65536, "output": 8192},
+    "openrouter/mistralai/mistral-small-3.1-24b-instruct:free": {"context": 96000, "output": 8192},
+    "openrouter/openai/gpt-oss-20b:free": {"context": 131072, "output": 32768},
+    "openrouter/google/gemma-2-9b-it:free": {"context": 8192, "output": 8192},
+}
+MODEL_LIMITS.update(json.loads(os.environ.get("NEXUS_MODEL_LIMITS", "{}")))
+
+_TRIM_MARKER = "\n\n[… {} tokens trimmed to fit the model context …]\n\n"
+
+_encoding = None
+_encoding_lock = threading.Lock()
+_encoding_failed = os.environ.get("NEXUS_TOKENIZER", "tiktoken") != "tiktoken"
+
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    with _encoding_lock:
+        if _encoding is None and not _encoding_failed:
+            try:
+                # LiteLLM ships the encoding file and points tiktoken at it: no network access
+                from litellm.litellm_core_utils.default_encoding import encoding
+                _encoding = encoding
+            except Exception as e:
+                print(f"⚠️ Local tokenizer unavailable ({type(e).__name__}), using the 4 chars/token estimate.")
+                _encoding_failed = True
+        return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts the tokens of a text with the local tokenizer, or estimates them.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return max(1, len(encoding.encode(text or "", disallowed_special=())))
+
+
+def model_limits(model: str) -> dict:
+    """
+    Returns the ``context`` and ``output`` limits of a model, or None when unknown.
+    """
+    if model in MODEL_LIMITS:
+        return MODEL_LIMITS[model]
+    try:
+        import litellm
+        # LiteLLM maps the paid variants only
+        info = litellm.get_model_info(model.replace(":free", ""))
+    except Exception:
+        return None
+    if not info.get("max_input_tokens"):
+        return None
+    return {"context": info["max_input_tokens"], "output": info.get("max_output_tokens") or DEFAULT_OUTPUT_RESERVE}
+
+
+def prompt_budget(model: str) -> int:
+    """
+    Returns the maximum prompt tokens of a model, or None when unknown.
+
+    The budget is the context minus the output reserve, less the tokenizer safety margin.
+    """
+    limits = model_limits(model)
+    if not limits:
+        return None
+    return int((limits["context"] - min(DEFAULT_OUTPUT_RESERVE, limits["output"])) * (1 - DEFAULT_TOKEN_MARGIN))
+
+
+def trim_text(text: str, max_tokens: int) -> str:
+    """
+    Cuts the middle of a text so that it fits ``max_tokens``.
+
+    The head (instructions) and the tail (answer format) of a task description are kept;
+    the variable material in between is what grows with the number of experts.
+    """
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    keep = max_tokens - count_tokens(_TRIM_MARKER.format(tokens))
+    for _ in range(5):
+        chars = int(len(text) * keep / tokens)
+        head, tail = text[:chars // 2], text[len(text) - chars // 2:]
+        trimmed = head + _TRIM_MARKER.format(tokens - keep) + tail
+        if count_tokens(trimmed) <= max_tokens:
+            return trimmed
+        keep = int(keep * 0.9)
+    return trimmed
+
+
+def preflight(agent, task, model: str, policy: str = None, overhead: int = CREW_OVERHEAD_TOKENS):
+    """
+    Checks that a single-agent task fits the model before it is dispatched.
+
+    With the ``trim`` policy, ``task.description`` is shortened in place when needed.
+
+    Args:
+        agent (Agent): The agent of the crew.
+        task (Task): Its task.
+        model (str): The model about to be called.
+        policy (str): ``"skip"`` or ``"trim"``. Defaults to ``NEXUS_CONTEXT_POLICY``.
+        overhead (int): Tokens added around the task text by the executor.
+
+    Returns:
+        int: The prompt tokens (after trimming), or None if the model must be skipped.
+    """
+    policy = policy or DEFAULT_CONTEXT_POLICY
+    if policy not in CONTEXT_POLICIES:
+        raise ValueError(f"Unknown context policy '{policy}'. Expected one of {CONTEXT_POLICIES}.")
+    tokens = count_tokens(crew_prompt(agent, task)) + overhead
+    budget = prompt_budget(model)
+    if budget is None or tokens <= budget:
+        return tokens
+
+    if policy == "trim":
+        description_budget = budget - (tokens - count_tokens(task.description))
+        if description_budget >= MIN_TRIMMED_TOKENS:
+            print(f"✂️ Prompt of {tokens} tokens trimmed to fit {model} ({budget} tokens).")
+            task.description = trim_text(task.description, description_budget)
+            return count_tokens(crew_prompt(agent, task)) + overhead
+
+    print(f"📏 Skipping {model}: prompt of {tokens} tokens exceeds its budget of {budget} tokens.")
+    return None
@@ -0,0 +1,250 @@
+"""
+Shared cache of search tool results.
+
+The search tools (:mod:`tools`) route every query through :data:`tool_cache`, which is
+shared by all the experts, iterations and runs of the process. A query already
+answered, by another expert or by the prefetch stage (:mod:`prefetch`), is served
+from memory instead of the network.
+
+* Queries are normalized (case, punctuation, word order) before lookup, and only
+  exact matches are served by default. Setting ``NEXUS_TOOL_CACHE_SIMILARITY`` below 1
+  also serves a cached query of the same tool whose words overlap enough with the new
+  one (Jaccard similarity of at least that value). Entries stored by the prefetch
+  stage are guesses of what the experts will search, so they are also served to
+  queries whose similarity reaches ``NEXUS_PREFETCH_SIMILARITY`` (0.5 by default).
+* Entries expire after ``NEXUS_TOOL_CACHE_TTL`` seconds, and the memory holds at most
+  ``NEXUS_TOOL_CACHE_SIZE`` entries (least recently used evicted first).
+* Identical queries in flight at the same time (e.g. two experts searching the same
+  thing) are coalesced into a single network call.
+* With ``NEXUS_TOOL_CACHE_PATH`` set, results are also stored in SQLite, so they
+  survive restarts.
+
+Hits, misses and the search time they saved are exported by :meth:`ToolCache.stats`.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+DEFAULT_SIMILARITY = float(os.environ.get("NEXUS_TOOL_CACHE_SIMILARITY", 1.0))
+# Minimum similarity for a prefetched entry to be served
+DEFAULT_PREFETCH_SIMILARITY = float(os.environ.get("NEXUS_PREFETCH_SIMILARITY", 0.5))
+DEFAULT_TTL = float(os.environ.get("NEXUS_TOOL_CACHE_TTL", 24 * 3600))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("NEXUS_TOOL_CACHE_SIZE", 1000))
+# Empty: memory only
+DEFAULT_TOOL_CACHE_PATH = os.environ.get("NEXUS_TOOL_CACHE_PATH", "")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Returns the canonical form of a query: lowercase words, sorted and deduplicated.
+    """
+    return " ".join(sorted(set(re.findall(r"\w+", str(query).lower()))))
+
+
+def query_similarity(a: str, b: str) -> float:
+    """
+    Jaccard similarity of the word sets of two normalized queries.
+    """
+    words_a, words_b = set(a.split()), set(b.split())
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+class ToolCache:
+    """
+    Thread-safe cache of tool results, keyed on the tool name and the normalized query.
+
+    Args:
+        similarity (float): Minimum similarity for a near-identical query to be served.
+        prefetch_similarity (float): Minimum similarity for a prefetched entry to be served.
+        ttl (float): Time-to-live of an entry in seconds.
+        max_entries (int): Maximum number of entries kept in memory.
+        path (str): SQLite file for persistence. Empty keeps the cache in memory only.
+        clock (callable): Wall clock, injectable for tests.
+    """
+    def __init__(self, similarity: float = DEFAULT_SIMILARITY, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 path: str = DEFAULT_TOOL_CACHE_PATH, clock=time.time, prefetch_similarity: float = DEFAULT_PREFETCH_SIMILARITY):
+        self.similarity = similarity
+        self.prefetch_similarity = prefetch_similarity
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._prefetched = set()
+        self._conn = None
+        self._inflight = {}
+        self._counters = {"hits": 0, "similar_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+        self._fetch_seconds = 0.0
+
+    def _connect(self):
+        # Called with the lock held
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_results ("
+                "tool TEXT NOT NULL, query TEXT NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL, "
+                "PRIMARY KEY (tool, query))"
+            )
+        return self._conn
+
+    def _lookup(self, tool: str, key: str, similar: bool = True):
+        # Called with the lock held; returns (result, kind) or (None, None)
+        now = self._clock()
+        entry = self._entries.get((tool, key))
+        if entry is not None:
+            if now - entry[1] <= self.ttl:
+                self._entries.move_to_end((tool, key))
+                return entry[0], "hits"
+            del self._entries[(tool, key)]
+            self._prefetched.discard((tool, key))
+
+        if self.path:
+            row = self._connect().execute(
+                "SELECT result, created_at FROM tool_results WHERE tool = ? AND query = ?", (tool, key)
+            ).fetchone()
+            if row is not None and now - row[1] <= self.ttl:
+                self._store(tool, key, row[0], row[1])
+                return row[0], "disk_hits"
+
+        if similar and (self.similarity < 1 or self._prefetched):
+            best, best_score = None, 0.0
+            for (cached_tool, cached_key), (result, created_at) in self._entries.items():
+                if cached_tool != tool or now - created_at > self.ttl:
+                    continue
+                threshold = self.similarity
+                if (cached_tool, cached_key) in self._prefetched:
+                    threshold = min(threshold, self.prefetch_similarity)
+                score = query_similarity(key, cached_key)
+                if score >= threshold and (best is None or score > best_score):
+                    best, best_score = result, score
+            if best is not None:
+                return best, "similar_hits"
+        return None, None
+
+    def _store(self, tool: str, key: str, result: str, created_at: float):
+        # Called with the lock held
+        self._entries[(tool, key)] = (result, created_at)
+        self._entries.move_to_end((tool, key))
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._prefetched.discard(evicted)
+
+    def get(self, tool: str, query: str):
+        """
+        Returns the cached result of a query (or of a similar one), or None.
+        """
+        with self._lock:
+            return self._lookup(tool, normalize_query(query))[0]
+
+    def put(self, tool: str, query: str, result: str):
+        """
+        Stores a result, in memory and on disk when persistence is enabled.
+        """
+        key, now = normalize_query(query), self._clock()
+        with self._lock:
+            self._store(tool, key, result, now)
+            if self.path:
+                conn = self._connect()
+                conn.execute("INSERT OR REPLACE INTO tool_results (tool, query, result, created_at) VALUES (?, ?, ?, ?)", (tool, key, result, now))
+                conn.execute("DELETE FROM tool_results WHERE created_at < ?", (now - self.ttl,))
+                conn.commit()
+
+    def call(self, tool: str, query: str, compute, prefetch: bool = False):
+        """
+        Returns the cached result of a query, or runs ``compute()`` and caches its result.
+
+        Concurrent calls for the same query wait for a single ``compute()``. Errors
+        raised by ``compute`` are not cached.
+
+        With ``prefetch``, only an exact match is served (another guess of the prefetch
+        stage must not answer this one), and the stored result is marked as prefetched:
+        similar queries may be served it (see ``prefetch_similarity``).
+        """
+        inflight_key = (tool, normalize_query(query))
+        with self._lock:
+            cached, kind = self._lookup(*inflight_key, similar=not prefetch)
+            if cached is not None:
+                self._counters[kind] += 1
+            else:
+                future = self._inflight.get(inflight_key)
+                is_leader = future is None
+                if is_leader:
+                    future = Future()
+                    self._inflight[inflight_key] = future
+                    self._counters["misses"] += 1
+                else:
+                    self._counters["coalesced"] += 1
+        if cached is not None:
+            print(f"📦 {tool}: served from the tool cache ({query[:60]}).")
+            return cached
+        if not is_leader:
+            return future.result()
+
+        started = time.monotonic()
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(inflight_key, None)
+                self._counters["errors"] += 1
+            future.set_exception(e)
+            raise
+        try:
+            with self._lock:
+                self._fetch_seconds += time.monotonic() - started
+            self.put(tool, query, result)
+        except Exception as e:
+            # A failed write (e.g. the SQLite store) never fails the search
+            print(f"⚠️ {tool}: result not cached ({e}).")
+        finally:
+            with self._lock:
+                self._inflight.pop(inflight_key, None)
+                if prefetch and inflight_key in self._entries:
+                    self._prefetched.add(inflight_key)
+            future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counters, the hit ratio and the search time saved.
+
+        The time saved is estimated as the mean duration of a network search times
+        the number of calls served without one (hits and coalesced calls).
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            served = counters["hits"] + counters["similar_hits"] + counters["disk_hits"]
+            total = served + counters["misses"] + counters["coalesced"]
+            fetches = counters["misses"] - counters["errors"]
+            mean_fetch = self._fetch_seconds / fetches if fetches > 0 else 0.0
+            counters.update({
+                "entries": len(self._entries),
+                "hit_ratio": round((served + counters["coalesced"]) / total, 3) if total else 0.0,
+                "mean_search_s": round(mean_fetch, 2),
+                "saved_s": round(mean_fetch * (served + counters["coalesced"]), 1),
+            })
+            return counters
+
+    def reset(self):
+        """
+        Forgets the entries in memory and the counters (the disk store is kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._prefetched.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+            self._fetch_seconds = 0.0
+
+
+tool_cache = ToolCache()
@@ -1,6 +1,83 @@
 from crewai.tools import BaseTool
+from langchain_community.tools import DuckDuckGoSearchRun
+from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+from pydantic import BaseModel, Field
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Type
 import arxiv
-import requests
+import json
+import os
+import threading
+
+from http_client import get_session
+from literature_index import literature_index
+from utils import tokenize
+from snippets import compress_observation
+from tool_cache import tool_cache
+
+_arxiv_client = None
+_arxiv_lock = threading.Lock()
+# arxiv.Client is not thread-safe (its request pacing state is unguarded): searches run one at a time
+_arxiv_request_lock = threading.Lock()
+
+def get_arxiv_client() -> arxiv.Client:
+    """
+    Returns the shared Arxiv client, whose requests go through the pooled HTTP session.
+
+    ``NEXUS_ARXIV_DELAY`` sets the minimum delay between two Arxiv requests (3 s by
+    default, as the Arxiv API terms ask). The client's private ``_session`` is swapped
+    for the pooled session; use it through :func:`arxiv_results` only.
+    """
+    global _arxiv_client
+    with _arxiv_lock:
+        if _arxiv_client is None:
+            _arxiv_client = arxiv.Client(page_size=3, delay_seconds=float(os.environ.get("NEXUS_ARXIV_DELAY", 3)), num_retries=2)
+            # Keep-alive connections, timeouts and per-host limit of the shared session
+            _arxiv_client._session = get_session()
+        return _arxiv_client
+
+def arxiv_results(search: arxiv.Search) -> list:
+    """
+    Runs an Arxiv search with the shared client, serialized across threads (experts, prefetch, sweeps).
+    """
+    client = get_arxiv_client()
+    with _arxiv_request_lock:
+        return list(client.results(search))
+
+def harvest(records: list, source: str):
+    """
+    Adds fetched abstracts to the offline literature index; indexing errors never fail a search.
+    """
+    try:
+        literature_index.add(records, source=source)
+    except Exception as e:
+        print(f"⚠️ Literature index: {source} results not indexed ({e}).")
+
+# Field labels of the Arxiv and HAL observations: title, authors, abstract, link
+ARXIV_LABELS = ("Title", "Authors", "Summary", "Link")
+HAL_LABELS = ("Titre", "Auteurs", "Résumé", "Lien")
+RECORD_FIELDS = ("title", "authors", "abstract", "link")
+
+def format_records(records: list, labels: tuple) -> list:
+    """
+    Formats records as observation entries, one labelled field per line.
+    """
+    return ["".join(f"{label}: {r[field]}\n" for label, field in zip(labels, RECORD_FIELDS)) for r in records]
+
+def parse_records(text: str, labels: tuple) -> list:
+    """
+    Rebuilds the records of an observation written by :func:`format_records`.
+    """
+    records = []
+    for line in text.splitlines():
+        for label, field in zip(labels, RECORD_FIELDS):
+            if line.startswith(f"{label}: "):
+                if field == "title":
+                    records.append({})
+                if records:
+                    records[-1][field] = line[len(label) + 2:]
+                break
+    return [r for r in records if r.get("title")]
 
 class ArxivTool(BaseTool):
     name: str = "Arxiv Search"
@@ -8,23 +85,61 @@ class ArxivTool(BaseTool):
 
     def _run(self, query: str) -> str:
         try:
-            search = arxiv.Search(
-                query=query,
-                max_results=3,
-                sort_by=arxiv.SortCriterion.Relevance
-            )
-            results = []
-            for result in search.results():
-                results.append(f"Title: {result.title}\nAuthors: {', '.join([a.name for a in result.authors])}\nSummary: {result.summary[:300]}...\nLink: {result.entry_id}\n")
-            return "\n".join(results) if results else "Aucun résultat trouvé sur Arxiv."
+            # Full abstracts are cached; the observation keeps the sentences relevant to this query
+            return compress_observation(tool_cache.call(self.name, query, lambda: self._search(query)), query)
         except Exception as e:
             return f"Erreur Arxiv: {e}"
 
+    def _search(self, query: str) -> str:
+        results = format_records(self._fetch(query), ARXIV_LABELS)
+        return "\n".join(results) if results else "Aucun résultat trouvé sur Arxiv."
+
+    def _records(self, query: str) -> list:
+        """
+        Returns the records of a query from the tool cache entry of :meth:`_run` (fetched on a miss).
+        """
+        return parse_records(tool_cache.call(self.name, query, lambda: self._search(query)), ARXIV_LABELS)
+
+    def _fetch(self, query: str) -> list:
+        """
+        Returns the matching papers as records (``title``, ``authors``, ``abstract``, ``link``), harvested into the literature index.
+        """
+        search = arxiv.Search(
+            query=query,
+            max_results=3,
+            sort_by=arxiv.SortCriterion.Relevance
+        )
+        records = [
+            {"title": " ".join(result.title.split()), "authors": ", ".join(a.name for a in result.authors), "abstract": " ".join(result.summary.split()), "link": result.entry_id}
+            for result in arxiv_results(search)
+        ]
+        harvest(records, "arxiv")
+        return records
+
 class HalTool(BaseTool):
     name: str = "HAL Search"
     description: str = "Recherche sur les Archives Ouvertes HAL (Science Ouverte). Utile pour la recherche académique francophone et internationale dans toutes les disciplines."
 
     def _run(self, query: str) -> str:
+        try:
+            return compress_observation(tool_cache.call(self.name, query, lambda: self._search(query)), query)
+        except Exception as e:
+            return f"Erreur lors de la recherche HAL : {e}"
+
+    def _search(self, query: str) -> str:
+        results = format_records(self._fetch(query), HAL_LABELS)
+        return "\n".join(results) if results else "Aucun résultat trouvé sur HAL."
+
+    def _records(self, query: str) -> list:
+        """
+        Returns the records of a query from the tool cache entry of :meth:`_run` (fetched on a miss).
+        """
+        return parse_records(tool_cache.call(self.name, query, lambda: self._search(query)), HAL_LABELS)
+
+    def _fetch(self, query: str) -> list:
+        """
+        Returns the matching documents as records (``title``, ``authors``, ``abstract``, ``link``), harvested into the literature index.
+        """
         url = "https://api.archives-ouvertes.fr/search/"
         params = {
             "q": query,
@@ -32,19 +147,145 @@ class HalTool(BaseTool):
             "fl": "title_s,authFullName_s,abstract_s,uri_s",
             "rows": 3
         }
+        response = get_session().get(url, params=params, timeout=(5, 10))
+        response.raise_for_status()
+        data = response.json()
+        docs = data.get("response", {}).get("docs", [])
+        records = []
+        for doc in docs:
+            title = doc.get("title_s", ["Non spécifié"])[0] if isinstance(doc.get("title_s"), list) else doc.get("title_s", "Non spécifié")
+            authors = ", ".join(doc.get("authFullName_s", ["Inconnu"])) if isinstance(doc.get("authFullName_s"), list) else str(doc.get("authFullName_s"))
+            abstract_raw = doc.get("abstract_s", ["Pas de résumé"])
+            abstract = abstract_raw[0] if isinstance(abstract_raw, list) and abstract_raw else "Pas de résumé"
+            abstract = " ".join(abstract.split())
+            link = doc.get("uri_s", "#")
+            records.append({"title": " ".join(str(title).split()), "authors": authors, "abstract": abstract, "link": link})
+        harvest([r for r in records if r["link"] != "#"], "hal")
+        return records
+
+class DDGTool(BaseTool):
+    # Wraps the LangChain DuckDuckGo tool for CrewAI compatibility
+    name: str = "DuckDuckGo Search"
+    description: str = "Useful for searching the internet for information."
+
+    def _run(self, query: str) -> str:
+        return compress_observation(tool_cache.call(self.name, query, lambda: self._search(query)), query)
+
+    def _search(self, query: str) -> str:
+        return DuckDuckGoSearchRun().run(query)
+
+class LocalLiteratureTool(BaseTool):
+    name: str = "Local Literature Index"
+    description: str = "Recherche instantanée (hors ligne, classement BM25) dans les résumés Arxiv et HAL déjà collectés ou importés. À essayer avant Arxiv et HAL : résumés complets, sans appel réseau."
+
+    def _run(self, query: str) -> str:
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            docs = data.get("response", {}).get("docs", [])
-            results = []
-            for doc in docs:
-                title = doc.get("title_s", ["Non spécifié"])[0] if isinstance(doc.get("title_s"), list) else doc.get("title_s", "Non spécifié")
-                authors = ", ".join(doc.get("authFullName_s", ["Inconnu"])) if isinstance(doc.get("authFullName_s"), list) else str(doc.get("authFullName_s"))
-                abstract_raw = doc.get("abstract_s", ["Pas de résumé"])
-                abstract = abstract_raw[0] if isinstance(abstract_raw, list) and abstract_raw else "Pas de résumé"
-                link = doc.get("uri_s", "#")
-                results.append(f"Titre: {title}\nAuteurs: {authors}\nRésumé: {abstract[:300]}...\nLien: {link}\n")
-            return "\n".join(results) if results else "Aucun résultat trouvé sur HAL."
+            docs = literature_index.search(query, limit=5)
         except Exception as e:
-            return f"Erreur lors de la recherche HAL : {e}"
+            return f"Erreur de l'index local : {e}"
+        results = [
+            f"Title: {d['title']}\nAuthors: {d['authors']}\nSource: {d['source']} (BM25 {d['score']})\nSummary: {d['abstract']}\nLink: {d['link']}\n"
+            for d in docs
+        ]
+        return compress_observation("\n".join(results), query) if results else "Aucun résultat dans l'index local ; utilisez Arxiv ou HAL."
+
+SWEEP_SOURCES = ("arxiv", "hal", "web", "local")
+# Queries of a sweep, results per query and source, results returned
+MAX_SWEEP_QUERIES = 4
+SWEEP_RESULTS_PER_QUERY = 3
+MAX_SWEEP_RESULTS = 8
+# Reciprocal rank fusion constant
+RRF_K = 60
+
+def web_records(query: str) -> list:
+    """
+    Returns DuckDuckGo results as records (``title``, ``abstract``, ``link``).
+    """
+    results = DuckDuckGoSearchAPIWrapper().results(query, max_results=SWEEP_RESULTS_PER_QUERY)
+    return [{"title": r.get("title", ""), "authors": "", "abstract": r.get("snippet", ""), "link": r.get("link", "")} for r in results]
+
+def sweep_fetchers() -> dict:
+    """
+    Returns the record fetcher of every sweep source, keyed on the source name.
+
+    Arxiv and HAL share the tool cache entries of the Arxiv and HAL tools: a query an
+    expert (or the prefetch) already searched is not fetched again.
+    """
+    return {
+        "arxiv": lambda q: ArxivTool()._records(q),
+        "hal": lambda q: HalTool()._records(q),
+        # Web records are snippets, not the text of the DuckDuckGo tool: cached apart (as JSON)
+        "web": lambda q: json.loads(tool_cache.call("Sweep web", q, lambda: json.dumps(web_records(q)))),
+        "local": lambda q: literature_index.search(q, limit=SWEEP_RESULTS_PER_QUERY),
+    }
+
+def merge_results(ranked_lists: list, limit: int = MAX_SWEEP_RESULTS) -> list:
+    """
+    Merges ranked result lists with reciprocal rank fusion, deduplicating documents.
+
+    A document found by several queries or sources accumulates their scores.
+    Documents are identified by their normalized title, or their link.
+
+    Args:
+        ranked_lists (list): ``(source, records)`` pairs, records being ranked best first.
+        limit (int): Maximum number of documents returned.
+
+    Returns:
+        list: The merged records, best first, with their ``sources``.
+    """
+    merged = {}
+    for source, records in ranked_lists:
+        for rank, record in enumerate(records):
+            key = " ".join(tokenize(record.get("title", ""))) or record.get("link")
+            if not key:
+                continue
+            doc = merged.setdefault(key, {**record, "sources": [], "score": 0.0})
+            doc["score"] += 1 / (RRF_K + rank + 1)
+            if source not in doc["sources"]:
+                doc["sources"].append(source)
+            # Keep the most complete abstract
+            if len(record.get("abstract") or "") > len(doc.get("abstract") or ""):
+                doc["abstract"] = record["abstract"]
+    return sorted(merged.values(), key=lambda d: d["score"], reverse=True)[:limit]
+
+class LiteratureSweepInput(BaseModel):
+    queries: List[str] = Field(..., description="Liste de requêtes de recherche (au plus 4).")
+    sources: Optional[List[str]] = Field(default=None, description="Sources parmi 'arxiv', 'hal', 'web', 'local' (toutes par défaut).")
+
+class LiteratureSweepTool(BaseTool):
+    name: str = "Literature Sweep"
+    description: str = "Lance en une seule action plusieurs requêtes sur plusieurs sources (Arxiv, HAL, web, index local) en parallèle et renvoie les résultats fusionnés, dédoublonnés et classés. À préférer à plusieurs recherches successives."
+    args_schema: Type[BaseModel] = LiteratureSweepInput
+
+    def _run(self, queries: List[str], sources: Optional[List[str]] = None) -> str:
+        if isinstance(queries, str):
+            queries = [queries]
+        queries = [q for q in dict.fromkeys(" ".join(str(q).split()) for q in queries) if q][:MAX_SWEEP_QUERIES]
+        sources = [s for s in dict.fromkeys(str(s).lower() for s in (sources or SWEEP_SOURCES)) if s in SWEEP_SOURCES]
+        if not queries or not sources:
+            return f"Indiquez au moins une requête et une source parmi {', '.join(SWEEP_SOURCES)}."
+        fetchers = sweep_fetchers()
+        jobs = [(source, query) for query in queries for source in sources]
+
+        ranked_lists, errors = [], []
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            # Network sources go through the shared tool cache (see sweep_fetchers)
+            futures = [((source, query), pool.submit(fetchers[source], query)) for source, query in jobs]
+            for (source, query), future in futures:
+                try:
+                    ranked_lists.append((source, future.result()))
+                except Exception as e:
+                    errors.append(f"⚠️ {source} ({query}): {e}")
+
+        results = [
+            f"Title: {d['title']}\nAuthors: {d.get('authors') or 'N/A'}\nSources: {', '.join(d['sources'])}\nSummary: {d.get('abstract') or ''}\nLink: {d.get('link') or '#'}\n"
+            for d in merge_results(ranked_lists)
+        ]
+        print(f"🧹 Literature sweep: {len(jobs)} searches in parallel, {len(results)} merged results.")
+        if results:
+            # One budget for the whole sweep: the most relevant sentences across all results
+            results = [compress_observation("\n".join(results), " ".join(queries))]
+        return "\n".join(results + errors) if results or errors else "Aucun résultat trouvé."
+
+# Tools whose results go through the shared tool cache
+CACHED_TOOLS = (ArxivTool, HalTool, DDGTool)
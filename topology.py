@@ -0,0 +1,71 @@
+"""
+Cross-pollination topologies.
+
+With the ``all_to_all`` topology every expert reads every other hypothesis, so the
+prompt tokens of the cross-pollination phase grow as O(n²) with the number of
+experts. The sparse topologies give each expert only ``k`` neighbours (O(n·k)):
+
+* ``ring``: the ``k`` next experts around a ring.
+* ``random_k``: ``k`` random neighbours (seeded, so a run is reproducible and cacheable).
+* ``dissimilar_k``: the ``k`` hypotheses least similar to the expert's own, by lexical
+  (Jaccard) similarity, to maximize transdisciplinary input.
+"""
+import os
+import random
+import re
+
+TOPOLOGIES = ("all_to_all", "ring", "random_k", "dissimilar_k")
+DEFAULT_TOPOLOGY = os.environ.get("NEXUS_CROSS_TOPOLOGY", "all_to_all")
+DEFAULT_NEIGHBOURS = int(os.environ.get("NEXUS_CROSS_NEIGHBOURS", 2))
+
+
+def _words(text: str) -> set:
+    return {w for w in re.findall(r"\w+", str(text).lower()) if len(w) > 2}
+
+
+def lexical_similarity(a: str, b: str) -> float:
+    """
+    Jaccard similarity between the word sets of two texts (0 = disjoint, 1 = identical).
+    """
+    words_a, words_b = _words(a), _words(b)
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def select_neighbours(hypotheses: list, topology: str = None, k: int = None, seed=None) -> list:
+    """
+    Chooses which hypotheses each expert reads during cross-pollination.
+
+    Args:
+        hypotheses (list): The hypotheses (dicts with ``expert_name`` and ``hypothesis``).
+        topology (str): One of :data:`TOPOLOGIES`. Defaults to ``NEXUS_CROSS_TOPOLOGY``.
+        k (int): Neighbours per expert for the sparse topologies. Defaults to ``NEXUS_CROSS_NEIGHBOURS``.
+        seed: Seed of the ``random_k`` topology.
+
+    Returns:
+        list: For each hypothesis (same order), the list of neighbour hypotheses.
+    """
+    topology = topology or DEFAULT_TOPOLOGY
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown cross-pollination topology '{topology}'. Expected one of {TOPOLOGIES}.")
+    n = len(hypotheses)
+    k = max(1, min(k or DEFAULT_NEIGHBOURS, n - 1)) if n > 1 else 0
+
+    if topology == "all_to_all":
+        return [[o for j, o in enumerate(hypotheses) if j != i] for i in range(n)]
+
+    if topology == "ring":
+        return [[hypotheses[(i + step) % n] for step in range(1, k + 1)] for i in range(n)]
+
+    if topology == "random_k":
+        rng = random.Random(seed)
+        return [rng.sample([o for j, o in enumerate(hypotheses) if j != i], k) for i in range(n)]
+
+    # dissimilar_k
+    neighbours = []
+    for i, h in enumerate(hypotheses):
+        others = [o for j, o in enumerate(hypotheses) if j != i]
+        others.sort(key=lambda o: lexical_similarity(h['hypothesis'], o['hypothesis']))
+        neighbours.append(others[:k])
+    return neighbours
@@ -1,7 +1,25 @@
 
+import asyncio
+import re
 import time
+import unicodedata
 from functools import wraps
 
+from accounting import usage_report
+
+_STOPWORDS = set("""
+the and for that with this from are was were have has been which their there these those into than then also
+les des une pour que qui dans sur par avec est sont pas plus ces son ses aux elle ils nous vous leur comme
+""".split())
+
+def tokenize(text: str) -> list:
+    """
+    Splits a text into content words: lowercase, accents removed, stopwords and words of 2 letters or less dropped.
+    """
+    text = unicodedata.normalize("NFKD", str(text).lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [w for w in re.findall(r"\w+", text) if len(w) > 2 and w not in _STOPWORDS]
+
 def format_output(final_state):
     """
     Formats the final state of the workflow into a Markdown report.
@@ -42,45 +60,80 @@ def format_output(final_state):
         output += final_state['visualization_code']
         output += "\n```\n"
 
+    # 5. Cost & latency accounting
+    if final_state.get('usage'):
+        output += format_usage(final_state['usage'])
+
+    return output
+
+def format_usage(records):
+    """
+    Formats the LLM call records of a run as Markdown tables (per node, expert, model, iteration and tier).
+
+    Args:
+        records (list): The ``usage`` records of the state (see :mod:`accounting`).
+
+    Returns:
+        str: The Markdown section.
+    """
+    report = usage_report(records)
+    totals = report['totals']
+    output = "\n## 5. Coûts, Tokens & Latence\n\n"
+    output += (f"{totals['calls']} appels LLM ({totals['failures']} échecs, {totals['cached']} servis par le cache), "
+               f"{totals['prompt_tokens']} tokens en entrée, {totals['completion_tokens']} en sortie, "
+               f"{totals['latency_s']} s cumulées, coût estimé {totals['cost_usd']:.4f} $.\n")
+    titles = {"node": "Nœud", "expert": "Expert", "model": "Modèle", "iteration": "Itération", "tier": "Niveau"}
+    for group, title in titles.items():
+        output += f"\n### Par {title.lower()}\n\n"
+        output += f"| {title} | Appels | Échecs | Cache | Tokens entrée | Tokens sortie | Latence (s) | Retries | Replis | Coût ($) |\n"
+        output += "|---|---|---|---|---|---|---|---|---|---|\n"
+        for key, u in report[f'by_{group}'].items():
+            label = int(key) + 1 if group == "iteration" and key.isdigit() else key
+            output += (f"| {label} | {u['calls']} | {u['failures']} | {u['cached']} | {u['prompt_tokens']} | {u['completion_tokens']} "
+                       f"| {u['latency_s']} | {u['retries']} | {u['fallback_hops']} | {u['cost_usd']:.4f} |\n")
     return output
 
-import litellm
-import random
+from retry_policy import get_retry_policy
 
-def retry_llm(func):
+def retry_llm(func, on_retry=None):
     """
     Decorator to retry a function call upon failure.
-    Retries with exponential backoff, specifically handling RateLimitErrors.
+
+    Transient errors (rate limits, 5xx) are retried with exponential backoff or the
+    provider's Retry-After hint; errors making the model unusable are raised at once so
+    the caller moves to its next model; fatal errors raise :class:`retry_policy.FatalLLMError`.
+
+    ``on_retry`` is called with the error before each retry (see :mod:`accounting`).
     """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        max_retries = 3  # Reduced from 9 to 3 for faster fallback
-        base_delay = 5   # Reduced from 10s to 5s
-        
-        for i in range(max_retries):
+        policy = get_retry_policy()
+        for i in range(policy.max_retries):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                # Check for RateLimitError (either class or string 429)
-                is_rate_limit = isinstance(e, litellm.RateLimitError) or "429" in str(e) or "RateLimitError" in str(e)
-                # Check for ServiceUnavailable (503) from free providers
-                is_service_unavailable = "503" in str(e) or "ServiceUnavailableError" in str(e)
-                
-                if i < max_retries - 1:
-                    if is_rate_limit:
-                        # Exponential backoff for rate limits: 5, 10, 20... capped at 60s
-                        delay = min(60, (base_delay * (2 ** i)) + random.uniform(1, 5))
-                        print(f"⏳ Quota dépassé (Rate Limit). Attente de {delay:.1f}s avant nouvelle tentative {i+1}/{max_retries}...")
-                    elif is_service_unavailable:
-                         delay = min(60, (base_delay * (2 ** i)) + random.uniform(1, 5))
-                         print(f"📉 Service indisponible (503). Attente de {delay:.1f}s avant nouvelle tentative {i+1}/{max_retries}...")
-                    else:
-                        # Standard backoff for other errors
-                        delay = min(60, (2 * (2 ** i)) + random.uniform(0, 1))
-                        print(f"⚠️ Erreur ({e}). Nouvelle tentative dans {delay:.1f}s... ({i+1}/{max_retries})")
-                    
-                    time.sleep(delay)
-                else:
-                    print(f"❌ Échec définitif après {max_retries} tentatives.")
-                    raise e
+                delay = policy.decide(e, i)
+                if on_retry:
+                    on_retry(e)
+                time.sleep(delay)
+    return wrapper
+
+def async_retry_llm(func, on_retry=None):
+    """
+    Async counterpart of :func:`retry_llm` for coroutine functions.
+
+    Backoff waits use ``asyncio.sleep``, so a waiting call releases the event loop
+    instead of holding an executor thread.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        policy = get_retry_policy()
+        for i in range(policy.max_retries):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                delay = policy.decide(e, i)
+                if on_retry:
+                    on_retry(e)
+                await asyncio.sleep(delay)
     return wrapper